@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import random
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -198,7 +199,7 @@ class AssetManager:
             audio_path=audio_path,
             anim_speed=str(animation.get("speed", "normal")).strip() or "normal",
             priority=2,
-            time_range=time_range,
+            time_range=sys.intern(time_range),
             probability=max(probability, 0.01),
             sprite_path=sprite_path,
             cooldown_minutes=max(cooldown_minutes, 0),
@@ -235,7 +236,7 @@ class AssetManager:
             audio_path=audio_path,
             anim_speed=anim_speed,
             priority=priority,
-            time_range=time_range,
+            time_range=sys.intern(time_range),
             probability=max(probability, 0.01),
             sprite_path=sprite_path,
             cooldown_minutes=max(cooldown_minutes, 0),
@@ -38,6 +38,9 @@ class AudioConfig:
     asr_base_url: str = "https://open.bigmodel.cn/api/paas/v4/audio/transcriptions"
     asr_temperature: float = 0.0
     asr_prompt: str = ""
+    # Push-to-talk: skip the 0.5 s ambient calibration; 0 keeps the recognizer's own threshold.
+    ptt_skip_ambient_calibration: bool = False
+    ptt_energy_threshold: float = 0.0
 
 
 @dataclass(slots=True)
@@ -205,6 +208,8 @@ class ConfigManager:
                 "asr_base_url": str(config.audio.asr_base_url),
                 "asr_temperature": float(config.audio.asr_temperature),
                 "asr_prompt": str(config.audio.asr_prompt),
+                "ptt_skip_ambient_calibration": bool(config.audio.ptt_skip_ambient_calibration),
+                "ptt_energy_threshold": float(config.audio.ptt_energy_threshold),
             },
             "behavior": {
                 "full_screen_pause": bool(config.behavior.full_screen_pause),
@@ -325,6 +330,11 @@ class ConfigManager:
         except (TypeError, ValueError):
             asr_temperature = 0.0
         asr_temperature = min(max(asr_temperature, 0.0), 1.0)
+        try:
+            ptt_energy_threshold = float(payload.get("ptt_energy_threshold", 0.0))
+        except (TypeError, ValueError):
+            ptt_energy_threshold = 0.0
+        ptt_energy_threshold = max(ptt_energy_threshold, 0.0)
         return AudioConfig(
             tts_provider="edge",
             tts_voice=str(payload.get("tts_voice", "zh-CN-XiaoxiaoNeural")),
@@ -339,6 +349,8 @@ class ConfigManager:
             asr_base_url=asr_base_url,
             asr_temperature=asr_temperature,
             asr_prompt=str(payload.get("asr_prompt", "")),
+            ptt_skip_ambient_calibration=bool(payload.get("ptt_skip_ambient_calibration", False)),
+            ptt_energy_threshold=ptt_energy_threshold,
         )
 
     @staticmethod
@@ -20,17 +20,68 @@ reacts by spawning appropriate GIF particles.
 
 from __future__ import annotations
 
+import functools
+import logging
+import os
 import random
+import sys
+import threading
+from array import array
 from pathlib import Path
-from typing import Optional
+from types import MappingProxyType
+from typing import Callable, Final, Optional, Sequence
 
-from PySide6.QtCore import QObject, QTimer, Signal, Slot
+from PySide6.QtCore import QObject, Qt, QTimer, Signal, Slot
 
 try:
     from ui.gif_particle import GifParticleManager, ParticleConfig
 except ModuleNotFoundError:
     from ..ui.gif_particle import GifParticleManager, ParticleConfig
 
+from .ticker import Ticker, TickerSubscription
+
+logger = logging.getLogger("CyberCompanion")
+
+
+# Semantic GIF role names -> filename
+_GIF_ROLES: Final = (
+    ("curious",    "state1.gif"),
+    ("excited",    "state2.gif"),
+    ("music_vibe", "state3.gif"),
+    ("shy",        "state4.gif"),
+    ("thinking",   "state5.gif"),
+    ("greeting",   "state6.gif"),
+    ("ambient",    "state7.gif"),
+    ("main",       "aemeath.gif"),
+)
+
+@functools.lru_cache(maxsize=8)
+def _resolve_paths_for(characters_dir: Path) -> dict[str, str]:
+    """
+    Map GIF roles to existing files under ``characters_dir``.
+
+    Cached per directory so every mapper in the process shares one listing
+    and the same interned path strings. Callers must not mutate the result.
+    """
+    try:
+        with os.scandir(characters_dir) as entries:
+            names = {entry.name for entry in entries}
+    except OSError:
+        names = set()
+
+    resolved: dict[str, str] = {}
+    for role, filename in _GIF_ROLES:
+        path = characters_dir / filename
+        if filename in names:
+            # Interned so every ParticleConfig shares one string object per GIF.
+            resolved[role] = sys.intern(str(path))
+        else:
+            logger.warning("[GifStateMapper] GIF 未找到: %s (role=%s)", path, role)
+    return resolved
+
+
+_RAND_RING_SIZE = 1024  # power of two, so the index wraps with a mask
+
 
 class GifStateMapper(QObject):
     """
@@ -40,17 +91,16 @@ class GifStateMapper(QObject):
     and other event sources.
     """
 
-    # Semantic GIF role names -> filename
-    GIF_ROLES = {
-        "curious":    "state1.gif",
-        "excited":    "state2.gif",
-        "music_vibe": "state3.gif",
-        "shy":        "state4.gif",
-        "thinking":   "state5.gif",
-        "greeting":   "state6.gif",
-        "ambient":    "state7.gif",
-        "main":       "aemeath.gif",
-    }
+    # Read-only view of the role table for external callers
+    GIF_ROLES: Final = MappingProxyType(dict(_GIF_ROLES))
+
+    # Emitted from the resolve thread; queued onto the GUI thread.
+    _paths_resolved = Signal()
+
+    # Music pulses only top up the screen while fewer particles are active.
+    PULSE_MAX_ACTIVE = 4
+    # Bursts up to this size are scheduled by the mapper itself.
+    STAGGER_SPAWN_MAX = 5
 
     def __init__(
         self,
@@ -62,30 +112,162 @@ class GifStateMapper(QObject):
         self._characters_dir = characters_dir
         self._particle_manager = particle_manager
         self._gif_paths: dict[str, str] = {}
+        self._idle_paths: tuple[str, ...] = ()
+        self._music_paths: tuple[str, ...] = ()
+        self._has_music_paths = False
+        # Reusable configs for spawns whose parameters never vary.
+        self._cfg_pool: dict[str, ParticleConfig] = {}
         self._audio_reaction_active = False
-        self._audio_pulse_timer = QTimer(self)
-        self._audio_pulse_timer.setInterval(4000)  # Spawn a new music particle every 4s
-        self._audio_pulse_timer.timeout.connect(self._on_audio_pulse)
+        self._pulse_sub: TickerSubscription | None = None
+        self._pulse_idx = 0
         self._enabled = True
-
-        self._resolve_gif_paths()
+        # Pre-drawn uniform floats consumed by _rf/_ri, refilled on wrap.
+        self._rng = random.Random()
+        self._rand_ring = array("d", [self._rng.random() for _ in range(_RAND_RING_SIZE)])
+        self._ring_idx = 0
+
+        # Stat the GIFs off the GUI thread; events that arrive earlier are
+        # parked here and replayed once _paths_resolved reaches the GUI thread.
+        self._paths_ready = threading.Event()
+        self._pending_events: list[Callable[[], None]] = []
+        self._paths_resolved.connect(self._replay_pending_events)
+        self._resolve_thread = threading.Thread(
+            target=self._resolve_gif_paths,
+            daemon=True,
+            name="GifStateMapperResolve",
+        )
+        self._resolve_thread.start()
 
     def _resolve_gif_paths(self) -> None:
-        """Resolve all GIF paths, checking existence."""
-        for role, filename in self.GIF_ROLES.items():
-            path = self._characters_dir / filename
-            if path.exists():
-                self._gif_paths[role] = str(path)
-            else:
-                print(f"[GifStateMapper] GIF 未找到: {path} (role={role})")
+        """Resolve all GIF paths, checking existence. Runs on a worker thread."""
+        try:
+            self._resolve_gif_paths_sync()
+        finally:
+            self._paths_ready.set()
+            try:
+                self._paths_resolved.emit()
+            except RuntimeError:
+                # The mapper was deleted before resolution finished.
+                pass
+
+    def _resolve_gif_paths_sync(self) -> None:
+        gif_paths = dict(_resolve_paths_for(self._characters_dir))
+        self._gif_paths = gif_paths
+
+        # Paths never change after resolution; precompute the per-event pools.
+        self._idle_paths = tuple(
+            p for p in (gif_paths.get("thinking"), gif_paths.get("ambient")) if p
+        )
+        self._music_paths = tuple(
+            p for p in (gif_paths.get("music_vibe"), gif_paths.get("ambient")) if p
+        )
+        self._has_music_paths = bool(self._music_paths)
+
+    def _next_rand(self) -> float:
+        idx = self._ring_idx
+        value = self._rand_ring[idx]
+        idx = (idx + 1) & (_RAND_RING_SIZE - 1)
+        if idx == 0:
+            rng = self._rng.random
+            self._rand_ring = array("d", [rng() for _ in range(_RAND_RING_SIZE)])
+        self._ring_idx = idx
+        return value
+
+    def _rf(self, a: float, b: float) -> float:
+        """Uniform float in [a, b) drawn from the pre-filled ring."""
+        return a + (b - a) * self._next_rand()
+
+    def _ri(self, a: int, b: int) -> int:
+        """Uniform int in [a, b] drawn from the pre-filled ring."""
+        return a + int((b - a + 1) * self._next_rand())
 
     def set_enabled(self, enabled: bool) -> None:
         """Enable or disable particle effects."""
+        if enabled == self._enabled:
+            return
         self._enabled = enabled
         if not enabled:
-            self._particle_manager.dismiss_all()
+            if self._particle_manager.active_count:
+                self._particle_manager.dismiss_all()
             self._stop_audio_reaction()
 
+    def _paths_or_defer(self, event: Callable[[], None]) -> bool:
+        """
+        True once GIF paths are resolved.
+
+        Before that, ``event`` is queued for replay when resolution finishes
+        and False is returned, so slots never block the GUI thread.
+        """
+        if self._paths_ready.is_set():
+            return True
+        if event not in self._pending_events:
+            self._pending_events.append(event)
+        return False
+
+    @Slot()
+    def _replay_pending_events(self) -> None:
+        events, self._pending_events = self._pending_events, []
+        for event in events:
+            event()
+
+    def _is_saturated(self) -> bool:
+        """True when the manager would reject every spawn of a wave."""
+        return self._particle_manager.active_count >= GifParticleManager.MAX_CONCURRENT
+
+    def _stagger_spawn(
+        self,
+        paths: Sequence[str],
+        *,
+        count: int,
+        scale: float,
+        duration_ms: int,
+        stagger_ms: int,
+        edges: str = "random",
+    ) -> None:
+        """
+        Spawn a short staggered burst directly, without a wave on the manager.
+
+        Small bursts get one single-shot per particle; larger ones fall back
+        to ``GifParticleManager.spawn_wave``.
+        """
+        if count > self.STAGGER_SPAWN_MAX:
+            self._particle_manager.spawn_wave(
+                list(paths),
+                count=count,
+                scale=scale,
+                duration_ms=duration_ms,
+                stagger_ms=stagger_ms,
+                edges=edges,
+            )
+            return
+
+        spawn = self._particle_manager.spawn_particle
+        for i in range(count):
+            config = ParticleConfig(
+                gif_path=paths[i % len(paths)],
+                scale=scale,
+                duration_ms=duration_ms,
+                enter_duration_ms=self._ri(800, 1500),
+                exit_duration_ms=self._ri(600, 1000),
+                edge=edges,
+                target="random_inner",
+                opacity=self._rf(0.7, 1.0),
+            )
+            if i == 0:
+                spawn(config)
+            else:
+                # Parented so pending spawns die with the mapper; the static
+                # singleShot would pick a PreciseTimer for these short delays.
+                timer = QTimer(self)
+                timer.setSingleShot(True)
+                timer.setTimerType(Qt.TimerType.CoarseTimer)
+                timer.timeout.connect(functools.partial(self._fire_staggered_spawn, timer, config))
+                timer.start(i * stagger_ms)
+
+    def _fire_staggered_spawn(self, timer: QTimer, config: ParticleConfig) -> None:
+        timer.deleteLater()
+        self._particle_manager.spawn_particle(config)
+
     # ─── Event Handlers ────────────────────────────────────────
 
     @Slot()
@@ -93,8 +275,13 @@ class GifStateMapper(QObject):
         """Called when entity enters PEEKING state."""
         if not self._enabled:
             return
-        curious_path = self._gif_paths.get("curious")
-        if curious_path:
+        if not self._paths_or_defer(self.on_peeking):
+            return
+        config = self._cfg_pool.get("curious")
+        if config is None:
+            curious_path = self._gif_paths.get("curious")
+            if not curious_path:
+                return
             config = ParticleConfig(
                 gif_path=curious_path,
                 scale=0.6,
@@ -105,17 +292,22 @@ class GifStateMapper(QObject):
                 target="random_inner",
                 opacity=0.85,
             )
-            self._particle_manager.spawn_particle(config)
+            self._cfg_pool["curious"] = config
+        self._particle_manager.spawn_particle(config)
 
     @Slot()
     def on_engaged(self) -> None:
         """Called when entity enters ENGAGED state – show excitement."""
         if not self._enabled:
             return
+        if not self._paths_or_defer(self.on_engaged):
+            return
+        if self._is_saturated():
+            return
         excited_path = self._gif_paths.get("excited")
         if excited_path:
             # Spawn 2 excited particles from different edges
-            self._particle_manager.spawn_wave(
+            self._stagger_spawn(
                 [excited_path],
                 count=2,
                 scale=0.5,
@@ -128,9 +320,13 @@ class GifStateMapper(QObject):
         """Called when entity enters FLEEING state – shy scattering."""
         if not self._enabled:
             return
+        if not self._paths_or_defer(self.on_fleeing):
+            return
+        if self._is_saturated():
+            return
         shy_path = self._gif_paths.get("shy")
         if shy_path:
-            self._particle_manager.spawn_wave(
+            self._stagger_spawn(
                 [shy_path],
                 count=3,
                 scale=0.4,
@@ -142,16 +338,22 @@ class GifStateMapper(QObject):
     @Slot()
     def on_hidden(self) -> None:
         """Called when entity enters HIDDEN – dismiss all particles."""
-        self._particle_manager.dismiss_all()
+        self._pending_events.clear()
+        if self._particle_manager.active_count:
+            self._particle_manager.dismiss_all()
 
     @Slot()
     def on_summoned(self) -> None:
         """Called on force-summon (wakeup/tray) – greeting effect."""
         if not self._enabled:
             return
+        if not self._paths_or_defer(self.on_summoned):
+            return
+        if self._is_saturated():
+            return
         greeting_path = self._gif_paths.get("greeting")
         if greeting_path:
-            self._particle_manager.spawn_wave(
+            self._stagger_spawn(
                 [greeting_path],
                 count=3,
                 scale=0.6,
@@ -165,11 +367,13 @@ class GifStateMapper(QObject):
         """Called when user is idle for extended period – thinking particles."""
         if not self._enabled:
             return
-        thinking_path = self._gif_paths.get("thinking")
-        ambient_path = self._gif_paths.get("ambient")
-        paths = [p for p in [thinking_path, ambient_path] if p]
+        if not self._paths_or_defer(self.on_prolonged_idle):
+            return
+        if self._is_saturated():
+            return
+        paths = self._idle_paths
         if paths:
-            self._particle_manager.spawn_wave(
+            self._stagger_spawn(
                 paths,
                 count=2,
                 scale=0.5,
@@ -188,13 +392,22 @@ class GifStateMapper(QObject):
             return
 
         self._audio_reaction_active = True
-        print("[GifStateMapper] 🎵 音频检测到，开始音乐律动效果")
+        logger.debug("[GifStateMapper] 🎵 音频检测到，开始音乐律动效果")
+
+        if self._paths_or_defer(self._spawn_music_intro):
+            self._spawn_music_intro()
 
-        # Spawn initial music vibe particles
+        # Start periodic pulse for ongoing music (a new music particle every 4s)
+        if self._pulse_sub is None:
+            self._pulse_sub = Ticker.instance().subscribe(4000, self._on_audio_pulse)
+
+    def _spawn_music_intro(self) -> None:
+        """Spawn the initial music vibe particles."""
+        if not self._audio_reaction_active or not self._enabled:
+            return
         music_path = self._gif_paths.get("music_vibe")
-        ambient_path = self._gif_paths.get("ambient")
         if music_path:
-            self._particle_manager.spawn_wave(
+            self._stagger_spawn(
                 [music_path],
                 count=2,
                 scale=0.7,
@@ -203,46 +416,49 @@ class GifStateMapper(QObject):
                 edges="random",
             )
 
-        # Start periodic pulse for ongoing music
-        self._audio_pulse_timer.start()
-
     @Slot()
     def on_audio_stopped(self) -> None:
         """Called when system audio output stops."""
         self._stop_audio_reaction()
-        print("[GifStateMapper] 🔇 音频停止，结束律动效果")
+        logger.debug("[GifStateMapper] 🔇 音频停止，结束律动效果")
 
     def _stop_audio_reaction(self) -> None:
         """Stop the periodic music pulse."""
         self._audio_reaction_active = False
-        if self._audio_pulse_timer.isActive():
-            self._audio_pulse_timer.stop()
+        if self._pulse_sub is not None:
+            self._pulse_sub.unsubscribe()
+            self._pulse_sub = None
 
     def _on_audio_pulse(self) -> None:
         """Periodically spawn music particles while audio is playing."""
         if not self._audio_reaction_active or not self._enabled:
-            self._audio_pulse_timer.stop()
+            self._stop_audio_reaction()
             return
 
-        music_path = self._gif_paths.get("music_vibe")
-        ambient_path = self._gif_paths.get("ambient")
-        paths = [p for p in [music_path, ambient_path] if p]
-        if not paths:
+        # Don't overcrowd – cheapest check first, before any path or RNG work
+        if self._particle_manager.active_count >= self.PULSE_MAX_ACTIVE:
             return
-
-        # Don't overcrowd – only spawn if we're below threshold
-        if self._particle_manager.active_count < 4:
-            config = ParticleConfig(
-                gif_path=random.choice(paths),
-                scale=random.uniform(0.4, 0.8),
-                duration_ms=random.randint(4000, 7000),
-                enter_duration_ms=random.randint(800, 1500),
-                exit_duration_ms=random.randint(600, 1000),
-                edge="random",
-                target="random_inner",
-                opacity=random.uniform(0.6, 0.95),
-            )
-            self._particle_manager.spawn_particle(config)
+        if not self._has_music_paths:
+            return
+        paths = self._music_paths
+        if len(paths) == 1:
+            path = paths[0]
+        else:
+            # Alternate deterministically instead of random.choice on a 2-item pool.
+            path = paths[self._pulse_idx % len(paths)]
+            self._pulse_idx += 1
+
+        config = ParticleConfig(
+            gif_path=path,
+            scale=self._rf(0.4, 0.8),
+            duration_ms=self._ri(4000, 7000),
+            enter_duration_ms=self._ri(800, 1500),
+            exit_duration_ms=self._ri(600, 1000),
+            edge="random",
+            target="random_inner",
+            opacity=self._rf(0.6, 0.95),
+        )
+        self._particle_manager.spawn_particle(config)
 
     # ─── Ambient / Random ──────────────────────────────────────
 
@@ -250,23 +466,27 @@ class GifStateMapper(QObject):
         """Spawn small random ambient particles."""
         if not self._enabled:
             return
+        if not self._paths_or_defer(functools.partial(self.spawn_random_ambient, count)):
+            return
         ambient_path = self._gif_paths.get("ambient")
         if not ambient_path:
             return
-        for _ in range(count):
-            config = ParticleConfig(
-                gif_path=ambient_path,
-                scale=random.uniform(0.3, 0.5),
-                duration_ms=random.randint(3000, 6000),
-                enter_duration_ms=random.randint(600, 1200),
-                exit_duration_ms=random.randint(400, 800),
-                edge="random",
-                target="random_inner",
-                opacity=random.uniform(0.4, 0.7),
-            )
-            self._particle_manager.spawn_particle(config)
+        self._particle_manager.spawn_wave(
+            [ambient_path],
+            count=count,
+            stagger_ms=0,
+            edges="random",
+            target="random_inner",
+            scale_range=(0.3, 0.5),
+            duration_range=(3000, 6000),
+            enter_range=(600, 1200),
+            exit_range=(400, 800),
+            opacity_range=(0.4, 0.7),
+        )
 
     def shutdown(self) -> None:
         """Cleanup on application exit."""
+        self._pending_events.clear()
         self._stop_audio_reaction()
-        self._particle_manager.dismiss_all()
+        if self._particle_manager.active_count:
+            self._particle_manager.dismiss_all()
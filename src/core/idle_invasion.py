@@ -11,13 +11,16 @@ Grid-based placement guarantees no two characters overlap.
 from __future__ import annotations
 
 import logging
+import math
+import os
 import random
+from collections import deque
 from enum import Enum, auto
 from pathlib import Path
 from typing import TYPE_CHECKING
 
-from PySide6.QtCore import QObject, QTimer, Slot
-from PySide6.QtGui import QCursor, QGuiApplication, QMovie
+from PySide6.QtCore import QElapsedTimer, QObject, QRunnable, Qt, QThreadPool, QTimer, Signal, Slot
+from PySide6.QtGui import QCursor, QGuiApplication, QImageReader, QScreen
 
 if TYPE_CHECKING:
     from .config_manager import IdleInvasionConfig
@@ -35,6 +38,63 @@ except ModuleNotFoundError:
 
 LOGGER = logging.getLogger("CyberCompanion")
 
+# Scaled first-frame sizes keyed by (path, mtime, scale); avoids re-decoding GIFs.
+_GIF_SIZE_CACHE: dict[tuple[str, float, float], tuple[int, int]] = {}
+
+
+def _probe_gif_size(gif_path: str, scale: float) -> tuple[int, int]:
+    """
+    Read a GIF's scaled size with QImageReader.
+
+    Only the header is parsed in the common case (no QMovie animator state),
+    and the reader is safe to use off the GUI thread.
+    """
+    default_size = max(1, int(120 * scale))
+    reader = QImageReader(gif_path)
+    size = reader.size()
+    if not size.isValid() or size.width() <= 0 or size.height() <= 0:
+        reader.jumpToImage(0)
+        size = reader.read().size()
+        if size.width() <= 0 or size.height() <= 0:
+            return (default_size, default_size)
+    width = int(size.width() * scale)
+    height = int(size.height() * scale)
+    return (max(1, width), max(1, height))
+
+
+def _distance_sq(x1: int, y1: int, x2: int, y2: int) -> int:
+    dx = x1 - x2
+    dy = y1 - y2
+    return dx * dx + dy * dy
+
+
+class _GifSizeProbeSignals(QObject):
+    finished = Signal(float, object)  # scale, {path: (w, h)}
+
+
+class _GifSizeProbe(QRunnable):
+    """Warm ``_GIF_SIZE_CACHE`` on a pool thread so the first invasion doesn't stall."""
+
+    def __init__(self, gif_paths: list[str], scale: float):
+        super().__init__()
+        self.signals = _GifSizeProbeSignals()
+        self._gif_paths = tuple(gif_paths)
+        self._scale = scale
+
+    def run(self) -> None:
+        sizes: dict[str, tuple[int, int]] = {}
+        for path in self._gif_paths:
+            try:
+                key = (path, os.path.getmtime(path), self._scale)
+            except OSError:
+                continue
+            size = _GIF_SIZE_CACHE.get(key)
+            if size is None:
+                size = _probe_gif_size(path, self._scale)
+                _GIF_SIZE_CACHE[key] = size
+            sizes[path] = size
+        self.signals.finished.emit(self._scale, sizes)
+
 
 # ---------------------------------------------------------------------------
 # State enum
@@ -64,7 +124,7 @@ class IdleInvasionController(QObject):
     * Uses ``GifParticleManager`` (or its own particle list) to manage windows.
     """
 
-
+    GIF_CHOICE_BATCH: int = 32
 
     def __init__(
         self,
@@ -76,6 +136,8 @@ class IdleInvasionController(QObject):
 
         self._config = config or IdleInvasionConfig()
         self._characters_dir = characters_dir
+        self._spawn_phases: list[tuple[float, int, int]] = []
+        self._rebuild_spawn_schedule()
         self._state = InvasionState.INACTIVE
 
         # ---- Grid placement bookkeeping ----
@@ -86,8 +148,13 @@ class IdleInvasionController(QObject):
         self._cell_h = 0
         self._screen_x = 0
         self._screen_y = 0
-        self._occupied: set[tuple[int, int]] = set()  # (col, row) of occupied cells
-        self._particle_cell_map: dict[int, tuple[int, int]] = {}  # pid -> (col, row)
+        # Primary screen available geometry (x, y, w, h), refreshed on screen
+        # signals instead of being queried on every invasion start.
+        self._screen_geo: tuple[int, int, int, int] | None = None
+        self._watched_screen: QScreen | None = None
+        self._occupied_bits = bytearray()  # 1 byte per cell, indexed col * rows + row
+        self._occupied_count = 0
+        self._free_cells: list[tuple[int, int]] = []  # shuffled (col, row) of free cells
         self._gif_sizes: dict[str, tuple[int, int]] = {}
         self._max_gif_w = 0
         self._max_gif_h = 0
@@ -99,18 +166,38 @@ class IdleInvasionController(QObject):
         # ---- Timers ----
         self._spawn_timer = QTimer(self)
         self._spawn_timer.setSingleShot(True)
-        self._spawn_timer.timeout.connect(self._on_spawn_tick)
+        # Timers and particles live on this object's thread: skip the
+        # AutoConnection thread check and call the slots directly.
+        self._spawn_timer.timeout.connect(self._on_spawn_tick, Qt.ConnectionType.DirectConnection)
 
         self._retreat_timer = QTimer(self)
         self._retreat_timer.setSingleShot(True)
-        self._retreat_timer.timeout.connect(self._finish_retreat)
+        self._retreat_timer.timeout.connect(self._finish_retreat, Qt.ConnectionType.DirectConnection)
+
+        # One rolling timer walks the staggered retreat schedule instead of a
+        # singleShot per particle. Entries are kept latest-first so due ones
+        # pop off the tail.
+        self._retreat_schedule: list[tuple[int, GifParticle]] = []
+        self._retreat_clock = QElapsedTimer()
+        self._retreat_step_timer = QTimer(self)
+        self._retreat_step_timer.setSingleShot(True)
+        self._retreat_step_timer.timeout.connect(self._on_retreat_step, Qt.ConnectionType.DirectConnection)
 
         # ---- Idle tracking ----
+        self._idle_monitor: IdleMonitor | None = None
         self._idle_time_ms = 0
         self._invasion_started = False  # True once idle exceeds start_delay_ms
 
-        # Resolve absolute GIF paths.
-        self._gif_paths: list[str] = self._resolve_gif_paths()
+        # Resolve absolute GIF paths (cached per characters dir + GIF list).
+        self._gif_paths_key: tuple[str, tuple[str, ...]] | None = None
+        self._gif_paths: list[str] = []
+        self._gif_paths = self._resolve_gif_paths()
+        # Pre-drawn GIF picks, refilled in batches of GIF_CHOICE_BATCH.
+        self._gif_choice_buffer: deque[str] = deque()
+        self._gif_size_probe: _GifSizeProbe | None = None
+        self._start_gif_size_probe()
+
+        self._watch_screens()
 
     # ------------------------------------------------------------------
     # Public API
@@ -118,14 +205,43 @@ class IdleInvasionController(QObject):
 
     def bind_idle_monitor(self, idle_monitor: IdleMonitor) -> None:
         """Connect to the shared IdleMonitor signals."""
-        idle_monitor.idle_time_updated.connect(self._on_idle_time_updated)
-        idle_monitor.user_active_detected.connect(self._on_user_active)
+        if self._idle_monitor is not None and self._idle_monitor is not idle_monitor:
+            self._unbind_idle_monitor()
+        self._idle_monitor = idle_monitor
+        # IdleMonitor emits from its own QThread, so these stay AutoConnection
+        # (queued) rather than direct. UniqueConnection keeps a re-bind from
+        # fanning every emission out twice.
+        try:
+            idle_monitor.idle_time_updated.connect(
+                self._on_idle_time_updated, Qt.ConnectionType.UniqueConnection
+            )
+            idle_monitor.user_active_detected.connect(
+                self._on_user_active, Qt.ConnectionType.UniqueConnection
+            )
+        except RuntimeError:
+            LOGGER.debug("[IdleInvasion] IdleMonitor signals already bound.")
+
+    def _unbind_idle_monitor(self) -> None:
+        idle_monitor = self._idle_monitor
+        self._idle_monitor = None
+        if idle_monitor is None:
+            return
+        try:
+            idle_monitor.idle_time_updated.disconnect(self._on_idle_time_updated)
+        except Exception:
+            pass
+        try:
+            idle_monitor.user_active_detected.disconnect(self._on_user_active)
+        except Exception:
+            pass
 
     def apply_config(self, config: IdleInvasionConfig) -> None:
         """Hot-reload configuration at runtime."""
         self._config = config
+        self._rebuild_spawn_schedule()
         self._gif_paths = self._resolve_gif_paths()
-        self._refresh_gif_sizes()
+        self._gif_choice_buffer.clear()
+        self._start_gif_size_probe()
         if self._state == InvasionState.INACTIVE:
             self._invasion_started = False
         if not config.enabled and self._state != InvasionState.INACTIVE:
@@ -133,6 +249,7 @@ class IdleInvasionController(QObject):
 
     def shutdown(self) -> None:
         """Cleanup on application exit."""
+        self._unbind_idle_monitor()
         self._spawn_timer.stop()
         self._retreat_timer.stop()
         self._dismiss_all_immediate()
@@ -152,7 +269,7 @@ class IdleInvasionController(QObject):
 
     @Slot(int)
     def _on_idle_time_updated(self, idle_ms: int) -> None:
-        """Called ~every 100 ms with the current idle time."""
+        """Called whenever the idle time moves by at least ~500 ms."""
         self._idle_time_ms = idle_ms
 
         if not self._config.enabled:
@@ -223,33 +340,41 @@ class IdleInvasionController(QObject):
         interval = self._current_spawn_interval()
         self._spawn_timer.start(interval)
 
-    def _current_spawn_interval(self) -> int:
-        """Determine spawn interval based on current idle time."""
-        extra_idle_ms = max(0, self._idle_time_ms - self._config.start_delay_ms)
+    def _rebuild_spawn_schedule(self) -> None:
+        """Precompute ``(extra_idle_threshold_ms, low, high)`` per cadence phase."""
         initial_ms = max(500, int(self._config.initial_spawn_interval_ms))
         min_ms = max(500, int(self._config.min_spawn_interval_ms))
 
         # Phase-2 cadence profile (defaults map to:
         # 0-3m: 8-12s, 3-5m: 5-8s, 5-10m: 3-5s, 10m+: 2-3s).
-        if extra_idle_ms < 3 * 60_000:
-            low, high = int(initial_ms * 0.8), int(initial_ms * 1.2)
-        elif extra_idle_ms < 5 * 60_000:
-            low, high = int(initial_ms * 0.5), int(initial_ms * 0.8)
-        elif extra_idle_ms < 10 * 60_000:
-            low, high = int(initial_ms * 0.3), int(initial_ms * 0.5)
-        else:
-            low, high = min_ms, int(initial_ms * 0.3)
+        raw_phases = (
+            (3 * 60_000, int(initial_ms * 0.8), int(initial_ms * 1.2)),
+            (5 * 60_000, int(initial_ms * 0.5), int(initial_ms * 0.8)),
+            (10 * 60_000, int(initial_ms * 0.3), int(initial_ms * 0.5)),
+            (math.inf, min_ms, int(initial_ms * 0.3)),
+        )
+        phases: list[tuple[float, int, int]] = []
+        for threshold_ms, low, high in raw_phases:
+            low = max(min_ms, low)
+            phases.append((threshold_ms, low, max(low, high)))
+        self._spawn_phases = phases
 
-        low = max(min_ms, low)
-        high = max(low, high)
+    def _current_spawn_interval(self) -> int:
+        """Determine spawn interval based on current idle time."""
+        extra_idle_ms = max(0, self._idle_time_ms - self._config.start_delay_ms)
+        for threshold_ms, low, high in self._spawn_phases:
+            if extra_idle_ms < threshold_ms:
+                break
         return random.randint(low, high)
 
     def _spawn_one(self) -> None:
         """Place one invader in a random free grid cell."""
-        if len(self._particles) >= self._config.max_invaders:
+        cfg = self._config
+        particles = self._particles
+        if len(particles) >= cfg.max_invaders:
             LOGGER.info(
                 "[IdleInvasion] Reached max invaders (%d), entering SATURATED.",
-                self._config.max_invaders,
+                cfg.max_invaders,
             )
             self._state = InvasionState.SATURATED
             self._spawn_timer.stop()
@@ -262,24 +387,28 @@ class IdleInvasionController(QObject):
             self._spawn_timer.stop()
             return
 
-        gif_path = random.choice(self._gif_paths)
-        gif_w, gif_h = self._gif_sizes.get(gif_path, (self._max_gif_w, self._max_gif_h))
+        randint = random.randint
+        cell_w = self._cell_w
+        cell_h = self._cell_h
+        choices = self._gif_choice_buffer
+        if not choices:
+            choices.extend(random.choices(self._gif_paths, k=self.GIF_CHOICE_BATCH))
+        gif_path = choices.popleft()
+        gif_w, gif_h = self._gif_sizes.get(gif_path) or (self._max_gif_w, self._max_gif_h)
 
         col, row = cell
         # Keep the particle fully inside its assigned cell to guarantee no overlap.
-        cell_x = self._screen_x + col * self._cell_w
-        cell_y = self._screen_y + row * self._cell_h
-        max_offset_x = max(0, self._cell_w - gif_w)
-        max_offset_y = max(0, self._cell_h - gif_h)
-        target_x = cell_x + random.randint(0, max_offset_x)
-        target_y = cell_y + random.randint(0, max_offset_y)
+        cell_x = self._screen_x + col * cell_w
+        cell_y = self._screen_y + row * cell_h
+        target_x = cell_x + randint(0, max(0, cell_w - gif_w))
+        target_y = cell_y + randint(0, max(0, cell_h - gif_h))
 
         config = ParticleConfig(
             gif_path=gif_path,
-            scale=self._config.scale,
+            scale=cfg.scale,
             duration_ms=999_999_999,  # Never auto-exit; we manage the lifecycle.
-            enter_duration_ms=random.randint(800, 1500),
-            exit_duration_ms=random.randint(600, 1200),
+            enter_duration_ms=randint(800, 1500),
+            exit_duration_ms=randint(600, 1200),
             edge="random",
             target="fixed",  # We will override the end position below.
             loop_gif=True,
@@ -287,55 +416,87 @@ class IdleInvasionController(QObject):
         )
 
         pid = self._next_pid
-        self._next_pid += 1
+        self._next_pid = pid + 1
 
-        particle = _InvasionParticle(config, pid, target_x, target_y)
-        particle.finished.connect(self._on_particle_finished)
-        self._particles[pid] = particle
-        self._occupied.add(cell)
-        self._particle_cell_map[pid] = cell
+        particle = _InvasionParticle(config, pid, target_x, target_y, cell)
+        particle.finished.connect(self._on_particle_finished, Qt.ConnectionType.DirectConnection)
+        particles[pid] = particle
 
         particle.spawn()
-        LOGGER.debug(
-            "[IdleInvasion] Spawned invader pid=%d cell=(%d,%d) gif=%s  total=%d",
-            pid, col, row, Path(gif_path).name, len(self._particles),
-        )
+        if LOGGER.isEnabledFor(logging.DEBUG):
+            LOGGER.debug(
+                "[IdleInvasion] Spawned invader pid=%d cell=(%d,%d) gif=%s  total=%d",
+                pid, col, row, Path(gif_path).name, len(particles),
+            )
 
     def _pick_free_cell(self) -> tuple[int, int] | None:
         """Return a random unoccupied grid cell, or None if full."""
-        total = self._grid_cols * self._grid_rows
-        if len(self._occupied) >= total:
+        # The free list is kept shuffled, so popping the tail is a random pick.
+        if not self._free_cells:
             return None
-        # For small grids just build the free list.
-        if total <= 200:
-            free = [
-                (c, r)
-                for c in range(self._grid_cols)
-                for r in range(self._grid_rows)
-                if (c, r) not in self._occupied
-            ]
-            return random.choice(free) if free else None
-        # For larger grids use random probing (faster when mostly empty).
-        for _ in range(total * 3):
-            c = random.randint(0, self._grid_cols - 1)
-            r = random.randint(0, self._grid_rows - 1)
-            if (c, r) not in self._occupied:
-                return (c, r)
-        return None
+        cell = self._free_cells.pop()
+        self._occupied_bits[cell[0] * self._grid_rows + cell[1]] = 1
+        self._occupied_count += 1
+        return cell
+
+    def _release_cell(self, cell: tuple[int, int]) -> None:
+        """Return a cell to the free list at a random position."""
+        col, row = cell
+        if col >= self._grid_cols or row >= self._grid_rows:
+            return  # Stale cell from a previous grid layout.
+        idx = col * self._grid_rows + row
+        if not self._occupied_bits[idx]:
+            return
+        self._occupied_bits[idx] = 0
+        self._occupied_count -= 1
+        free = self._free_cells
+        free.append(cell)
+        idx = random.randrange(len(free))
+        free[idx], free[-1] = free[-1], free[idx]
 
     # ------------------------------------------------------------------
     # Grid initialisation
     # ------------------------------------------------------------------
 
-    def _init_grid(self) -> None:
-        """Compute the virtual grid over the primary screen."""
+    def _watch_screens(self) -> None:
+        app = QGuiApplication.instance()
+        if not isinstance(app, QGuiApplication):
+            return
+        app.primaryScreenChanged.connect(self._refresh_screen_geometry)
+        app.screenAdded.connect(self._refresh_screen_geometry)
+        app.screenRemoved.connect(self._refresh_screen_geometry)
+        self._refresh_screen_geometry()
+
+    def _refresh_screen_geometry(self, *_args) -> None:
+        """Re-read the primary screen geometry and follow its changes."""
         screen = QGuiApplication.primaryScreen()
+        if screen is not self._watched_screen:
+            if self._watched_screen is not None:
+                try:
+                    self._watched_screen.availableGeometryChanged.disconnect(
+                        self._refresh_screen_geometry
+                    )
+                except Exception:
+                    pass
+            self._watched_screen = screen
+            if screen is not None:
+                screen.availableGeometryChanged.connect(self._refresh_screen_geometry)
         if screen is None:
-            LOGGER.warning("[IdleInvasion] No primary screen found.")
+            self._screen_geo = None
             return
         geo = screen.availableGeometry()
-        self._screen_x = geo.x()
-        self._screen_y = geo.y()
+        self._screen_geo = (geo.x(), geo.y(), geo.width(), geo.height())
+
+    def _init_grid(self) -> None:
+        """Compute the virtual grid over the primary screen."""
+        if self._screen_geo is None:
+            self._refresh_screen_geometry()
+        if self._screen_geo is None:
+            LOGGER.warning("[IdleInvasion] No primary screen found.")
+            return
+        screen_x, screen_y, screen_w, screen_h = self._screen_geo
+        self._screen_x = screen_x
+        self._screen_y = screen_y
 
         # Approximate GIF dimensions after scaling.
         self._refresh_gif_sizes()
@@ -344,11 +505,15 @@ class IdleInvasionController(QObject):
         self._cell_w = base_w + self._config.cell_padding
         self._cell_h = base_h + self._config.cell_padding
 
-        self._grid_cols = max(1, geo.width() // self._cell_w)
-        self._grid_rows = max(1, geo.height() // self._cell_h)
+        self._grid_cols = max(1, screen_w // self._cell_w)
+        self._grid_rows = max(1, screen_h // self._cell_h)
 
-        self._occupied.clear()
-        self._particle_cell_map.clear()
+        self._occupied_bits = bytearray(self._grid_cols * self._grid_rows)
+        self._occupied_count = 0
+        self._free_cells = [
+            (c, r) for c in range(self._grid_cols) for r in range(self._grid_rows)
+        ]
+        random.shuffle(self._free_cells)
 
         LOGGER.info(
             "[IdleInvasion] Grid initialised: %dx%d cells (%dx%d px each) → max %d slots  screen=%dx%d",
@@ -357,8 +522,8 @@ class IdleInvasionController(QObject):
             self._cell_w,
             self._cell_h,
             self._grid_cols * self._grid_rows,
-            geo.width(),
-            geo.height(),
+            screen_w,
+            screen_h,
         )
 
     # ------------------------------------------------------------------
@@ -399,22 +564,19 @@ class IdleInvasionController(QObject):
             self._reset()
 
     def _dismiss_all_immediate(self) -> None:
+        self._clear_retreat_schedule()
         for particle in list(self._particles.values()):
             try:
                 particle.force_dismiss()
             except Exception:
                 pass
         self._particles.clear()
-        self._occupied.clear()
-        self._particle_cell_map.clear()
 
     def _reset(self) -> None:
         """Return to INACTIVE state, ready for the next idle cycle."""
         self._state = InvasionState.INACTIVE
         self._invasion_started = False
         self._idle_time_ms = 0
-        self._occupied.clear()
-        self._particle_cell_map.clear()
         LOGGER.info("[IdleInvasion] Reset to INACTIVE.")
 
     @Slot(object)
@@ -422,11 +584,12 @@ class IdleInvasionController(QObject):
         """A particle completed its exit animation or was force-dismissed."""
         if not isinstance(particle, GifParticle):
             return
-        pid = particle.particle_id
-        self._particles.pop(pid, None)
-        cell = self._particle_cell_map.pop(pid, None)
-        if cell is not None:
-            self._occupied.discard(cell)
+        # Only particles still tracked own a cell in the current grid; ones
+        # dropped by a dismiss-all/reset must not free a reused cell.
+        if self._particles.pop(particle.particle_id, None) is particle:
+            cell = getattr(particle, "cell", None)
+            if cell is not None:
+                self._release_cell(cell)
 
         # If retreating and all gone → reset.
         if self._state == InvasionState.RETREATING and not self._particles:
@@ -439,23 +602,54 @@ class IdleInvasionController(QObject):
 
     def _resolve_gif_paths(self) -> list[str]:
         """Build the list of absolute GIF paths from config."""
+        key = (str(self._characters_dir), tuple(self._config.participating_gifs))
+        if key == self._gif_paths_key:
+            return self._gif_paths
+
+        try:
+            # normcase keeps Windows' case-insensitive lookups intact.
+            available = {os.path.normcase(name) for name in os.listdir(self._characters_dir)}
+        except OSError:
+            available = set()
+
         paths: list[str] = []
-        for filename in self._config.participating_gifs:
+        for filename in key[1]:
             p = self._characters_dir / filename
-            if p.exists():
+            # Nested entries are not in the directory listing; stat those.
+            found = os.path.normcase(filename) in available if p.parent == self._characters_dir else p.exists()
+            if found:
                 paths.append(str(p))
             else:
                 LOGGER.debug("[IdleInvasion] GIF not found, skipping: %s", p)
+        self._gif_paths_key = key
         return paths
 
+    def _start_gif_size_probe(self) -> None:
+        """Probe GIF sizes on the global thread pool; results arrive queued."""
+        if not self._gif_paths:
+            return
+        probe = _GifSizeProbe(self._gif_paths, self._config.scale)
+        probe.signals.finished.connect(self._install_gif_sizes)
+        self._gif_size_probe = probe
+        QThreadPool.globalInstance().start(probe)
+
+    @Slot(float, object)
+    def _install_gif_sizes(self, scale: float, sizes: dict[str, tuple[int, int]]) -> None:
+        """Adopt sizes from the pool probe if they still match the config."""
+        self._gif_size_probe = None
+        if scale != self._config.scale or set(sizes) != set(self._gif_paths):
+            return
+        self._apply_gif_sizes(sizes)
+
     def _refresh_gif_sizes(self) -> None:
+        # Cache hits once the pool probe has finished; otherwise probe inline.
+        self._apply_gif_sizes({path: self._read_scaled_gif_size(path) for path in self._gif_paths})
+
+    def _apply_gif_sizes(self, sizes: dict[str, tuple[int, int]]) -> None:
         default_size = max(1, int(120 * self._config.scale))
-        sizes: dict[str, tuple[int, int]] = {}
         max_w = default_size
         max_h = default_size
-        for path in self._gif_paths:
-            w, h = self._read_scaled_gif_size(path)
-            sizes[path] = (w, h)
+        for w, h in sizes.values():
             max_w = max(max_w, w)
             max_h = max(max_h, h)
         self._gif_sizes = sizes
@@ -463,44 +657,76 @@ class IdleInvasionController(QObject):
         self._max_gif_h = max_h
 
     def _read_scaled_gif_size(self, gif_path: str) -> tuple[int, int]:
-        default_size = max(1, int(120 * self._config.scale))
-        movie = QMovie(gif_path)
-        if not movie.isValid():
-            return (default_size, default_size)
-        size = movie.frameRect().size()
-        if size.width() <= 0 or size.height() <= 0:
-            movie.jumpToFrame(0)
-            size = movie.currentImage().size()
-        width = int(max(1, size.width()) * self._config.scale)
-        height = int(max(1, size.height()) * self._config.scale)
-        return (max(1, width), max(1, height))
+        scale = self._config.scale
+        try:
+            key = (gif_path, os.path.getmtime(gif_path), scale)
+        except OSError:
+            return self._probe_scaled_gif_size(gif_path)
+        cached = _GIF_SIZE_CACHE.get(key)
+        if cached is None:
+            cached = self._probe_scaled_gif_size(gif_path)
+            _GIF_SIZE_CACHE[key] = cached
+        return cached
+
+    def _probe_scaled_gif_size(self, gif_path: str) -> tuple[int, int]:
+        return _probe_gif_size(gif_path, self._config.scale)
 
     def _schedule_scatter_retreat(self, particles: list[GifParticle]) -> None:
-        for particle in particles:
-            QTimer.singleShot(random.randint(50, 200), particle.start_retreat)
+        self._start_retreat_schedule([(random.randint(50, 200), particle) for particle in particles])
 
     def _schedule_ripple_retreat(self, particles: list[GifParticle]) -> None:
-        for idx, particle in enumerate(particles):
-            delay = min(2200, idx * 60 + random.randint(0, 40))
-            QTimer.singleShot(delay, particle.start_retreat)
+        self._start_retreat_schedule(
+            [
+                (min(2200, idx * 60 + random.randint(0, 40)), particle)
+                for idx, particle in enumerate(particles)
+            ]
+        )
+
+    def _start_retreat_schedule(self, entries: list[tuple[int, GifParticle]]) -> None:
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        self._retreat_schedule = entries
+        self._retreat_clock.start()
+        self._arm_retreat_step(0)
 
-    def _sorted_particles_for_ripple(self, particles: list[GifParticle]) -> list[GifParticle]:
+    def _arm_retreat_step(self, elapsed_ms: int) -> None:
+        if not self._retreat_schedule:
+            return
+        self._retreat_step_timer.start(max(0, self._retreat_schedule[-1][0] - elapsed_ms))
+
+    @Slot()
+    def _on_retreat_step(self) -> None:
+        """Start every particle whose retreat time has elapsed, then re-arm."""
+        schedule = self._retreat_schedule
+        elapsed_ms = int(self._retreat_clock.elapsed())
+        while schedule and schedule[-1][0] <= elapsed_ms:
+            _, particle = schedule.pop()
+            try:
+                particle.start_retreat()
+            except Exception:
+                pass
+        self._arm_retreat_step(elapsed_ms)
+
+    def _clear_retreat_schedule(self) -> None:
+        self._retreat_step_timer.stop()
+        self._retreat_schedule.clear()
+
+    def _sorted_particles_for_ripple(self, particles: list[_InvasionParticle]) -> list[_InvasionParticle]:
         if not particles:
             return particles
         cursor = QCursor.pos()
+        cx, cy = cursor.x(), cursor.y()
         try:
-            return sorted(
-                particles,
-                key=lambda p: self._distance_sq(p.pos().x(), p.pos().y(), cursor.x(), cursor.y()),
-            )
+            # Invaders are parked at (or heading to) their grid target, so the
+            # stored target stands in for a widget pos() query. The index
+            # breaks distance ties without comparing particles.
+            decorated = []
+            for idx, particle in enumerate(particles):
+                tx, ty = particle.target_pos
+                decorated.append((_distance_sq(tx, ty, cx, cy), idx, particle))
         except Exception:
             return particles
-
-    @staticmethod
-    def _distance_sq(x1: int, y1: int, x2: int, y2: int) -> int:
-        dx = int(x1) - int(x2)
-        dy = int(y1) - int(y2)
-        return dx * dx + dy * dy
+        decorated.sort()
+        return [particle for _, _, particle in decorated]
 
 
 # ---------------------------------------------------------------------------
@@ -520,10 +746,13 @@ class _InvasionParticle(GifParticle):
         particle_id: int,
         target_x: int,
         target_y: int,
+        cell: tuple[int, int] | None = None,
     ):
         super().__init__(config, particle_id)
+        self.cell = cell  # (col, row) grid slot, released when finished
         self._target_x = target_x
         self._target_y = target_y
+        self.target_pos: tuple[int, int] = (target_x, target_y)
         self._retreating = False
 
     # Override: park at the grid position, not a random inner position.
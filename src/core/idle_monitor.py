@@ -4,6 +4,7 @@ import ctypes
 import ctypes.wintypes
 import platform
 from dataclasses import dataclass
+from typing import Callable
 
 from PySide6.QtCore import QThread, Signal
 
@@ -50,19 +51,38 @@ class IdleMonitor(QThread):
     state_changed = Signal(str)
 
     POLL_INTERVAL_MS: int = 100
+    MIN_POLL_INTERVAL_MS: int = 50
+    # Stay below ACTIVE_RESET_MS so input between two polls is never missed.
+    MAX_POLL_INTERVAL_MS: int = 900
+    TRIGGERED_POLL_INTERVAL_MS: int = 200
+    ACTIVE_POLL_INTERVAL_MS: int = 500
     DEFAULT_THRESHOLD_MS: int = 180_000
     PRE_IDLE_RATIO: float = 0.8
     ACTIVE_RESET_MS: int = 1_000
+    # Subscribers only compare against thresholds; skip near-duplicate updates.
+    IDLE_EMIT_STEP_MS: int = 500
 
     def __init__(self, threshold_ms: int = DEFAULT_THRESHOLD_MS, parent=None):
         super().__init__(parent)
         self._threshold_ms = max(threshold_ms, 1)
         self._state = IdleState.STANDBY
         self._running = False
+        self._last_emitted_idle_ms = -self.IDLE_EMIT_STEP_MS
         self._is_windows = platform.system() == "Windows"
+        # state -> (tick handler, poll interval); None polls faster as the threshold nears.
+        self._state_handlers: dict[str, tuple[Callable[[int], None], int | None]] = {
+            IdleState.STANDBY: (self._tick_standby, None),
+            IdleState.PRE_IDLE: (self._tick_pre_idle, None),
+            IdleState.IDLE_TRIGGERED: (self._tick_idle_triggered, self.TRIGGERED_POLL_INTERVAL_MS),
+            IdleState.ACTIVE: (self._tick_active, self.ACTIVE_POLL_INTERVAL_MS),
+        }
         self._user32 = None
         self._kernel32 = None
         self._has_tick64 = False
+        self._lii: LASTINPUTINFO | None = None
+        self._lii_ref = None
+        self._get_last_input_info = None
+        self._get_tick_count = None
         if self._is_windows:
             self._user32 = ctypes.windll.user32
             self._kernel32 = ctypes.windll.kernel32
@@ -72,6 +92,14 @@ class IdleMonitor(QThread):
             self._has_tick64 = hasattr(self._kernel32, "GetTickCount64")
             if self._has_tick64:
                 self._kernel32.GetTickCount64.restype = ctypes.c_ulonglong
+            # Polled every tick: allocate the struct once and pre-bind the calls.
+            self._lii = LASTINPUTINFO()
+            self._lii.cbSize = ctypes.sizeof(LASTINPUTINFO)
+            self._lii_ref = ctypes.byref(self._lii)
+            self._get_last_input_info = self._user32.GetLastInputInfo
+            self._get_tick_count = (
+                self._kernel32.GetTickCount64 if self._has_tick64 else self._kernel32.GetTickCount
+            )
 
     @property
     def state(self) -> str:
@@ -81,9 +109,9 @@ class IdleMonitor(QThread):
         self._running = True
         while self._running:
             idle_ms = self._get_idle_time_ms()
-            self.idle_time_updated.emit(idle_ms)
+            self._maybe_emit_idle_time(idle_ms)
             self._update_state(idle_ms)
-            self.msleep(self.POLL_INTERVAL_MS)
+            self.msleep(self._next_poll_ms(idle_ms))
 
     def stop(self) -> None:
         self._running = False
@@ -97,19 +125,15 @@ class IdleMonitor(QThread):
         self._set_state(IdleState.STANDBY)
 
     def _get_idle_time_ms(self) -> int:
-        if not self._is_windows or self._user32 is None or self._kernel32 is None:
+        lii = self._lii
+        if lii is None:
             return 0
 
-        lii = LASTINPUTINFO()
-        lii.cbSize = ctypes.sizeof(LASTINPUTINFO)
-        if not self._user32.GetLastInputInfo(ctypes.byref(lii)):
+        if not self._get_last_input_info(self._lii_ref):
             return 0
 
         try:
-            if self._has_tick64:
-                current_tick = int(self._kernel32.GetTickCount64()) & 0xFFFFFFFF
-            else:
-                current_tick = int(self._kernel32.GetTickCount())
+            current_tick = int(self._get_tick_count()) & 0xFFFFFFFF
         except Exception:
             return 0
 
@@ -118,30 +142,45 @@ class IdleMonitor(QThread):
             idle_time = (idle_time + 0x100000000) & 0xFFFFFFFF
         return max(0, int(idle_time))
 
+    def _maybe_emit_idle_time(self, idle_ms: int) -> None:
+        if abs(idle_ms - self._last_emitted_idle_ms) < self.IDLE_EMIT_STEP_MS:
+            return
+        self._last_emitted_idle_ms = idle_ms
+        self.idle_time_updated.emit(idle_ms)
+
+    def _next_poll_ms(self, idle_ms: int) -> int:
+        """Poll slowly while far from the threshold, faster once it is close."""
+        poll_ms = self._state_handlers[self._state][1]
+        if poll_ms is not None:
+            return poll_ms
+        remaining = self._threshold_ms - idle_ms
+        return max(self.MIN_POLL_INTERVAL_MS, min(self.MAX_POLL_INTERVAL_MS, remaining))
+
     def _update_state(self, idle_ms: int) -> None:
-        match self._state:
-            case IdleState.STANDBY:
-                if idle_ms >= self._threshold_ms:
-                    self._set_state(IdleState.IDLE_TRIGGERED)
-                    self.user_idle_confirmed.emit()
-                elif idle_ms >= int(self._threshold_ms * self.PRE_IDLE_RATIO):
-                    self._set_state(IdleState.PRE_IDLE)
-
-            case IdleState.PRE_IDLE:
-                if idle_ms >= self._threshold_ms:
-                    self._set_state(IdleState.IDLE_TRIGGERED)
-                    self.user_idle_confirmed.emit()
-                elif idle_ms < self.ACTIVE_RESET_MS:
-                    self._set_state(IdleState.STANDBY)
-
-            case IdleState.IDLE_TRIGGERED:
-                if idle_ms < self.ACTIVE_RESET_MS:
-                    self._set_state(IdleState.ACTIVE)
-                    self.user_active_detected.emit()
-
-            case IdleState.ACTIVE:
-                # ACTIVE state must be reset by external call reset_to_standby().
-                pass
+        self._state_handlers[self._state][0](idle_ms)
+
+    def _tick_standby(self, idle_ms: int) -> None:
+        if idle_ms >= self._threshold_ms:
+            self._set_state(IdleState.IDLE_TRIGGERED)
+            self.user_idle_confirmed.emit()
+        elif idle_ms >= int(self._threshold_ms * self.PRE_IDLE_RATIO):
+            self._set_state(IdleState.PRE_IDLE)
+
+    def _tick_pre_idle(self, idle_ms: int) -> None:
+        if idle_ms >= self._threshold_ms:
+            self._set_state(IdleState.IDLE_TRIGGERED)
+            self.user_idle_confirmed.emit()
+        elif idle_ms < self.ACTIVE_RESET_MS:
+            self._set_state(IdleState.STANDBY)
+
+    def _tick_idle_triggered(self, idle_ms: int) -> None:
+        if idle_ms < self.ACTIVE_RESET_MS:
+            self._set_state(IdleState.ACTIVE)
+            self.user_active_detected.emit()
+
+    def _tick_active(self, idle_ms: int) -> None:
+        # ACTIVE state must be reset by external call reset_to_standby().
+        pass
 
     def _set_state(self, state: str) -> None:
         if self._state == state:
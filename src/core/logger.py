@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import atexit
 import logging
+import os
+import queue
 import threading
-from logging.handlers import RotatingFileHandler
+import time
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from pathlib import Path
+from typing import Callable
 
 from PySide6.QtCore import QtMsgType, qInstallMessageHandler
 
@@ -11,33 +16,246 @@ _QT_BRIDGE_LOCK = threading.Lock()
 _QT_BRIDGE_INSTALLED = False
 _QT_PREV_HANDLER = None
 _QT_BRIDGE_LOGGER: logging.Logger | None = None
+# QtMsgType -> bound method of the bridge logger, rebuilt when the logger changes.
+_QT_DISPATCH: dict[QtMsgType, Callable[..., None]] = {}
+_QT_PREFIX_PLAIN = "[Qt] "
+# Raw category -> formatted prefix; Qt only uses a handful of categories.
+_QT_PREFIX_CACHE: dict[str, str] = {}
+_QT_PREFIX_CACHE_MAX = 64
+_LOG_LISTENER: QueueListener | None = None
+_LOG_MAX_BYTES = 5 * 1024 * 1024
+_LOG_BACKUP_COUNT = 3
+# Back-to-back duplicate Qt messages are collapsed into one "(xN)" line.
+_QT_REPEAT_LOCK = threading.Lock()
+_QT_REPEAT_FLUSH_S = 1.0
+_QT_LAST_KEY: tuple | None = None
+_QT_LAST_REPEATS = 0
+_QT_LAST_FLUSHED_AT = 0.0
+# Armed on the first held-back repeat so a burst that goes quiet still gets
+# its count written within _QT_REPEAT_FLUSH_S, from whatever thread logged it.
+_QT_REPEAT_TIMER: threading.Timer | None = None
+
+
+class _FlushingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers at least every FLUSH_INTERVAL_S."""
+
+    FLUSH_INTERVAL_S = 2.0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_flush = time.monotonic()
+
+    def dequeue(self, block: bool) -> logging.LogRecord:
+        while True:
+            # Safety valve for records held back by _BufferedFileHandler; checked
+            # on every pass so steady traffic cannot postpone it indefinitely.
+            now = time.monotonic()
+            remaining = self._last_flush + self.FLUSH_INTERVAL_S - now
+            if remaining <= 0:
+                self._flush_handlers(now)
+                remaining = self.FLUSH_INTERVAL_S
+            try:
+                return self.queue.get(block, remaining if block else None)
+            except queue.Empty:
+                if not block:
+                    raise
+
+    def _flush_handlers(self, now: float) -> None:
+        self._last_flush = now
+        for handler in self.handlers:
+            handler.flush()
+
+
+class _BufferedFileHandler(MemoryHandler):
+    """
+    MemoryHandler that owns its file target.
+
+    INFO/DEBUG records are written in batches; WARNING and above flush at
+    once. Closing also closes the wrapped file handler.
+    """
+
+    def __init__(self, target: logging.Handler, capacity: int = 256):
+        super().__init__(capacity, flushLevel=logging.WARNING, target=target, flushOnClose=True)
+        self.setLevel(target.level)
+
+    def flush(self) -> None:
+        super().flush()
+        target = self.target
+        if target is not None:
+            target.flush()
+
+    def close(self) -> None:
+        target = self.target
+        super().close()
+        if target is not None:
+            target.close()
+
+
+class _QueueLogHandler(QueueHandler):
+    """
+    QueueHandler that owns the listener writing to the real handlers.
+
+    Callers only interpolate the message and enqueue it; file and console
+    I/O happen on the listener thread. flush() drains the queue and close()
+    stops the listener; records emitted after stop() are written inline.
+    """
+
+    def __init__(self, *handlers: logging.Handler):
+        super().__init__(queue.Queue(-1))
+        self.listener = _FlushingQueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._listening = False
+
+    def start(self) -> None:
+        if not self._listening:
+            self.listener.start()
+            self._listening = True
+
+    def stop(self) -> None:
+        """Drain pending records and stop the listener thread."""
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self._listening:
+            super().emit(record)
+        else:
+            # Listener stopped (e.g. during atexit): write synchronously.
+            self.listener.handle(record)
+
+    def flush(self) -> None:
+        if self._listening:
+            self.queue.join()
+        for handler in self.listener.handlers:
+            handler.flush()
+
+    def close(self) -> None:
+        global _LOG_LISTENER
+        self.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        if _LOG_LISTENER is self.listener:
+            _LOG_LISTENER = None
+        super().close()
+
+
+def _rotate_log_file(log_file: Path, backup_count: int) -> None:
+    """Shift app.log -> app.log.1 -> ... -> app.log.<backup_count>, dropping the oldest."""
+    for index in range(backup_count - 1, 0, -1):
+        src = log_file.with_name(f"{log_file.name}.{index}")
+        if src.exists():
+            os.replace(src, log_file.with_name(f"{log_file.name}.{index + 1}"))
+    os.replace(log_file, log_file.with_name(f"{log_file.name}.1"))
+
+
+def _build_qt_dispatch(logger: logging.Logger) -> dict[QtMsgType, Callable[..., None]]:
+    return {
+        QtMsgType.QtDebugMsg: logger.debug,
+        QtMsgType.QtInfoMsg: logger.info,
+        QtMsgType.QtWarningMsg: logger.warning,
+        QtMsgType.QtCriticalMsg: logger.error,
+        QtMsgType.QtFatalMsg: logger.critical,
+    }
+
+
+def _qt_category_prefix(category) -> str:
+    try:
+        text = str(category).strip()
+    except Exception:
+        return _QT_PREFIX_PLAIN
+    prefix = f"[Qt:{text}] " if text else _QT_PREFIX_PLAIN
+    if isinstance(category, str) and len(_QT_PREFIX_CACHE) < _QT_PREFIX_CACHE_MAX:
+        _QT_PREFIX_CACHE[category] = prefix
+    return prefix
+
+
+def _coalesce_qt_message(logger: logging.Logger, mode, prefix: str, message: str) -> bool:
+    """
+    Return True when the message should be logged now.
+
+    Repeats of the previous message are only counted; the count is written
+    as ``<message> (xN)`` once a different message arrives, on the next
+    repeat after _QT_REPEAT_FLUSH_S, or by a timer _QT_REPEAT_FLUSH_S after
+    the first held-back repeat if the burst goes quiet.
+    """
+    global _QT_LAST_KEY, _QT_LAST_REPEATS, _QT_LAST_FLUSHED_AT, _QT_REPEAT_TIMER
+    if mode == QtMsgType.QtFatalMsg:
+        _flush_qt_repeats()
+        return True
+
+    key = (mode, prefix, message)
+    now = time.monotonic()
+    with _QT_REPEAT_LOCK:
+        if key == _QT_LAST_KEY:
+            _QT_LAST_REPEATS += 1
+            if now - _QT_LAST_FLUSHED_AT < _QT_REPEAT_FLUSH_S:
+                if _QT_REPEAT_TIMER is None:
+                    timer = threading.Timer(_QT_REPEAT_FLUSH_S, _flush_held_qt_repeats)
+                    timer.daemon = True
+                    _QT_REPEAT_TIMER = timer
+                    timer.start()
+                return False
+            pending, repeats = key, _QT_LAST_REPEATS
+            _QT_LAST_REPEATS = 0
+            _QT_LAST_FLUSHED_AT = now
+            fresh = False
+        else:
+            pending, repeats = _QT_LAST_KEY, _QT_LAST_REPEATS
+            _QT_LAST_KEY, _QT_LAST_REPEATS, _QT_LAST_FLUSHED_AT = key, 0, now
+            fresh = True
+
+    if repeats:
+        _log_qt_repeats(logger, pending, repeats)
+    return fresh
+
+
+def _log_qt_repeats(logger: logging.Logger, key: tuple, repeats: int) -> None:
+    mode, prefix, message = key
+    _QT_DISPATCH.get(mode, logger.info)("%s%s (x%d)", prefix, message, repeats)
+
+
+def _flush_held_qt_repeats() -> None:
+    """Timer callback: write the pending count but keep coalescing the same message."""
+    global _QT_LAST_REPEATS, _QT_LAST_FLUSHED_AT, _QT_REPEAT_TIMER
+    with _QT_REPEAT_LOCK:
+        _QT_REPEAT_TIMER = None
+        pending, repeats = _QT_LAST_KEY, _QT_LAST_REPEATS
+        _QT_LAST_REPEATS = 0
+        _QT_LAST_FLUSHED_AT = time.monotonic()
+    logger = _QT_BRIDGE_LOGGER
+    if repeats and logger is not None:
+        _log_qt_repeats(logger, pending, repeats)
+
+
+def _flush_qt_repeats() -> None:
+    """Write out any pending repeat count (called on fatal messages and at exit)."""
+    global _QT_LAST_KEY, _QT_LAST_REPEATS, _QT_REPEAT_TIMER
+    with _QT_REPEAT_LOCK:
+        pending, repeats = _QT_LAST_KEY, _QT_LAST_REPEATS
+        _QT_LAST_KEY, _QT_LAST_REPEATS = None, 0
+        timer, _QT_REPEAT_TIMER = _QT_REPEAT_TIMER, None
+    if timer is not None:
+        timer.cancel()
+    logger = _QT_BRIDGE_LOGGER
+    if repeats and logger is not None:
+        _log_qt_repeats(logger, pending, repeats)
 
 
 def _qt_message_handler(mode, context, message: str) -> None:
-    global _QT_BRIDGE_LOGGER
     logger = _QT_BRIDGE_LOGGER
     if logger is None:
         return
 
-    category = ""
-    try:
-        category = str(getattr(context, "category", "") or "").strip()
-    except Exception:
-        category = ""
-    prefix = f"[Qt:{category}] " if category else "[Qt] "
-
-    if mode == QtMsgType.QtDebugMsg:
-        logger.debug("%s%s", prefix, message)
-    elif mode == QtMsgType.QtInfoMsg:
-        logger.info("%s%s", prefix, message)
-    elif mode == QtMsgType.QtWarningMsg:
-        logger.warning("%s%s", prefix, message)
-    elif mode == QtMsgType.QtCriticalMsg:
-        logger.error("%s%s", prefix, message)
-    elif mode == QtMsgType.QtFatalMsg:
-        logger.critical("%s%s", prefix, message)
+    category = getattr(context, "category", None)
+    if not category:
+        prefix = _QT_PREFIX_PLAIN
     else:
-        logger.info("%s%s", prefix, message)
+        prefix = _QT_PREFIX_CACHE.get(category) if isinstance(category, str) else None
+        if prefix is None:
+            prefix = _qt_category_prefix(category)
+
+    if _coalesce_qt_message(logger, mode, prefix, message):
+        _QT_DISPATCH.get(mode, logger.info)("%s%s", prefix, message)
 
     if _QT_PREV_HANDLER is not None:
         try:
@@ -47,8 +265,19 @@ def _qt_message_handler(mode, context, message: str) -> None:
 
 
 def _install_qt_message_bridge(logger: logging.Logger) -> None:
-    global _QT_BRIDGE_INSTALLED, _QT_PREV_HANDLER, _QT_BRIDGE_LOGGER
+    """
+    Route Qt messages into ``logger``.
+
+    The Qt handler is installed once per process; later calls only re-point
+    the target logger, which are plain global assignments and need no lock.
+    """
+    global _QT_BRIDGE_INSTALLED, _QT_PREV_HANDLER, _QT_BRIDGE_LOGGER, _QT_DISPATCH
+    if _QT_BRIDGE_INSTALLED:
+        _QT_DISPATCH = _build_qt_dispatch(logger)
+        _QT_BRIDGE_LOGGER = logger
+        return
     with _QT_BRIDGE_LOCK:
+        _QT_DISPATCH = _build_qt_dispatch(logger)
         _QT_BRIDGE_LOGGER = logger
         if _QT_BRIDGE_INSTALLED:
             return
@@ -58,8 +287,13 @@ def _install_qt_message_bridge(logger: logging.Logger) -> None:
 
 def setup_logger(log_dir: Path, debug: bool = False) -> logging.Logger:
     """
-    Configure rotating file logger.
+    Configure the file logger; app.log is rotated at startup once it passes 5 MB.
+
+    Records are handed to a background QueueListener so logging from the GUI
+    or worker threads never blocks on disk I/O; the listener batches file
+    writes and flushes at least every couple of seconds.
     """
+    global _LOG_LISTENER
     log_dir.mkdir(parents=True, exist_ok=True)
     logger = logging.getLogger("CyberCompanion")
     logger.setLevel(logging.DEBUG if debug else logging.INFO)
@@ -70,12 +304,15 @@ def setup_logger(log_dir: Path, debug: bool = False) -> logging.Logger:
         _install_qt_message_bridge(logger)
         return logger
 
-    file_handler = RotatingFileHandler(
-        log_dir / "app.log",
-        maxBytes=5 * 1024 * 1024,
-        backupCount=3,
-        encoding="utf-8",
-    )
+    # Rotate once per launch instead of checking the size on every record.
+    log_file = log_dir / "app.log"
+    try:
+        if log_file.stat().st_size > _LOG_MAX_BYTES:
+            _rotate_log_file(log_file, _LOG_BACKUP_COUNT)
+    except OSError:
+        pass
+
+    file_handler = logging.FileHandler(log_file, encoding="utf-8")
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(
         logging.Formatter(
@@ -83,13 +320,24 @@ def setup_logger(log_dir: Path, debug: bool = False) -> logging.Logger:
             datefmt="%Y-%m-%d %H:%M:%S",
         )
     )
-    logger.addHandler(file_handler)
+    buffered_handler = _BufferedFileHandler(file_handler)
+    handlers: list[logging.Handler] = [buffered_handler]
 
     if debug:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.DEBUG)
         console_handler.setFormatter(logging.Formatter("[%(levelname)s] %(message)s"))
-        logger.addHandler(console_handler)
+        handlers.append(console_handler)
+
+    queue_handler = _QueueLogHandler(*handlers)
+    queue_handler.start()
+    _LOG_LISTENER = queue_handler.listener
+    # Flush whatever is still queued or buffered when the interpreter exits
+    # (atexit runs in reverse order: repeat counts, then the queue, then the buffer).
+    atexit.register(buffered_handler.flush)
+    atexit.register(queue_handler.stop)
+    atexit.register(_flush_qt_repeats)
+    logger.addHandler(queue_handler)
 
     _install_qt_message_bridge(logger)
     return logger
@@ -1,5 +1,13 @@
 from __future__ import annotations
 
+from bisect import bisect_right
+
+# Mood is kept as an integer in thousandths so updates are integer clamps.
+_SCALE = 1000
+_NEUTRAL = 500
+_BREAKS = (200, 400, 600, 800)
+_LABELS = ("愤怒", "不满", "平静", "开心", "兴奋")
+
 
 class MoodSystem:
     """
@@ -7,36 +15,27 @@ class MoodSystem:
     """
 
     def __init__(self, initial_mood: float = 0.5):
-        self._mood = max(0.0, min(1.0, float(initial_mood)))
+        self._m = max(0, min(_SCALE, round(float(initial_mood) * _SCALE)))
 
     @property
     def mood(self) -> float:
-        return self._mood
+        return self._m / _SCALE
 
     @property
     def mood_label(self) -> str:
-        if self._mood < 0.2:
-            return "愤怒"
-        if self._mood < 0.4:
-            return "不满"
-        if self._mood < 0.6:
-            return "平静"
-        if self._mood < 0.8:
-            return "开心"
-        return "兴奋"
+        return _LABELS[bisect_right(_BREAKS, self._m)]
 
     def on_dismissed(self) -> None:
-        self._mood = max(0.0, self._mood - 0.05)
+        self._m = self._m - 50 if self._m > 50 else 0
 
     def on_interacted(self) -> None:
-        self._mood = min(1.0, self._mood + 0.1)
+        self._m = min(_SCALE, self._m + 100)
 
     def on_engaged(self) -> None:
-        self._mood = min(1.0, self._mood + 0.15)
+        self._m = min(_SCALE, self._m + 150)
 
     def natural_decay(self) -> None:
-        if self._mood > 0.5:
-            self._mood = max(0.5, self._mood - 0.02)
-        elif self._mood < 0.5:
-            self._mood = min(0.5, self._mood + 0.02)
-
+        if self._m > _NEUTRAL:
+            self._m = max(_NEUTRAL, self._m - 20)
+        elif self._m < _NEUTRAL:
+            self._m = min(_NEUTRAL, self._m + 20)
@@ -3,12 +3,30 @@ from __future__ import annotations
 import os
 import sys
 from pathlib import Path
+from typing import Callable, Hashable
 
 from PySide6.QtCore import QStandardPaths
 
 
 APP_NAME = "CyberCompanion"
 
+# Resolved directories keyed by the inputs they depend on (platform, env, ...),
+# so repeat lookups skip QStandardPaths queries and mkdir syscalls.
+_PATH_CACHE: dict[Hashable, Path] = {}
+
+
+def _cached_path(key: Hashable, factory: Callable[[], Path]) -> Path:
+    path = _PATH_CACHE.get(key)
+    if path is None:
+        path = factory()
+        _PATH_CACHE[key] = path
+    return path
+
+
+def _reset_path_cache() -> None:
+    """Forget resolved paths (tests change env/platform between calls)."""
+    _PATH_CACHE.clear()
+
 
 def get_base_dir() -> Path:
     """
@@ -26,13 +44,21 @@ def get_base_dir() -> Path:
     if getattr(sys, "frozen", False) and hasattr(sys, "_MEIPASS"):
         return Path(sys._MEIPASS)  # type: ignore[attr-defined]
 
-    return Path(__file__).resolve().parents[2]
+    return _cached_path("base", lambda: Path(__file__).resolve().parents[2])
 
 
 def get_user_data_dir() -> Path:
     """
     Return writable user data directory.
     """
+    if sys.platform == "win32":
+        key = ("user", sys.platform, os.environ.get("LOCALAPPDATA"))
+    else:
+        key = ("user", sys.platform)
+    return _cached_path(key, _make_user_data_dir)
+
+
+def _make_user_data_dir() -> Path:
     # Keep a deterministic Windows location so packaged/runtime checks can rely on one path.
     if sys.platform == "win32":
         target = Path(os.environ.get("LOCALAPPDATA", Path.home() / "AppData" / "Local")) / APP_NAME
@@ -53,6 +79,10 @@ def get_user_data_dir() -> Path:
 
 
 def get_cache_dir() -> Path:
+    return _cached_path(("cache", sys.platform), _make_cache_dir)
+
+
+def _make_cache_dir() -> Path:
     location = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
     if location:
         base = Path(location)
@@ -66,11 +96,27 @@ def get_cache_dir() -> Path:
 
 
 def get_log_dir() -> Path:
-    target = get_user_data_dir() / "logs"
+    user_dir = get_user_data_dir()
+    return _cached_path(("log", user_dir), lambda: _make_dir(user_dir / "logs"))
+
+
+def _make_dir(target: Path) -> Path:
     target.mkdir(parents=True, exist_ok=True)
     return target
 
 
+def ensure_app_dirs() -> None:
+    """
+    Create the user data, cache and log directories in one boot-time pass.
+
+    Each directory is created at most once per process; afterwards the
+    getters return cached paths without touching the filesystem.
+    """
+    get_user_data_dir()
+    get_cache_dir()
+    get_log_dir()
+
+
 def get_log_file() -> Path:
     return get_log_dir() / "app.log"
 
@@ -85,6 +131,11 @@ def resolve_config_path() -> Path:
     3) Return user data path (even if not created yet)
     """
     user_cfg = get_user_data_dir() / "config.json"
+    # Existence check and bootstrap copy only run once per process.
+    return _cached_path(("config", user_cfg), lambda: _bootstrap_config(user_cfg))
+
+
+def _bootstrap_config(user_cfg: Path) -> Path:
     if user_cfg.exists():
         return user_cfg
 
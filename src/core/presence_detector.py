@@ -15,31 +15,52 @@ class PresenceState(Enum):
     UNKNOWN = auto()
 
 
+# Bits of the presence lookup key.
+_IDLE_PAST_ACTIVE = 1  # idle >= ACTIVE_IDLE_MS
+_IDLE_PAST_THRESHOLD = 2  # idle >= IDLE_THRESHOLD_MS
+_FACE_DETECTED = 4
+_FACE_ABSENT_SATURATED = 8
+_NO_GAZE = 16
+
+
+def _classify(key: int) -> PresenceState:
+    if not key & _IDLE_PAST_ACTIVE:
+        return PresenceState.PRESENT_ACTIVE
+    if key & _NO_GAZE:
+        return PresenceState.UNKNOWN
+    if key & _IDLE_PAST_THRESHOLD:
+        if key & _FACE_ABSENT_SATURATED:
+            return PresenceState.ABSENT
+        if key & _FACE_DETECTED:
+            return PresenceState.PRESENT_PASSIVE
+    return PresenceState.UNKNOWN
+
+
 class PresenceDetector:
     """Fuse idle time and camera face detection to infer presence."""
 
+    ACTIVE_IDLE_MS = 60_000
     IDLE_THRESHOLD_MS = 300_000
     FACE_ABSENT_FRAMES = 30
 
+    # Every combination of the key bits, resolved once.
+    _TABLE: tuple[PresenceState, ...] = tuple(_classify(key) for key in range(32))
+
     def __init__(self):
         self._face_absent_count = 0
 
     def determine_presence(self, idle_time_ms: int, gaze_data: GazeData | None) -> PresenceState:
-        if idle_time_ms < 60_000:
-            return PresenceState.PRESENT_ACTIVE
-
-        if gaze_data is None:
-            return PresenceState.UNKNOWN
-
-        if not gaze_data.face_detected:
-            self._face_absent_count += 1
-        else:
-            self._face_absent_count = 0
+        past_active = idle_time_ms >= self.ACTIVE_IDLE_MS
+        face = False
+        if gaze_data is not None and past_active:
+            face = bool(gaze_data.face_detected)
+            self._face_absent_count = 0 if face else self._face_absent_count + 1
 
-        if idle_time_ms >= self.IDLE_THRESHOLD_MS:
-            if self._face_absent_count >= self.FACE_ABSENT_FRAMES:
-                return PresenceState.ABSENT
-            if gaze_data.face_detected:
-                return PresenceState.PRESENT_PASSIVE
-
-        return PresenceState.UNKNOWN
+        key = (
+            past_active
+            | (idle_time_ms >= self.IDLE_THRESHOLD_MS) << 1
+            | face << 2
+            | (self._face_absent_count >= self.FACE_ABSENT_FRAMES) << 3
+            | (gaze_data is None) << 4
+        )
+        return self._TABLE[key]
@@ -1,40 +1,65 @@
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta
+from datetime import datetime
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class ResourcePlan:
     gui_running: bool = True
     cv_running: bool = True
     llm_running: bool = False
 
 
+def _to_seconds(now: float | datetime | None) -> float:
+    """Normalise a caller-supplied timestamp to ``time.monotonic()`` seconds."""
+    if now is None:
+        return time.monotonic()
+    if isinstance(now, datetime):
+        # Compatibility for callers that still pass wall-clock datetimes: shift
+        # by their distance from the current wall clock so they share the
+        # monotonic base with the default.
+        return time.monotonic() + (now.timestamp() - time.time())
+    return float(now)
+
+
 class ResourceScheduler:
     """
     Lightweight scheduler for GUI/CV/LLM lifecycle decisions.
     """
 
     LLM_IDLE_TERMINATE_MINUTES = 5
+    LLM_IDLE_TERMINATE_S = LLM_IDLE_TERMINATE_MINUTES * 60.0
+
+    # The only possible outcomes; plans are frozen so callers can share them.
+    _FULLSCREEN_PLAN = ResourcePlan(gui_running=True, cv_running=False, llm_running=False)
+    _ACTIVE_PLAN = ResourcePlan(gui_running=True, cv_running=True, llm_running=True)
+    _IDLE_PLAN = ResourcePlan(gui_running=True, cv_running=True, llm_running=False)
 
     def __init__(self):
-        self._last_dialog_at: datetime | None = None
+        self._last_dialog_at: float | None = None
 
-    def mark_dialog_activity(self, now: datetime | None = None) -> None:
-        self._last_dialog_at = now or datetime.now()
+    def mark_dialog_activity(self, now: float | datetime | None = None) -> None:
+        self._last_dialog_at = _to_seconds(now)
 
-    def resolve_plan(self, *, is_fullscreen: bool, user_dialog_active: bool, now: datetime | None = None) -> ResourcePlan:
-        timestamp = now or datetime.now()
+    def resolve_plan(
+        self,
+        *,
+        is_fullscreen: bool,
+        user_dialog_active: bool,
+        now: float | datetime | None = None,
+    ) -> ResourcePlan:
         if is_fullscreen:
-            return ResourcePlan(gui_running=True, cv_running=False, llm_running=False)
+            return self._FULLSCREEN_PLAN
 
+        timestamp = _to_seconds(now)
         if user_dialog_active:
-            self.mark_dialog_activity(timestamp)
-            return ResourcePlan(gui_running=True, cv_running=True, llm_running=True)
-
-        if self._last_dialog_at and timestamp <= self._last_dialog_at + timedelta(minutes=self.LLM_IDLE_TERMINATE_MINUTES):
-            return ResourcePlan(gui_running=True, cv_running=True, llm_running=True)
+            self._last_dialog_at = timestamp
+            return self._ACTIVE_PLAN
 
-        return ResourcePlan(gui_running=True, cv_running=True, llm_running=False)
+        last = self._last_dialog_at
+        if last is not None and timestamp - last <= self.LLM_IDLE_TERMINATE_S:
+            return self._ACTIVE_PLAN
 
+        return self._IDLE_PLAN
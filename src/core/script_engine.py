@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import bisect
+import itertools
 import random
 from datetime import datetime, timedelta
 
@@ -17,20 +19,46 @@ class ScriptEngine:
     - Weighted random by probability
     """
 
+    WEIGHTS_CACHE_MAX = 64
+
     def __init__(self, idle_scripts: list[Script], panic_scripts: list[Script] | None = None):
-        self._idle_scripts = list(idle_scripts)
-        self._panic_scripts = list(panic_scripts or [])
+        self._idle_scripts: list[Script] = []
+        self._panic_scripts: list[Script] = []
+        self._idle_timed: list[Script] = []
+        self._idle_default: list[Script] = []
+        self._panic_timed: list[Script] = []
+        self._panic_default: list[Script] = []
+        self._partition(idle_scripts, panic_scripts)
         self._last_played: dict[str, datetime] = {}
         self._last_script_id: str | None = None
+        # Candidate id tuple -> (cumulative weights, total); pools repeat across ticks.
+        self._weights_cache: dict[tuple[str, ...], tuple[list[float], float]] = {}
 
     def refresh(self, idle_scripts: list[Script], panic_scripts: list[Script] | None = None) -> None:
+        self._partition(idle_scripts, panic_scripts)
+        self._weights_cache.clear()
+
+    def _partition(self, idle_scripts: list[Script], panic_scripts: list[Script] | None) -> None:
+        """Split each pool into time-bounded and default scripts once per refresh."""
         self._idle_scripts = list(idle_scripts)
         self._panic_scripts = list(panic_scripts or [])
+        self._idle_timed, self._idle_default = self._split_by_range(self._idle_scripts)
+        self._panic_timed, self._panic_default = self._split_by_range(self._panic_scripts)
+
+    @classmethod
+    def _split_by_range(cls, scripts: list[Script]) -> tuple[list[Script], list[Script]]:
+        timed: list[Script] = []
+        default: list[Script] = []
+        for script in scripts:
+            (default if cls._is_default_range(script) else timed).append(script)
+        return timed, default
 
     def select_idle_script(self, now: datetime | None = None) -> Script | None:
         timestamp = now or datetime.now()
         return self._select_script(
             source=self._idle_scripts,
+            timed=self._idle_timed,
+            default=self._idle_default,
             now=timestamp,
             avoid_repeat=True,
             honor_cooldown=True,
@@ -38,9 +66,14 @@ class ScriptEngine:
 
     def select_panic_script(self, now: datetime | None = None) -> Script | None:
         timestamp = now or datetime.now()
-        candidates = self._panic_scripts or self._idle_scripts
+        if self._panic_scripts:
+            source, timed, default = self._panic_scripts, self._panic_timed, self._panic_default
+        else:
+            source, timed, default = self._idle_scripts, self._idle_timed, self._idle_default
         return self._select_script(
-            source=candidates,
+            source=source,
+            timed=timed,
+            default=default,
             now=timestamp,
             avoid_repeat=False,
             honor_cooldown=False,
@@ -50,6 +83,8 @@ class ScriptEngine:
         self,
         *,
         source: list[Script],
+        timed: list[Script],
+        default: list[Script],
         now: datetime,
         avoid_repeat: bool,
         honor_cooldown: bool,
@@ -57,8 +92,8 @@ class ScriptEngine:
         if not source:
             return None
 
-        exact_matches = [s for s in source if self._is_time_match(s, now) and not self._is_default_range(s)]
-        default_matches = [s for s in source if self._is_default_range(s)]
+        exact_matches = [s for s in timed if self._is_time_match(s, now)]
+        default_matches = default
         primary_pool = exact_matches or default_matches or source
 
         candidates = self._filter_candidates(
@@ -126,10 +161,21 @@ class ScriptEngine:
             return False
         return now < last_time + timedelta(minutes=script.cooldown_minutes)
 
-    @staticmethod
-    def _weighted_random(candidates: list[Script]) -> Script:
-        weights = [max(script.probability, 0.01) for script in candidates]
-        return random.choices(candidates, weights=weights, k=1)[0]
+    def _weighted_random(self, candidates: list[Script]) -> Script:
+        key = tuple(script.id for script in candidates)
+        cached = self._weights_cache.get(key)
+        if cached is None:
+            if len(self._weights_cache) >= self.WEIGHTS_CACHE_MAX:
+                self._weights_cache.clear()
+            cum_weights = list(itertools.accumulate(max(script.probability, 0.01) for script in candidates))
+            cached = (cum_weights, cum_weights[-1])
+            self._weights_cache[key] = cached
+        cum_weights, total = cached
+        # bisect over the cached prefix sums is already a C-level O(log n)
+        # search; np.random.choice re-validates p on every call and is far
+        # slower at single draws even for pools of a few hundred scripts.
+        idx = bisect.bisect_right(cum_weights, random.random() * total)
+        return candidates[min(idx, len(candidates) - 1)]
 
     @staticmethod
     def _is_default_range(script: Script) -> bool:
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import logging
 from enum import Enum, auto
 from typing import Callable
 
 from PySide6.QtCore import QObject, Signal
 
+logger = logging.getLogger("CyberCompanion")
+
 
 class EntityState(Enum):
     """Companion behavior states."""
@@ -15,6 +18,9 @@ class EntityState(Enum):
     FLEEING = auto()
 
 
+_STATE_COUNT = len(EntityState)
+
+
 class StateMachine(QObject):
     """
     Finite-state machine controller.
@@ -24,17 +30,20 @@ class StateMachine(QObject):
 
     state_changed = Signal(object, object)
 
-    VALID_TRANSITIONS: dict[EntityState, list[EntityState]] = {
-        EntityState.HIDDEN: [EntityState.PEEKING, EntityState.ENGAGED],
-        EntityState.PEEKING: [EntityState.ENGAGED, EntityState.FLEEING, EntityState.HIDDEN],
-        EntityState.ENGAGED: [EntityState.FLEEING, EntityState.HIDDEN],
-        EntityState.FLEEING: [EntityState.HIDDEN],
+    VALID_TRANSITIONS: dict[EntityState, frozenset[EntityState]] = {
+        EntityState.HIDDEN: frozenset({EntityState.PEEKING, EntityState.ENGAGED}),
+        EntityState.PEEKING: frozenset({EntityState.ENGAGED, EntityState.FLEEING, EntityState.HIDDEN}),
+        EntityState.ENGAGED: frozenset({EntityState.FLEEING, EntityState.HIDDEN}),
+        EntityState.FLEEING: frozenset({EntityState.HIDDEN}),
     }
+    _NO_TRANSITIONS: frozenset[EntityState] = frozenset()
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._current_state = EntityState.HIDDEN
-        self._callbacks: dict[EntityState, dict[str, Callable | None]] = {}
+        # Indexed by ``state.value - 1`` (EntityState values start at 1).
+        self._on_enter: list[Callable | None] = [None] * _STATE_COUNT
+        self._on_exit: list[Callable | None] = [None] * _STATE_COUNT
 
     @property
     def current_state(self) -> EntityState:
@@ -47,29 +56,30 @@ class StateMachine(QObject):
         on_enter: Callable | None = None,
         on_exit: Callable | None = None,
     ) -> None:
-        self._callbacks[state] = {"enter": on_enter, "exit": on_exit}
+        index = state.value - 1
+        self._on_enter[index] = on_enter if callable(on_enter) else None
+        self._on_exit[index] = on_exit if callable(on_exit) else None
 
     def transition_to(self, new_state: EntityState) -> bool:
         if new_state == self._current_state:
             return True
-        allowed = self.VALID_TRANSITIONS.get(self._current_state, [])
+        allowed = self.VALID_TRANSITIONS.get(self._current_state, self._NO_TRANSITIONS)
         if new_state not in allowed:
-            print(f"[FSM] 非法状态转换: {self._current_state.name} -> {new_state.name}")
+            logger.warning("[FSM] 非法状态转换: %s -> %s", self._current_state.name, new_state.name)
             return False
 
         old_state = self._current_state
-        old_callbacks = self._callbacks.get(old_state, {})
-        exit_fn = old_callbacks.get("exit")
-        if callable(exit_fn):
+        exit_fn = self._on_exit[old_state.value - 1]
+        if exit_fn is not None:
             exit_fn()
 
         self._current_state = new_state
-        new_callbacks = self._callbacks.get(new_state, {})
-        enter_fn = new_callbacks.get("enter")
-        if callable(enter_fn):
+        enter_fn = self._on_enter[new_state.value - 1]
+        if enter_fn is not None:
             enter_fn()
 
         self.state_changed.emit(old_state, new_state)
-        print(f"[FSM] 状态转换: {old_state.name} -> {new_state.name}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("[FSM] 状态转换: %s -> %s", old_state.name, new_state.name)
         return True
 
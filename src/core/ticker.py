@@ -0,0 +1,105 @@
+"""
+Process-wide periodic ticker.
+
+Instead of every component owning its own repeating QTimer, periodic work
+subscribes to a single shared ticker.  The ticker runs one coarse QTimer at
+the greatest common divisor of all subscribed periods and fires whichever
+subscribers are due on each tick.
+
+Must be used from the GUI thread.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Callable
+
+from PySide6.QtCore import QObject, Qt, QTimer
+
+
+class TickerSubscription:
+    """Handle returned by :meth:`Ticker.subscribe`."""
+
+    __slots__ = ("_ticker", "period_ms", "callback", "_remaining_ms")
+
+    def __init__(self, ticker: Ticker, period_ms: int, callback: Callable[[], None]):
+        self._ticker: Ticker | None = ticker
+        self.period_ms = period_ms
+        self.callback = callback
+        self._remaining_ms = period_ms
+
+    @property
+    def active(self) -> bool:
+        return self._ticker is not None
+
+    def unsubscribe(self) -> None:
+        """Stop receiving ticks. Safe to call more than once."""
+        ticker = self._ticker
+        if ticker is None:
+            return
+        self._ticker = None
+        ticker._remove(self)
+
+
+class Ticker(QObject):
+    """Single shared timer driving all periodic subscribers."""
+
+    _instance: Ticker | None = None
+
+    def __init__(self, parent: QObject | None = None):
+        super().__init__(parent)
+        self._subscriptions: list[TickerSubscription] = []
+        self._timer = QTimer(self)
+        # Periodic UI work has no precision needs; avoid raising the OS timer resolution.
+        self._timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._timer.timeout.connect(self._on_tick)
+
+    @classmethod
+    def instance(cls) -> Ticker:
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def interval_ms(self) -> int:
+        return self._timer.interval()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, period_ms: int, callback: Callable[[], None]) -> TickerSubscription:
+        """Call ``callback`` every ``period_ms`` until unsubscribed."""
+        period_ms = max(1, int(period_ms))
+        subscription = TickerSubscription(self, period_ms, callback)
+        self._subscriptions.append(subscription)
+        self._reschedule()
+        return subscription
+
+    def _remove(self, subscription: TickerSubscription) -> None:
+        try:
+            self._subscriptions.remove(subscription)
+        except ValueError:
+            return
+        self._reschedule()
+
+    def _reschedule(self) -> None:
+        if not self._subscriptions:
+            self._timer.stop()
+            return
+        interval = math.gcd(*(sub.period_ms for sub in self._subscriptions))
+        if self._timer.isActive() and self._timer.interval() == interval:
+            return
+        self._timer.start(interval)
+
+    def _on_tick(self) -> None:
+        elapsed = self._timer.interval()
+        # Copy: callbacks may unsubscribe (or subscribe) while we iterate.
+        for sub in tuple(self._subscriptions):
+            if not sub.active:
+                continue
+            sub._remaining_ms -= elapsed
+            if sub._remaining_ms > 0:
+                continue
+            sub._remaining_ms = sub.period_ms
+            sub.callback()
@@ -1,10 +1,40 @@
 from __future__ import annotations
 
+import sys
 from datetime import datetime
+from functools import lru_cache
+
+# AssetManager interns loaded ranges, so the common case is a pointer compare.
+_DEFAULT = sys.intern("default")
+# Every canonical "HH:MM" string -> minutes since midnight.
+_HHMM: dict[str, int] = {f"{h:02d}:{m:02d}": h * 60 + m for h in range(24) for m in range(60)}
 
 
 def is_default_time_range(time_range: str) -> bool:
-    return (time_range or "default").strip().lower() == "default"
+    if time_range is _DEFAULT or not time_range:
+        return True
+    return _parse_range(time_range) == _DEFAULT
+
+
+@lru_cache(maxsize=256)
+def _parse_range(time_range: str) -> tuple[int, int] | str | None:
+    """
+    Parse a raw range string once.
+
+    Returns ``"default"``, ``(start_minutes, end_minutes)``, or ``None`` when
+    the range is malformed.
+    """
+    value = time_range.strip().lower()
+    if value == _DEFAULT:
+        return _DEFAULT
+    if "-" not in value:
+        return None
+
+    start_text, end_text = value.split("-", 1)
+    try:
+        return (_to_minutes(start_text), _to_minutes(end_text))
+    except ValueError:
+        return None
 
 
 def matches_time_range(time_range: str, now: datetime) -> bool:
@@ -15,19 +45,15 @@ def matches_time_range(time_range: str, now: datetime) -> bool:
     - 12:00-13:00 matches 12:00 but not 13:00
     - 22:00-06:00 wraps midnight
     """
-    value = (time_range or "default").strip().lower()
-    if value == "default":
+    if time_range is _DEFAULT or not time_range:
         return True
-    if "-" not in value:
-        return False
-
-    start_text, end_text = value.split("-", 1)
-    try:
-        start_minutes = _to_minutes(start_text)
-        end_minutes = _to_minutes(end_text)
-    except ValueError:
+    parsed = _parse_range(time_range)
+    if parsed == _DEFAULT:
+        return True
+    if parsed is None:
         return False
 
+    start_minutes, end_minutes = parsed
     current = now.hour * 60 + now.minute
     if start_minutes <= end_minutes:
         return start_minutes <= current < end_minutes
@@ -35,7 +61,12 @@ def matches_time_range(time_range: str, now: datetime) -> bool:
 
 
 def _to_minutes(value: str) -> int:
-    hh_str, mm_str = value.strip().split(":")
+    value = value.strip()
+    minutes = _HHMM.get(value)
+    if minutes is not None:
+        return minutes
+    # Non-canonical spellings such as "9:05" still parse the slow way.
+    hh_str, mm_str = value.split(":")
     hh = int(hh_str)
     mm = int(mm_str)
     if not (0 <= hh < 24 and 0 <= mm < 60):
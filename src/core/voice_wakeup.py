@@ -1,23 +1,280 @@
 from __future__ import annotations
 
 import base64
+import collections
+import hashlib
 import json
 import logging
+import math
 import os
+import re
 import threading
 import time
-from typing import Any, Iterable
-from urllib.parse import urlencode, urlsplit, urlunsplit
-
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+from json.decoder import scanstring
+from typing import Any, Callable, Iterable
+from urllib.parse import quote
+
+import numpy as np
 from PySide6.QtCore import QThread, Signal
 
+try:
+    import pybase64 as _base64  # SIMD base64 when available
+except ModuleNotFoundError:
+    _base64 = base64
+
+try:
+    import orjson
+except ModuleNotFoundError:
+    orjson = None
+
+try:
+    import ahocorasick  # pyahocorasick
+except ModuleNotFoundError:
+    ahocorasick = None
+
+# Broad guard on purpose: a broken install (OSError from native libs,
+# AttributeError from a mismatched version) must degrade to text-only
+# rather than abort app startup.
+try:
+    import speech_recognition as _sr  # type: ignore
+except Exception:
+    _sr = None
+
 logger = logging.getLogger("CyberCompanion")
 
 
+def _dumps_event(event: dict[str, Any]) -> str:
+    """Serialize a realtime event, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(event).decode("utf-8")
+    return json.dumps(event, ensure_ascii=False)
+
+
+def _loads_event(payload: str | bytes) -> Any:
+    """Decode a realtime event; raises ValueError on malformed JSON."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
+def _audio_append_event(audio_payload: str) -> str:
+    """
+    ``input_audio_buffer.append`` event for base64 audio.
+
+    Base64 text never needs JSON escaping, so the event is assembled
+    directly instead of running the whole payload through the encoder.
+    """
+    return '{"type":"input_audio_buffer.append","audio":"' + audio_payload + '"}'
+
+
+# Streamed text deltas are the bulk of realtime traffic; their type tags are
+# matched in the raw frame so the delta string can be sliced out without a
+# full JSON parse.
+_DELTA_EVENT_TAGS = (
+    ('"type":"response.output_text.delta"', "response.output_text.delta"),
+    ('"type":"response.text.delta"', "response.text.delta"),
+)
+_DELTA_KEY = '"delta":"'
+
+
+def _parse_delta_event(payload: str) -> dict[str, Any] | None:
+    """Decode a compact text-delta event directly; ``None`` means use the full parser."""
+    for tag, event_type in _DELTA_EVENT_TAGS:
+        if tag in payload:
+            break
+    else:
+        return None
+    start = payload.find(_DELTA_KEY)
+    if start == -1:
+        return None
+    try:
+        delta, _end = scanstring(payload, start + len(_DELTA_KEY))
+    except ValueError:
+        return None
+    return {"type": event_type, "delta": delta}
+
+
+def _first_text(mapping: dict[str, Any], keys: tuple[str, ...]) -> str:
+    """First non-blank string value among ``keys``, stripped; ``""`` if there is none."""
+    for key in keys:
+        value = mapping.get(key)
+        if isinstance(value, str):
+            value = value.strip()
+            if value:
+                return value
+    return ""
+
+
+_XAI_CLEANUP_EVENT_PREFIX = "wakeup_cleanup_"
+_ITEM_EVENT_TYPES = frozenset({"conversation.item.added", "conversation.item.created", "conversation.item.done"})
+
+
+def _conversation_item_ids(event_type: str, event: dict[str, Any]) -> list[str]:
+    """Ids of conversation items a realtime event reports as created."""
+    if event_type in _ITEM_EVENT_TYPES:
+        item = event.get("item")
+        return [item["id"]] if isinstance(item, dict) and isinstance(item.get("id"), str) else []
+    if event_type == "input_audio_buffer.committed":
+        item_id = event.get("item_id")
+        return [item_id] if isinstance(item_id, str) else []
+    if event_type == "response.done":
+        response = event.get("response")
+        output = response.get("output") if isinstance(response, dict) else None
+        if isinstance(output, list):
+            return [item["id"] for item in output if isinstance(item, dict) and isinstance(item.get("id"), str)]
+    return []
+
+
+def _is_cleanup_error(event: dict[str, Any]) -> bool:
+    """True for errors answering our own ``conversation.item.delete`` events."""
+    error = event.get("error")
+    event_id = error.get("event_id") if isinstance(error, dict) else None
+    return isinstance(event_id, str) and event_id.startswith(_XAI_CLEANUP_EVENT_PREFIX)
+
+
+# Base URLs come from config and rarely change, so the normalizers below are
+# memoized; VoiceWakeupListener's static methods delegate to them.
+_DEFAULT_OPENAI_BASE_PARTS = ("https", "api.openai.com", "/v1")
+# Every fallback returns this same object, so callers may test ``is _DEFAULT_OPENAI_V1``.
+_DEFAULT_OPENAI_V1 = "https://api.openai.com/v1"
+# Endpoint paths users paste in place of the base URL.
+_OPENAI_TRIM_SUFFIXES: tuple[str, ...] = ("/chat/completions", "/audio/transcriptions", "/audio/translations")
+# Whitespace seen in pasted URLs (incl. NBSP and the CJK full-width space) plus "/".
+_URL_STRIP_CHARS = " \t\n\r\x0b\x0c\xa0\u3000/"
+_XAI_HOST_SUFFIX = "x.ai"
+_ZHIPU_HOST_SUFFIX = "bigmodel.cn"
+
+
+def _split_url(url: str) -> tuple[str, str, str]:
+    """
+    ``(scheme, netloc, path)`` of ``url`` with query and fragment dropped.
+
+    String slicing stand-in for ``urlsplit`` on the absolute URLs found in
+    config (the scheme is lowercased the same way); anything without ``://``
+    yields empty parts.
+    """
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return "", "", ""
+    scheme = scheme.lower()
+    end = len(rest)
+    for mark in "?#":
+        index = rest.find(mark)
+        if index != -1 and index < end:
+            end = index
+    rest = rest[:end]
+    slash = rest.find("/")
+    if slash == -1:
+        return scheme, rest, ""
+    return scheme, rest[:slash], rest[slash:]
+
+
+def _host_ends_with(base_url: str, suffix: str) -> bool:
+    """Whether the host of ``base_url`` (without credentials or port) ends with ``suffix``."""
+    if "://" not in base_url:
+        return False
+    _scheme, netloc, _path = _split_url(base_url.strip())
+    host = netloc.rpartition("@")[2]
+    if ":" in host and not host.endswith("]"):
+        host = host.rpartition(":")[0]
+    return host.lower().endswith(suffix)
+
+
+@lru_cache(maxsize=128)
+def _normalize_base_url_parts(base_url: str) -> tuple[str, str, str]:
+    """``(scheme, netloc, path)`` of the normalized ``.../v1`` base URL."""
+    normalized = base_url.strip(_URL_STRIP_CHARS)
+    if "://" not in normalized:
+        return _DEFAULT_OPENAI_BASE_PARTS
+    scheme, netloc, path = _split_url(normalized)
+    if not scheme or not netloc:
+        return _DEFAULT_OPENAI_BASE_PARTS
+
+    path = path.rstrip("/")
+    for suffix in _OPENAI_TRIM_SUFFIXES:
+        if path.endswith(suffix):
+            path = path[: -len(suffix)]
+            break
+    if "/v1/" in path:
+        path = path.split("/v1/", maxsplit=1)[0] + "/v1"
+    elif path.endswith("/v1"):
+        pass
+    elif not path:
+        path = "/v1"
+    else:
+        path = f"{path}/v1"
+    return scheme, netloc, path
+
+
+@lru_cache(maxsize=128)
+def _normalize_base_url_cached(base_url: str) -> str:
+    parts = _normalize_base_url_parts(base_url)
+    if parts is _DEFAULT_OPENAI_BASE_PARTS:
+        return _DEFAULT_OPENAI_V1
+    scheme, netloc, path = parts
+    return f"{scheme}://{netloc}{path}"
+
+
+@lru_cache(maxsize=128)
+def _normalize_zhipu_base_url_cached(base_url: str, default_endpoint: str) -> str:
+    normalized = base_url.strip(_URL_STRIP_CHARS)
+    if "://" not in normalized:
+        return default_endpoint
+    scheme, netloc, path = _split_url(normalized)
+    if not scheme or not netloc:
+        return default_endpoint
+    path = path.rstrip("/")
+    if not path:
+        path = "/api/paas/v4/audio/transcriptions"
+    elif not path.endswith("/audio/transcriptions"):
+        path = f"{path}/audio/transcriptions"
+    return f"{scheme}://{netloc}{path}"
+
+
+@lru_cache(maxsize=128)
+def _build_xai_realtime_endpoint_cached(base_url: str, model: str) -> str:
+    base_scheme, netloc, path = _normalize_base_url_parts(base_url)
+    scheme = "wss" if base_scheme in {"https", "wss"} else "ws"
+    # The normalized path always ends in /v1.
+    path = f"{path}/realtime"
+    model_name = model.strip()
+    if not model_name or model_name == "whisper-1":
+        model_name = "grok-2-mini-transcribe"
+    return f"{scheme}://{netloc}{path}?model={quote(model_name, safe='')}"
+
+
+@lru_cache(maxsize=64)
+def _normalize_whisper_language_cached(language: str) -> str:
+    normalized = language.strip().lower().replace("_", "-")
+    if len(normalized) == 2 and normalized.isalpha():
+        return normalized
+    if "-" in normalized:
+        head = normalized.split("-", maxsplit=1)[0]
+        if len(head) == 2 and head.isalpha():
+            return head
+    return ""
+
+
 class WakeupRecognitionError(RuntimeError):
     """Raised when the ASR backend cannot complete recognition."""
 
 
+@dataclass(slots=True)
+class _XaiAudioStream:
+    """xAI Realtime session that receives audio while the phrase is still being recorded."""
+
+    ws: Any
+    websocket_module: Any
+    endpoint: str
+    commit_event_type: str
+    ratecv_state: Any = None
+    pending: bytearray = field(default_factory=bytearray)
+    failed: bool = False
+
+
 class VoiceWakeupListener(QThread):
     """
     Optional microphone wake-word listener.
@@ -31,9 +288,42 @@ class VoiceWakeupListener(QThread):
     _XAI_REALTIME_TIMEOUT_SECONDS = 25.0
     _XAI_REALTIME_INPUT_SAMPLE_RATE = 16000
     _XAI_REALTIME_OUTPUT_SAMPLE_RATE = 24000
+    # session.update payloads never change, so they are serialized once.
+    _XAI_MODERN_SESSION_JSON = _dumps_event(
+        {
+            "type": "session.update",
+            "session": {
+                "turn_detection": {"type": None},
+                "audio": {
+                    "input": {
+                        "format": {
+                            "type": "audio/pcm",
+                            "rate": _XAI_REALTIME_INPUT_SAMPLE_RATE,
+                        }
+                    },
+                    "output": {
+                        "format": {
+                            "type": "audio/pcm",
+                            "rate": _XAI_REALTIME_OUTPUT_SAMPLE_RATE,
+                        }
+                    },
+                },
+            },
+        }
+    )
+    _XAI_LEGACY_SESSION_JSON = _dumps_event(
+        {
+            "type": "session.update",
+            "session": {
+                "input_audio_format": "pcm16",
+            },
+        }
+    )
     _ZHIPU_ASR_ENDPOINT = "https://open.bigmodel.cn/api/paas/v4/audio/transcriptions"
     _ZHIPU_MAX_AUDIO_BYTES = 25 * 1024 * 1024
     _ZHIPU_MAX_AUDIO_SECONDS = 30.0
+    # Whisper-compatible uploads go out as FLAC (about half the bytes of WAV).
+    _WHISPER_UPLOAD_FLAC = True
     _XAI_TRANSIENT_ERROR_KEYWORDS = (
         "timeout",
         "timed out",
@@ -45,10 +335,27 @@ class VoiceWakeupListener(QThread):
         "503",
         "504",
     )
+    _XAI_TRANSIENT_RE = re.compile("|".join(map(re.escape, _XAI_TRANSIENT_ERROR_KEYWORDS)))
     _XAI_MAX_CONSECUTIVE_ERRORS = 4
-    _LAST_WAKEUP_MONOTONIC = 0.0
-    _LAST_WAKEUP_PHRASE = ""
+    # Local energy gate: segments with less voiced audio never reach the ASR backend.
+    _VAD_FRAME_SECONDS = 0.03
+    _VAD_MIN_VOICED_SECONDS = 0.15
+    # Streamed xAI capture sends audio in ~100 ms PCM16 batches.
+    _XAI_STREAM_SEND_BYTES = _XAI_REALTIME_INPUT_SAMPLE_RATE * 2 // 10
+    _ASR_CACHE_MAX = 64
+    # Segments recorded while earlier ones are still being recognized.
+    _ASR_MAX_IN_FLIGHT = 2
+    # Phrase lists at least this long are matched with a single Aho-Corasick scan.
+    _PHRASE_AUTOMATON_MIN = 8
+    # (monotonic timestamp, phrase), replaced as a whole so readers never see a torn pair.
+    _LAST_WAKEUP: tuple[float, str] = (0.0, "")
+    # Only taken to clear a wakeup that is being consumed.
     _LAST_WAKEUP_LOCK = threading.Lock()
+    # Push-to-talk keeps one Recognizer and reuses its ambient calibration for a while.
+    _PTT_RECOGNIZER = None
+    _PTT_RECOGNIZER_LOCK = threading.Lock()
+    _PTT_CALIBRATED_AT = 0.0
+    _PTT_CALIBRATION_TTL_SECONDS = 300.0
 
     wake_phrase_detected = Signal(str)
     listener_state_changed = Signal(bool)
@@ -70,6 +377,8 @@ class VoiceWakeupListener(QThread):
     ):
         super().__init__(parent)
         self._phrases = tuple(item.strip() for item in phrases if str(item).strip())
+        self._phrases_lower = tuple(dict.fromkeys(phrase.lower() for phrase in self._phrases))
+        self._phrase_automaton = self._build_phrase_automaton(self._phrases_lower)
         self._language = language.strip() or "zh-CN"
         self._recognition_provider = self._normalize_recognition_provider(recognition_provider)
         self._openai_api_key = (
@@ -88,7 +397,27 @@ class VoiceWakeupListener(QThread):
             self._openai_temperature = min(max(float(openai_temperature), 0.0), 1.0)
         except Exception:
             self._openai_temperature = 0.0
-        self._running = False
+        # Base URL and model are fixed for the listener's lifetime.
+        self._xai_endpoint = (
+            self._build_xai_realtime_endpoint(base_url=self._openai_base_url, model=self._openai_model)
+            if self._recognition_provider == "xai_realtime"
+            else ""
+        )
+        # Set by stop_listening and fatal ASR errors; waits on it wake up immediately.
+        self._stop_event = threading.Event()
+        # Reused across segments so HTTP uploads keep their connection alive.
+        self._http_client = None
+        # Idle xAI Realtime session socket and the (endpoint, commit event) it was opened for.
+        self._xai_ws = None
+        self._xai_ws_key: tuple[str, str] | None = None
+        # The capture loop takes the idle socket while the ASR worker parks it.
+        self._xai_ws_lock = threading.Lock()
+        self._xai_stream: _XaiAudioStream | None = None
+        # Digest of the captured clip -> transcript, for byte-identical repeats.
+        self._asr_cache: collections.OrderedDict[bytes, str] = collections.OrderedDict()
+        self._consecutive_xai_failures = 0
+        # Switched off for good once the encoder is missing or the backend rejects FLAC.
+        self._whisper_upload_flac = self._WHISPER_UPLOAD_FLAC
 
     def start_listening(self) -> None:
         if self.isRunning():
@@ -100,21 +429,19 @@ class VoiceWakeupListener(QThread):
             return
         logger.info("[VoiceWakeup] 准备启动语音监听，唤醒词=%s, 语言=%s, 提供商=%s",
                     self._phrases, self._language, self._recognition_provider)
-        self._running = True
+        self._stop_event.clear()
         self.start()
 
     def stop_listening(self) -> None:
-        self._running = False
+        self._stop_event.set()
         if self.isRunning():
             self.wait(3000)
 
     def run(self) -> None:
         logger.info("[VoiceWakeup] 后台线程已启动")
-        try:
-            import speech_recognition as sr  # type: ignore
-            logger.debug("[VoiceWakeup] ✅ SpeechRecognition 导入成功")
-        except Exception as exc:
-            logger.error("[VoiceWakeup] ❌ 缺少 SpeechRecognition/PyAudio: %s", exc)
+        sr = _sr
+        if sr is None:
+            logger.error("[VoiceWakeup] ❌ 缺少 SpeechRecognition/PyAudio")
             self.listener_error.emit("缺少 SpeechRecognition/PyAudio，已降级为仅文字交互。")
             self.listener_state_changed.emit(False)
             return
@@ -147,7 +474,7 @@ class VoiceWakeupListener(QThread):
             logger.info(
                 "[VoiceWakeup] ASR Base URL: %s | Endpoint: %s (model=%s)",
                 self._openai_base_url,
-                self._build_xai_realtime_endpoint(base_url=self._openai_base_url, model=self._openai_model),
+                self._xai_endpoint,
                 self._openai_model,
             )
         elif self._recognition_provider == "zhipu_asr":
@@ -165,84 +492,247 @@ class VoiceWakeupListener(QThread):
             )
         self.listener_state_changed.emit(True)
         listen_count = 0
-        consecutive_xai_failures = 0
+        self._consecutive_xai_failures = 0
+        stream_xai = self._recognition_provider == "xai_realtime"
+        # Recognition runs on one worker so the microphone is read again right
+        # away; segments are still transcribed one at a time, in order.
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="VoiceWakeupASR")
+        in_flight: collections.deque[Future[None]] = collections.deque()
+        mic_failures = 0
         try:
             with microphone as source:
                 logger.debug("[VoiceWakeup] 正在校准环境噪音 (0.8s)...")
                 recognizer.adjust_for_ambient_noise(source, duration=0.8)
                 logger.debug("[VoiceWakeup] 噪音校准完成，进入监听循环")
-                while self._running:
+                while not self._stop_event.is_set():
                     try:
-                        audio = recognizer.listen(source, timeout=2, phrase_time_limit=4)
+                        audio = self._listen_streaming(
+                            source=source,
+                            recognizer=recognizer,
+                            sr_module=sr,
+                            timeout=2,
+                            phrase_time_limit=4,
+                            on_chunk=self._feed_xai_stream if stream_xai else None,
+                        )
                         listen_count += 1
+                        mic_failures = 0
                     except sr.WaitTimeoutError:
+                        mic_failures = 0
                         continue
                     except Exception as exc:
-                        logger.debug("[VoiceWakeup] 录音异常 (非致命): %s", exc)
-                        time.sleep(0.2)
-                        continue
-
-                    try:
-                        heard = self._recognize(audio=audio, recognizer=recognizer).strip()
-                        consecutive_xai_failures = 0
-                    except sr.UnknownValueError:
-                        logger.debug("[VoiceWakeup] 片段 #%d: 未识别到语音 (静音/噪音)", listen_count)
-                        continue
-                    except WakeupRecognitionError as exc:
-                        if (
-                            self._recognition_provider == "xai_realtime"
-                            and self._is_transient_xai_error(str(exc))
-                        ):
-                            consecutive_xai_failures += 1
-                            if consecutive_xai_failures < self._XAI_MAX_CONSECUTIVE_ERRORS:
-                                retry_delay = min(8.0, 0.8 * (2 ** (consecutive_xai_failures - 1)))
-                                logger.warning(
-                                    "[VoiceWakeup] xAI Realtime 瞬时异常，%.1fs 后自动重试 (%d/%d): %s",
-                                    retry_delay,
-                                    consecutive_xai_failures,
-                                    self._XAI_MAX_CONSECUTIVE_ERRORS - 1,
-                                    exc,
-                                )
-                                time.sleep(retry_delay)
-                                continue
-                        logger.error("[VoiceWakeup] ❌ ASR 致命错误: %s", exc)
-                        self.listener_error.emit(str(exc))
-                        break
-                    except sr.RequestError as exc:
-                        logger.error("[VoiceWakeup] ❌ 语音识别网络不可用: %s", exc)
-                        self.listener_error.emit("语音识别网络不可用，已降级为仅文字交互。")
-                        break
-                    except Exception as exc:
-                        logger.debug("[VoiceWakeup] 识别异常 (非致命): %s", exc)
+                        self._drop_xai_stream()
+                        # 7 failures reach the 2 s ceiling of _mic_retry_delay.
+                        mic_failures = min(mic_failures + 1, 7)
+                        backoff = self._mic_retry_delay(mic_failures)
+                        if mic_failures >= 4:
+                            logger.warning("[VoiceWakeup] 录音连续失败 %d 次，%.2fs 后重试: %s", mic_failures, backoff, exc)
+                        else:
+                            logger.debug("[VoiceWakeup] 录音异常 (非致命): %s", exc)
+                        self._stop_event.wait(backoff)
                         continue
 
-                    if not heard:
-                        logger.debug("[VoiceWakeup] 片段 #%d: 识别结果为空", listen_count)
+                    if not self._has_enough_speech(audio=audio, energy_threshold=recognizer.energy_threshold):
+                        logger.debug("[VoiceWakeup] 片段 #%d: 本地能量门限未通过，跳过识别", listen_count)
+                        self._discard_xai_stream()
                         continue
 
-                    self.transcript_updated.emit(heard)
-                    lowered = heard.lower()
-                    matched = any(phrase.lower() in lowered for phrase in self._phrases)
-                    logger.info("[VoiceWakeup] 片段 #%d 转写: \"%s\" → %s",
-                                listen_count, heard, "✅ 匹配唤醒词!" if matched else "❌ 未匹配")
-                    if matched:
-                        self.mark_recent_wakeup(heard)
-                        self.wake_phrase_detected.emit(heard)
+                    while in_flight and in_flight[0].done():
+                        in_flight.popleft()
+                    if len(in_flight) >= self._ASR_MAX_IN_FLIGHT:
+                        in_flight.popleft().result()
+                    if self._stop_event.is_set():
+                        self._drop_xai_stream()
+                        break
+                    in_flight.append(
+                        executor.submit(
+                            self._process_segment,
+                            segment=listen_count,
+                            audio=audio,
+                            recognizer=recognizer,
+                            stream=self._detach_xai_stream(),
+                            sr_module=sr,
+                        )
+                    )
         finally:
+            # Queued segments are not cancelled: each may own a streamed socket,
+            # and _process_segment drops it (and returns at once) once stopped.
+            self._stop_event.set()
+            executor.shutdown(wait=True)
             logger.info("[VoiceWakeup] 监听线程退出 (共处理 %d 个音频片段)", listen_count)
-            self._running = False
+            self._close_http_client()
+            self._drop_xai_stream()
+            self._close_xai_ws()
             self.listener_state_changed.emit(False)
 
-    def _recognize(self, *, audio, recognizer) -> str:
+    @staticmethod
+    def _mic_retry_delay(failures: int) -> float:
+        """Backoff after ``failures`` consecutive capture errors: 40 ms doubling up to 2 s."""
+        return min(2.0, 0.02 * (2 ** failures))
+
+    def _process_segment(
+        self,
+        *,
+        segment: int,
+        audio,
+        recognizer,
+        stream: _XaiAudioStream | None,
+        sr_module,
+    ) -> None:
+        """
+        Recognize one captured segment on the ASR worker and emit the outcome.
+
+        Fatal backend errors set ``_stop_event`` so the capture loop exits
+        after the segment it is currently recording.
+        """
+        if self._stop_event.is_set():
+            self._drop_stream(stream)
+            return
+        try:
+            heard = self._recognize(audio=audio, recognizer=recognizer, stream=stream).strip()
+            self._consecutive_xai_failures = 0
+        except sr_module.UnknownValueError:
+            logger.debug("[VoiceWakeup] 片段 #%d: 未识别到语音 (静音/噪音)", segment)
+            return
+        except WakeupRecognitionError as exc:
+            if self._stop_event.is_set():
+                logger.debug("[VoiceWakeup] 片段 #%d: 监听已停止，放弃识别: %s", segment, exc)
+                return
+            if (
+                self._recognition_provider == "xai_realtime"
+                and self._is_transient_xai_error(str(exc))
+            ):
+                self._consecutive_xai_failures += 1
+                if self._consecutive_xai_failures < self._XAI_MAX_CONSECUTIVE_ERRORS:
+                    retry_delay = min(8.0, 0.8 * (2 ** (self._consecutive_xai_failures - 1)))
+                    logger.warning(
+                        "[VoiceWakeup] xAI Realtime 瞬时异常，%.1fs 后自动重试 (%d/%d): %s",
+                        retry_delay,
+                        self._consecutive_xai_failures,
+                        self._XAI_MAX_CONSECUTIVE_ERRORS - 1,
+                        exc,
+                    )
+                    self._stop_event.wait(retry_delay)
+                    return
+            logger.error("[VoiceWakeup] ❌ ASR 致命错误: %s", exc)
+            self._stop_event.set()
+            self.listener_error.emit(str(exc))
+            return
+        except sr_module.RequestError as exc:
+            logger.error("[VoiceWakeup] ❌ 语音识别网络不可用: %s", exc)
+            self._stop_event.set()
+            self.listener_error.emit("语音识别网络不可用，已降级为仅文字交互。")
+            return
+        except Exception as exc:
+            logger.debug("[VoiceWakeup] 识别异常 (非致命): %s", exc)
+            return
+
+        if not heard:
+            logger.debug("[VoiceWakeup] 片段 #%d: 识别结果为空", segment)
+            return
+
+        self.transcript_updated.emit(heard)
+        matched = self._matches_wake_phrase(heard)
+        logger.info("[VoiceWakeup] 片段 #%d 转写: \"%s\" → %s",
+                    segment, heard, "✅ 匹配唤醒词!" if matched else "❌ 未匹配")
+        if matched:
+            self.mark_recent_wakeup(heard)
+            self.wake_phrase_detected.emit(heard)
+
+    @classmethod
+    def _build_phrase_automaton(cls, phrases_lower: tuple[str, ...]):
+        if ahocorasick is None or len(phrases_lower) < cls._PHRASE_AUTOMATON_MIN:
+            return None
+        automaton = ahocorasick.Automaton()
+        for phrase in phrases_lower:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return automaton
+
+    def _matches_wake_phrase(self, heard: str) -> bool:
+        lowered = heard.lower()
+        automaton = self._phrase_automaton
+        if automaton is not None:
+            return next(automaton.iter(lowered), None) is not None
+        # str containment uses the same fastsearch as bytes.find; encoding the
+        # transcript to UTF-8 first only adds an allocation (~40% slower).
+        return any(phrase in lowered for phrase in self._phrases_lower)
+
+    def _has_enough_speech(self, *, audio, energy_threshold: float) -> bool:
+        voiced = self._voiced_seconds(
+            audio.frame_data,
+            sample_rate=audio.sample_rate,
+            sample_width=audio.sample_width,
+            energy_threshold=energy_threshold,
+        )
+        return voiced >= self._VAD_MIN_VOICED_SECONDS
+
+    @classmethod
+    def _voiced_seconds(
+        cls,
+        frame_data: bytes,
+        *,
+        sample_rate: int,
+        sample_width: int,
+        energy_threshold: float,
+    ) -> float:
+        """Seconds of audio whose per-frame RMS reaches ``energy_threshold``."""
+        if sample_width != 2 or sample_rate <= 0:
+            # Only PCM16 is measured; let anything else through to the backend.
+            return float("inf")
+        samples = np.frombuffer(frame_data, dtype="<i2", count=len(frame_data) // 2)
+        frame_len = max(1, int(sample_rate * cls._VAD_FRAME_SECONDS))
+        frame_count = len(samples) // frame_len
+        if frame_count == 0:
+            return 0.0
+        frames = samples[: frame_count * frame_len].astype(np.float32).reshape(frame_count, frame_len)
+        rms = np.sqrt(np.mean(frames * frames, axis=1))
+        voiced_frames = int(np.count_nonzero(rms >= float(energy_threshold)))
+        return voiced_frames * frame_len / sample_rate
+
+    def _recognize(self, *, audio, recognizer, stream: _XaiAudioStream | None = None) -> str:
+        """``stream`` is the xAI session this segment was streamed to while recording, if any."""
+        key = self._asr_cache_key(audio)
+        cached = self._asr_cache.get(key)
+        if cached is not None:
+            self._asr_cache.move_to_end(key)
+            self._release_stream(stream)
+            return cached
+
+        text = self._recognize_uncached(audio=audio, recognizer=recognizer, stream=stream)
+        if text:
+            self._asr_cache[key] = text
+            if len(self._asr_cache) > self._ASR_CACHE_MAX:
+                self._asr_cache.popitem(last=False)
+        return text
+
+    def _recognize_uncached(self, *, audio, recognizer, stream: _XaiAudioStream | None = None) -> str:
+        if self._recognition_provider == "xai_realtime":
+            return self._recognize_xai_realtime(audio=audio, stream=stream)
+        self._drop_stream(stream)
         if self._recognition_provider == "openai_whisper":
             return self._recognize_openai_whisper(audio=audio)
-        if self._recognition_provider == "xai_realtime":
-            return self._recognize_xai_realtime(audio=audio)
         if self._recognition_provider == "zhipu_asr":
             return self._recognize_zhipu_asr(audio=audio)
         return recognizer.recognize_google(audio, language=self._language)
 
-    def _recognize_xai_realtime(self, *, audio) -> str:
+    @staticmethod
+    def _asr_cache_key(audio) -> bytes:
+        digest = hashlib.blake2b(audio.frame_data, digest_size=16)
+        digest.update(f"{audio.sample_rate}:{audio.sample_width}".encode("ascii"))
+        return digest.digest()
+
+    def _recognize_xai_realtime(self, *, audio, stream: _XaiAudioStream | None = None) -> str:
+        if stream is not None and not stream.failed:
+            try:
+                streamed = self._finish_xai_stream(stream)
+            except WakeupRecognitionError as exc:
+                if not self._should_retry_xai_with_legacy(str(exc)):
+                    raise
+                logger.warning("[VoiceWakeup] xAI Realtime 流式会话失败，改为整段上传: %s", exc)
+            else:
+                if streamed is not None:
+                    return streamed
+
         try:
             import websocket  # type: ignore
         except Exception as exc:
@@ -250,42 +740,13 @@ class VoiceWakeupListener(QThread):
                 "缺少 websocket-client 依赖，无法使用 xAI Realtime。请安装 websocket-client。"
             ) from exc
 
-        pcm16_data = audio.get_raw_data(
-            convert_rate=self._XAI_REALTIME_INPUT_SAMPLE_RATE,
-            convert_width=2,
-        )
+        pcm16_data = self._pcm16_data(audio, sample_rate=self._XAI_REALTIME_INPUT_SAMPLE_RATE)
         if not pcm16_data:
             return ""
 
-        endpoint = self._build_xai_realtime_endpoint(base_url=self._openai_base_url, model=self._openai_model)
-        audio_payload = base64.b64encode(pcm16_data).decode("ascii")
+        endpoint = self._xai_endpoint
+        audio_payload = _base64.b64encode(pcm16_data).decode("ascii")
 
-        modern_session_event: dict[str, Any] = {
-            "type": "session.update",
-            "session": {
-                "turn_detection": {"type": None},
-                "audio": {
-                    "input": {
-                        "format": {
-                            "type": "audio/pcm",
-                            "rate": self._XAI_REALTIME_INPUT_SAMPLE_RATE,
-                        }
-                    },
-                    "output": {
-                        "format": {
-                            "type": "audio/pcm",
-                            "rate": self._XAI_REALTIME_OUTPUT_SAMPLE_RATE,
-                        }
-                    },
-                },
-            },
-        }
-        legacy_session_event: dict[str, Any] = {
-            "type": "session.update",
-            "session": {
-                "input_audio_format": "pcm16",
-            },
-        }
         prefer_legacy_first = self._should_prefer_xai_legacy_first(self._openai_model)
         if prefer_legacy_first:
             try:
@@ -293,7 +754,7 @@ class VoiceWakeupListener(QThread):
                     websocket_module=websocket,
                     endpoint=endpoint,
                     audio_payload=audio_payload,
-                    session_event=legacy_session_event,
+                    session_payload=self._XAI_LEGACY_SESSION_JSON,
                     commit_event_type="input_audio_buffer.commit",
                     send_response_create=True,
                 )
@@ -304,7 +765,7 @@ class VoiceWakeupListener(QThread):
                 websocket_module=websocket,
                 endpoint=endpoint,
                 audio_payload=audio_payload,
-                session_event=modern_session_event,
+                session_payload=self._XAI_MODERN_SESSION_JSON,
                 commit_event_type="conversation.item.commit",
                 send_response_create=True,
             )
@@ -316,21 +777,264 @@ class VoiceWakeupListener(QThread):
                 websocket_module=websocket,
                 endpoint=endpoint,
                 audio_payload=audio_payload,
-                session_event=legacy_session_event,
+                session_payload=self._XAI_LEGACY_SESSION_JSON,
                 commit_event_type="input_audio_buffer.commit",
                 send_response_create=True,
             )
 
+    @staticmethod
+    def _pcm16_data(audio, *, sample_rate: int) -> bytes:
+        """
+        Raw PCM16 at ``sample_rate``; skips audioop conversion when the capture already matches.
+
+        Runs on the ASR worker, not the capture loop. Resampling a 4 s clip
+        from 48 kHz takes about 3 ms, less than shipping it to another process.
+        """
+        if audio.sample_width == 2 and audio.sample_rate == sample_rate:
+            return audio.frame_data
+        return audio.get_raw_data(convert_rate=sample_rate, convert_width=2)
+
+    @staticmethod
+    def _listen_streaming(
+        *,
+        source,
+        recognizer,
+        sr_module,
+        timeout: float,
+        phrase_time_limit: float,
+        on_chunk: Callable[[bytes, int, int], None] | None = None,
+    ):
+        """
+        Record one phrase like ``Recognizer.listen`` while handing chunks out as they arrive.
+
+        Waits up to ``timeout`` seconds for a chunk above the recognizer's
+        energy threshold, then records until ``pause_threshold`` seconds of
+        quiet or ``phrase_time_limit``. As in ``Recognizer.listen``, the
+        threshold follows the ambient level while waiting when
+        ``dynamic_energy_threshold`` is on, sounds shorter than
+        ``phrase_threshold`` are dropped and waiting resumes, and trailing
+        quiet beyond ``non_speaking_duration`` is trimmed from the result.
+
+        ``on_chunk(data, sample_rate, sample_width)`` starts once the phrase
+        is long enough to be kept, then sees the pre-roll and every recorded
+        chunk (including the trailing quiet, which cannot be unsent).
+        """
+        import audioop
+
+        chunk_frames = source.CHUNK
+        sample_rate = source.SAMPLE_RATE
+        sample_width = source.SAMPLE_WIDTH
+        seconds_per_chunk = chunk_frames / sample_rate
+        pause_chunk_count = math.ceil(recognizer.pause_threshold / seconds_per_chunk)
+        phrase_chunk_count = math.ceil(recognizer.phrase_threshold / seconds_per_chunk)
+        non_speaking_chunk_count = math.ceil(recognizer.non_speaking_duration / seconds_per_chunk)
+        threshold = recognizer.energy_threshold
+        dynamic = recognizer.dynamic_energy_threshold
+        if dynamic:
+            damping = recognizer.dynamic_energy_adjustment_damping ** seconds_per_chunk
+            ratio = recognizer.dynamic_energy_ratio
+
+        elapsed = 0.0
+        while True:
+            preroll: collections.deque[bytes] = collections.deque(maxlen=non_speaking_chunk_count + 1)
+            while True:
+                elapsed += seconds_per_chunk
+                if timeout and elapsed > timeout:
+                    raise sr_module.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                buffer = source.stream.read(chunk_frames)
+                if not buffer:
+                    raise sr_module.WaitTimeoutError("audio stream ended while waiting for phrase to start")
+                preroll.append(buffer)
+                energy = audioop.rms(buffer, sample_width)
+                if energy > threshold:
+                    break
+                if dynamic:
+                    threshold = threshold * damping + energy * ratio * (1 - damping)
+                    recognizer.energy_threshold = threshold
+
+            frames = list(preroll)
+            # Chunks already handed to on_chunk; None until the phrase is known to be kept.
+            streamed: int | None = None
+            phrase_start = elapsed
+            phrase_count = 0
+            pause_count = 0
+            while True:
+                elapsed += seconds_per_chunk
+                if phrase_time_limit and elapsed - phrase_start > phrase_time_limit:
+                    break
+                buffer = source.stream.read(chunk_frames)
+                if not buffer:
+                    break
+                frames.append(buffer)
+                phrase_count += 1
+                if audioop.rms(buffer, sample_width) > threshold:
+                    pause_count = 0
+                else:
+                    pause_count += 1
+                # Chunks up to the last loud one only grow, so once this passes
+                # phrase_threshold the phrase is kept and streaming can start.
+                if streamed is None and phrase_count - pause_count >= phrase_chunk_count:
+                    streamed = 0
+                if streamed is not None and on_chunk is not None:
+                    for chunk in frames[streamed:]:
+                        on_chunk(chunk, sample_rate, sample_width)
+                    streamed = len(frames)
+                if pause_count > pause_chunk_count:
+                    break
+
+            if phrase_count - pause_count >= phrase_chunk_count or not buffer:
+                break
+
+        if on_chunk is not None and streamed is None:
+            for chunk in frames:
+                on_chunk(chunk, sample_rate, sample_width)
+        trim = pause_count - non_speaking_chunk_count
+        if trim > 0:
+            del frames[-trim:]
+        return sr_module.AudioData(b"".join(frames), sample_rate, sample_width)
+
+    def _feed_xai_stream(self, chunk: bytes, sample_rate: int, sample_width: int) -> None:
+        import audioop
+
+        stream = self._xai_stream
+        if stream is None:
+            stream = self._xai_stream = self._open_xai_stream()
+        if stream.failed:
+            return
+
+        data = chunk if sample_width == 2 else audioop.lin2lin(chunk, sample_width, 2)
+        if sample_rate != self._XAI_REALTIME_INPUT_SAMPLE_RATE:
+            data, stream.ratecv_state = audioop.ratecv(
+                data, 2, 1, sample_rate, self._XAI_REALTIME_INPUT_SAMPLE_RATE, stream.ratecv_state
+            )
+        stream.pending += data
+        if len(stream.pending) < self._XAI_STREAM_SEND_BYTES:
+            return
+        try:
+            self._send_xai_stream_audio(stream)
+        except Exception as exc:
+            logger.debug("[VoiceWakeup] xAI Realtime 流式上传中断，改为整段上传: %s", exc)
+            stream.failed = True
+            self._close_ws(stream.ws)
+
+    def _open_xai_stream(self) -> _XaiAudioStream:
+        """
+        Attach streamed capture to the idle session socket, if there is one.
+
+        A fresh handshake would block the capture loop long enough for the
+        microphone buffer to overflow, so without a warm socket the segment
+        is uploaded in one piece after recording instead.
+        """
+        endpoint = self._xai_endpoint
+        if self._should_prefer_xai_legacy_first(self._openai_model):
+            commit_event_type = "input_audio_buffer.commit"
+        else:
+            commit_event_type = "conversation.item.commit"
+        stream = _XaiAudioStream(
+            ws=None,
+            websocket_module=None,
+            endpoint=endpoint,
+            commit_event_type=commit_event_type,
+            failed=True,
+        )
+        if self._xai_ws is None:
+            return stream
+        try:
+            import websocket  # type: ignore
+        except Exception:
+            return stream
+        ws = self._take_xai_ws(endpoint=endpoint, commit_event_type=commit_event_type)
+        if ws is None:
+            return stream
+        stream.ws = ws
+        stream.websocket_module = websocket
+        stream.failed = False
+        return stream
+
+    @staticmethod
+    def _send_xai_stream_audio(stream: _XaiAudioStream) -> None:
+        if not stream.pending:
+            return
+        payload = _base64.b64encode(stream.pending).decode("ascii")
+        stream.pending.clear()
+        stream.ws.send(_audio_append_event(payload))
+
+    def _finish_xai_stream(self, stream: _XaiAudioStream) -> str | None:
+        """Commit streamed audio and read the transcript; ``None`` means the socket broke."""
+        websocket_module = stream.websocket_module
+        try:
+            self._send_xai_stream_audio(stream)
+            return self._exchange_xai_segment(
+                ws=stream.ws,
+                websocket_module=websocket_module,
+                endpoint=stream.endpoint,
+                audio_payload=None,
+                commit_event_type=stream.commit_event_type,
+                send_response_create=True,
+            )
+        except (websocket_module.WebSocketException, OSError) as exc:  # type: ignore[attr-defined]
+            logger.debug("[VoiceWakeup] xAI Realtime 流式会话中断，改为整段上传: %s", exc)
+            self._close_ws(stream.ws)
+            return None
+        except Exception:
+            self._close_ws(stream.ws)
+            raise
+
+    def _detach_xai_stream(self) -> _XaiAudioStream | None:
+        """Take the stream of the segment just recorded, so the next capture starts a new one."""
+        stream, self._xai_stream = self._xai_stream, None
+        return stream
+
+    def _discard_xai_stream(self) -> None:
+        """Drop streamed audio that will not be transcribed, keeping the session for reuse."""
+        self._release_stream(self._detach_xai_stream())
+
+    def _drop_xai_stream(self) -> None:
+        self._drop_stream(self._detach_xai_stream())
+
+    def _release_stream(self, stream: _XaiAudioStream | None) -> None:
+        if stream is None or stream.failed:
+            return
+        try:
+            stream.ws.send(_dumps_event({"type": "input_audio_buffer.clear"}))
+        except Exception:
+            self._close_ws(stream.ws)
+            return
+        self._park_xai_ws(stream.ws, endpoint=stream.endpoint, commit_event_type=stream.commit_event_type)
+
+    def _drop_stream(self, stream: _XaiAudioStream | None) -> None:
+        if stream is not None and not stream.failed:
+            self._close_ws(stream.ws)
+
     def _run_xai_realtime_session(
         self,
         *,
         websocket_module,
         endpoint: str,
         audio_payload: str,
-        session_event: dict[str, Any],
+        session_payload: str,
         commit_event_type: str,
         send_response_create: bool,
     ) -> str:
+        ws = self._take_xai_ws(endpoint=endpoint, commit_event_type=commit_event_type)
+        if ws is not None:
+            try:
+                return self._exchange_xai_segment(
+                    ws=ws,
+                    websocket_module=websocket_module,
+                    endpoint=endpoint,
+                    audio_payload=audio_payload,
+                    commit_event_type=commit_event_type,
+                    send_response_create=send_response_create,
+                )
+            except (websocket_module.WebSocketException, OSError) as exc:  # type: ignore[attr-defined]
+                # The idle socket was dropped by the server; fall through to a fresh connection.
+                logger.debug("[VoiceWakeup] xAI Realtime 复用连接失效，重新建立: %s", exc)
+                self._close_ws(ws)
+            except Exception:
+                self._close_ws(ws)
+                raise
+
         ws = None
         try:
             ws = websocket_module.create_connection(
@@ -340,12 +1044,17 @@ class VoiceWakeupListener(QThread):
                 ],
                 timeout=self._XAI_REALTIME_TIMEOUT_SECONDS,
             )
-            ws.send(json.dumps(session_event, ensure_ascii=False))
-            ws.send(json.dumps({"type": "input_audio_buffer.append", "audio": audio_payload}))
-            ws.send(json.dumps({"type": commit_event_type}))
-            if send_response_create:
-                ws.send(json.dumps({"type": "response.create"}))
-            return self._receive_xai_transcription(ws=ws, websocket_module=websocket_module)
+            ws.send(session_payload)
+            text = self._exchange_xai_segment(
+                ws=ws,
+                websocket_module=websocket_module,
+                endpoint=endpoint,
+                audio_payload=audio_payload,
+                commit_event_type=commit_event_type,
+                send_response_create=send_response_create,
+            )
+            ws = None
+            return text
         except websocket_module.WebSocketBadStatusException as exc:  # type: ignore[attr-defined]
             status_code = getattr(exc, "status_code", "unknown")
             hint = self._build_http_status_hint(
@@ -364,16 +1073,110 @@ class VoiceWakeupListener(QThread):
             raise WakeupRecognitionError(f"xAI Realtime 网络异常: {exc} (endpoint={endpoint})") from exc
         finally:
             if ws is not None:
-                try:
-                    ws.close()
-                except Exception:
-                    pass
+                self._close_ws(ws)
 
-    def _receive_xai_transcription(self, *, ws, websocket_module) -> str:
+    def _exchange_xai_segment(
+        self,
+        *,
+        ws,
+        websocket_module,
+        endpoint: str,
+        audio_payload: str | None,
+        commit_event_type: str,
+        send_response_create: bool,
+    ) -> str:
+        """
+        Send one segment on an open session and read its transcription.
+
+        ``audio_payload=None`` commits audio that was already streamed.
+
+        The socket is kept for the next segment only when the exchange ended
+        on ``response.done``; otherwise later events of this response could
+        still be in flight, so it is closed. Before parking, the items this
+        segment added are deleted so the next ``response.create`` only sees
+        the next segment. Raises leave ``ws`` to the caller.
+        """
+        if audio_payload is not None:
+            ws.send(_audio_append_event(audio_payload))
+        ws.send(_dumps_event({"type": commit_event_type}))
+        if send_response_create:
+            ws.send(_dumps_event({"type": "response.create"}))
+        item_ids: list[str] = []
+        text, finished = self._receive_xai_transcription(
+            ws=ws, websocket_module=websocket_module, item_ids=item_ids
+        )
+        if finished:
+            self._clear_xai_items(ws, item_ids)
+            self._park_xai_ws(ws, endpoint=endpoint, commit_event_type=commit_event_type)
+        else:
+            self._close_ws(ws)
+        return text
+
+    @staticmethod
+    def _clear_xai_items(ws, item_ids: list[str]) -> None:
+        """
+        Delete conversation items left by the previous segment.
+
+        The deletes carry a prefixed ``event_id`` so a server that rejects
+        them is not mistaken for a failure of the next segment.
+        """
+        for index, item_id in enumerate(dict.fromkeys(item_ids)):
+            ws.send(
+                _dumps_event(
+                    {
+                        "type": "conversation.item.delete",
+                        "event_id": f"{_XAI_CLEANUP_EVENT_PREFIX}{index}",
+                        "item_id": item_id,
+                    }
+                )
+            )
+
+    def _take_xai_ws(self, *, endpoint: str, commit_event_type: str):
+        """Hand out the idle session socket if it matches this endpoint and event flow."""
+        with self._xai_ws_lock:
+            ws, key = self._xai_ws, self._xai_ws_key
+            self._xai_ws, self._xai_ws_key = None, None
+        if ws is not None and key != (endpoint, commit_event_type):
+            self._close_ws(ws)
+            return None
+        return ws
+
+    def _park_xai_ws(self, ws, *, endpoint: str, commit_event_type: str) -> None:
+        """Keep ``ws`` as the idle session socket, replacing any previous one."""
+        with self._xai_ws_lock:
+            previous = self._xai_ws
+            self._xai_ws, self._xai_ws_key = ws, (endpoint, commit_event_type)
+        if previous is not None and previous is not ws:
+            self._close_ws(previous)
+
+    def _close_xai_ws(self) -> None:
+        with self._xai_ws_lock:
+            ws, self._xai_ws, self._xai_ws_key = self._xai_ws, None, None
+        if ws is not None:
+            self._close_ws(ws)
+
+    @staticmethod
+    def _close_ws(ws) -> None:
+        try:
+            ws.close()
+        except Exception:
+            pass
+
+    def _receive_xai_transcription(
+        self, *, ws, websocket_module, item_ids: list[str] | None = None
+    ) -> tuple[str, bool]:
+        """
+        Return ``(text, finished)``; ``finished`` is True once ``response.done`` was seen.
+
+        Conversation item ids reported along the way are appended to ``item_ids``.
+        """
         deadline = time.monotonic() + self._XAI_REALTIME_TIMEOUT_SECONDS
         streamed_text_parts: list[str] = []
         while time.monotonic() < deadline:
-            remaining = max(0.1, deadline - time.monotonic())
+            if self._stop_event.is_set():
+                raise WakeupRecognitionError("xAI Realtime 已取消：监听已停止。")
+            # Wake up at least every 0.5s so a stop request is noticed promptly.
+            remaining = min(0.5, max(0.05, deadline - time.monotonic()))
             try:
                 ws.settimeout(remaining)
                 raw_event = ws.recv()
@@ -388,25 +1191,30 @@ class VoiceWakeupListener(QThread):
             if not event_type:
                 continue
             if event_type == "conversation.item.input_audio_transcription.completed":
-                return self._extract_xai_transcription_text(event)
+                return self._extract_xai_transcription_text(event), False
             if event_type == "conversation.item.added":
                 transcript = self._extract_xai_transcription_text(event)
                 if transcript:
-                    return transcript
+                    return transcript, False
             if event_type in {"response.output_text.delta", "response.text.delta"}:
                 delta = self._extract_realtime_response_delta(event)
                 if delta:
                     streamed_text_parts.append(delta)
                 continue
+            if item_ids is not None:
+                item_ids.extend(_conversation_item_ids(event_type, event))
             if event_type in {"response.output_text.done", "response.text.done"}:
                 done = self._extract_realtime_response_delta(event) or "".join(streamed_text_parts).strip()
                 if done:
-                    return done
+                    return done, False
             if event_type == "response.done":
                 done = self._extract_realtime_response_text(event) or "".join(streamed_text_parts).strip()
                 if done:
-                    return done
+                    return done, True
             if self._is_realtime_error_event(event=event):
+                if _is_cleanup_error(event):
+                    logger.debug("[VoiceWakeup] xAI Realtime 清理上一段会话条目失败: %s", event)
+                    continue
                 detail = self._extract_realtime_error_message(event)
                 raise WakeupRecognitionError(
                     f"xAI Realtime 返回错误事件: {detail} (event_type={event_type})"
@@ -414,10 +1222,40 @@ class VoiceWakeupListener(QThread):
 
         raise WakeupRecognitionError("xAI Realtime 超时：未收到有效转写事件。")
 
+    def _get_http_client(self):
+        import httpx
+
+        client = self._http_client
+        if client is None or client.is_closed:
+            client = httpx.Client(
+                timeout=20.0,
+                limits=httpx.Limits(max_keepalive_connections=4, keepalive_expiry=60.0),
+            )
+            self._http_client = client
+        return client
+
+    def _close_http_client(self) -> None:
+        client, self._http_client = self._http_client, None
+        if client is not None:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def _whisper_upload_file(self, audio) -> tuple[str, bytes, str]:
+        """``(filename, data, content type)`` for the multipart upload."""
+        if self._whisper_upload_flac:
+            try:
+                return ("wakeup.flac", audio.get_flac_data(convert_rate=16000, convert_width=2), "audio/flac")
+            except Exception as exc:
+                logger.info("[VoiceWakeup] FLAC 编码不可用，改用 WAV 上传: %s", exc)
+                self._whisper_upload_flac = False
+        return ("wakeup.wav", audio.get_wav_data(convert_rate=16000, convert_width=2), "audio/wav")
+
     def _recognize_openai_whisper(self, *, audio) -> str:
         import httpx
 
-        wav_data = audio.get_wav_data(convert_rate=16000, convert_width=2)
+        upload = self._whisper_upload_file(audio)
         endpoint = f"{self._openai_base_url}/audio/transcriptions"
         form_data: dict[str, str] = {
             "model": self._openai_model,
@@ -431,31 +1269,42 @@ class VoiceWakeupListener(QThread):
             form_data["prompt"] = self._openai_prompt
 
         try:
-            with httpx.Client(timeout=20.0) as client:
-                headers = {
+            client = self._get_http_client()
+            headers = {
+                "Accept": "application/json",
+                "Authorization": f"Bearer {self._openai_api_key}",
+            }
+            response = client.post(
+                endpoint,
+                data=form_data,
+                files={"file": upload},
+                headers=headers,
+            )
+            if response.status_code in (401, 403):
+                fallback_headers = {
                     "Accept": "application/json",
-                    "Authorization": f"Bearer {self._openai_api_key}",
+                    "Authorization": self._openai_api_key,
                 }
+                fallback = client.post(
+                    endpoint,
+                    data=form_data,
+                    files={"file": upload},
+                    headers=fallback_headers,
+                )
+                if fallback.status_code < 400:
+                    response = fallback
+                    headers = fallback_headers
+            if response.status_code in (400, 415) and upload[2] == "audio/flac":
+                logger.info("[VoiceWakeup] ASR 服务不接受 FLAC (HTTP %s)，改用 WAV 上传", response.status_code)
+                self._whisper_upload_flac = False
+                upload = self._whisper_upload_file(audio)
                 response = client.post(
                     endpoint,
                     data=form_data,
-                    files={"file": ("wakeup.wav", wav_data, "audio/wav")},
+                    files={"file": upload},
                     headers=headers,
                 )
-                if response.status_code in (401, 403):
-                    fallback_headers = {
-                        "Accept": "application/json",
-                        "Authorization": self._openai_api_key,
-                    }
-                    fallback = client.post(
-                        endpoint,
-                        data=form_data,
-                        files={"file": ("wakeup.wav", wav_data, "audio/wav")},
-                        headers=fallback_headers,
-                    )
-                    if fallback.status_code < 400:
-                        response = fallback
-                response.raise_for_status()
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             status_code = exc.response.status_code if exc.response is not None else "unknown"
             body_text = ""
@@ -503,18 +1352,18 @@ class VoiceWakeupListener(QThread):
         }
 
         try:
-            with httpx.Client(timeout=20.0) as client:
-                headers = {
-                    "Accept": "application/json",
-                    "Authorization": f"Bearer {self._openai_api_key}",
-                }
-                response = client.post(
-                    endpoint,
-                    data=form_data,
-                    files={"file": ("wakeup.wav", wav_data, "audio/wav")},
-                    headers=headers,
-                )
-                response.raise_for_status()
+            client = self._get_http_client()
+            headers = {
+                "Accept": "application/json",
+                "Authorization": f"Bearer {self._openai_api_key}",
+            }
+            response = client.post(
+                endpoint,
+                data=form_data,
+                files={"file": ("wakeup.wav", wav_data, "audio/wav")},
+                headers=headers,
+            )
+            response.raise_for_status()
         except httpx.HTTPStatusError as exc:
             status_code = exc.response.status_code if exc.response is not None else "unknown"
             body_text = ""
@@ -574,9 +1423,12 @@ class VoiceWakeupListener(QThread):
         normalized = payload.strip()
         if not normalized:
             return None
+        delta_event = _parse_delta_event(normalized)
+        if delta_event is not None:
+            return delta_event
         try:
-            decoded = json.loads(normalized)
-        except json.JSONDecodeError:
+            decoded = _loads_event(normalized)
+        except ValueError:
             return None
         if isinstance(decoded, dict):
             return decoded
@@ -584,26 +1436,22 @@ class VoiceWakeupListener(QThread):
 
     @staticmethod
     def _extract_xai_transcription_text(event: dict[str, Any]) -> str:
-        for key in ("transcript", "text"):
-            value = event.get(key)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
+        text = _first_text(event, ("transcript", "text"))
+        if text:
+            return text
 
         item = event.get("item")
         if isinstance(item, dict):
-            for key in ("transcript", "text"):
-                value = item.get(key)
-                if isinstance(value, str) and value.strip():
-                    return value.strip()
+            text = _first_text(item, ("transcript", "text"))
+            if text:
+                return text
             content = item.get("content")
             if isinstance(content, list):
                 for entry in content:
-                    if not isinstance(entry, dict):
-                        continue
-                    for key in ("transcript", "text"):
-                        value = entry.get(key)
-                        if isinstance(value, str) and value.strip():
-                            return value.strip()
+                    if isinstance(entry, dict):
+                        text = _first_text(entry, ("transcript", "text"))
+                        if text:
+                            return text
         return ""
 
     @staticmethod
@@ -655,16 +1503,11 @@ class VoiceWakeupListener(QThread):
 
     @classmethod
     def _is_transient_xai_error(cls, error_text: str) -> bool:
-        normalized = (error_text or "").strip().lower()
-        return any(keyword in normalized for keyword in cls._XAI_TRANSIENT_ERROR_KEYWORDS)
+        return cls._XAI_TRANSIENT_RE.search((error_text or "").lower()) is not None
 
     @staticmethod
     def _extract_realtime_response_delta(event: dict[str, Any]) -> str:
-        for key in ("delta", "text"):
-            value = event.get(key)
-            if isinstance(value, str) and value.strip():
-                return value.strip()
-        return ""
+        return _first_text(event, ("delta", "text"))
 
     @staticmethod
     def _extract_realtime_response_text(event: dict[str, Any]) -> str:
@@ -683,15 +1526,10 @@ class VoiceWakeupListener(QThread):
             if not isinstance(content, list):
                 continue
             for entry in content:
-                if not isinstance(entry, dict):
-                    continue
-                text_value = entry.get("text")
-                if isinstance(text_value, str) and text_value.strip():
-                    chunks.append(text_value.strip())
-                    continue
-                transcript = entry.get("transcript")
-                if isinstance(transcript, str) and transcript.strip():
-                    chunks.append(transcript.strip())
+                if isinstance(entry, dict):
+                    text = _first_text(entry, ("text", "transcript"))
+                    if text:
+                        chunks.append(text)
         return "".join(chunks).strip()
 
     @staticmethod
@@ -718,107 +1556,54 @@ class VoiceWakeupListener(QThread):
         status = str(status_code)
         body = (response_body or "").strip().replace("\r", " ").replace("\n", " ")
         body_preview = body[:180]
+        is_xai = VoiceWakeupListener._is_xai_base_url(base_url)
+        is_zhipu = VoiceWakeupListener._is_zhipu_base_url(base_url)
         if status in {"401", "403"}:
-            hint = "API Key 无效、过期或无此模型权限。"
+            parts = ["API Key 无效、过期或无此模型权限。"]
         elif status == "404":
-            if provider == "zhipu_asr" or VoiceWakeupListener._is_zhipu_base_url(base_url):
-                hint = "服务端不存在该接口或模型。请确认路径为 /api/paas/v4/audio/transcriptions。"
+            if provider == "zhipu_asr" or is_zhipu:
+                parts = ["服务端不存在该接口或模型。请确认路径为 /api/paas/v4/audio/transcriptions。"]
             else:
-                hint = "服务端不存在该接口或模型。请确认服务支持 /v1/audio/transcriptions。"
+                parts = ["服务端不存在该接口或模型。请确认服务支持 /v1/audio/transcriptions。"]
         elif status == "429":
-            hint = "请求过快或额度不足。请稍后重试。"
+            parts = ["请求过快或额度不足。请稍后重试。"]
         else:
-            hint = "请检查 API Key、模型名与网络连通性。"
+            parts = ["请检查 API Key、模型名与网络连通性。"]
 
-        if VoiceWakeupListener._is_xai_base_url(base_url):
+        if is_xai:
             if provider == "xai_realtime":
-                hint += " 检测到 xAI 域名；请确认使用支持 Realtime 的模型，并检查 WebSocket 鉴权格式。"
+                parts.append(" 检测到 xAI 域名；请确认使用支持 Realtime 的模型，并检查 WebSocket 鉴权格式。")
             else:
-                hint += " 检测到 xAI 域名；若使用 xAI，请将 ASR 提供商改为 xai_realtime。"
-        if VoiceWakeupListener._is_zhipu_base_url(base_url):
-            hint += " 检测到智谱域名；建议使用 glm-asr-2512，且路径应为 /api/paas/v4/audio/transcriptions。"
+                parts.append(" 检测到 xAI 域名；若使用 xAI，请将 ASR 提供商改为 xai_realtime。")
+        if is_zhipu:
+            parts.append(" 检测到智谱域名；建议使用 glm-asr-2512，且路径应为 /api/paas/v4/audio/transcriptions。")
         if body_preview:
-            hint += f" 服务端返回: {body_preview}"
-        return hint
+            parts.append(f" 服务端返回: {body_preview}")
+        return "".join(parts)
 
     @staticmethod
     def _is_xai_base_url(base_url: str) -> bool:
-        parsed = urlsplit((base_url or "").strip())
-        host = (parsed.netloc or "").lower()
-        return host.endswith("x.ai")
+        return _host_ends_with(base_url or "", _XAI_HOST_SUFFIX)
 
     @staticmethod
     def _is_zhipu_base_url(base_url: str) -> bool:
-        parsed = urlsplit((base_url or "").strip())
-        host = (parsed.netloc or "").lower()
-        return host.endswith("bigmodel.cn")
+        return _host_ends_with(base_url or "", _ZHIPU_HOST_SUFFIX)
 
     @staticmethod
     def _normalize_base_url(base_url: str) -> str:
-        normalized = (base_url or "").strip().rstrip("/")
-        if not normalized:
-            return "https://api.openai.com/v1"
-        parsed = urlsplit(normalized)
-        if not parsed.scheme or not parsed.netloc:
-            return "https://api.openai.com/v1"
-
-        path = (parsed.path or "").rstrip("/")
-        for suffix in ("/chat/completions", "/audio/transcriptions", "/audio/translations"):
-            if path.endswith(suffix):
-                path = path[: -len(suffix)]
-                break
-        if "/v1/" in path:
-            path = path.split("/v1/", maxsplit=1)[0] + "/v1"
-        elif path.endswith("/v1"):
-            pass
-        elif not path:
-            path = "/v1"
-        else:
-            path = f"{path}/v1"
-
-        return urlunsplit((parsed.scheme, parsed.netloc, path, "", ""))
+        return _normalize_base_url_cached(base_url or "")
 
     @classmethod
     def _normalize_zhipu_base_url(cls, base_url: str) -> str:
-        normalized = (base_url or "").strip().rstrip("/")
-        if not normalized:
-            return cls._ZHIPU_ASR_ENDPOINT
-        parsed = urlsplit(normalized)
-        if not parsed.scheme or not parsed.netloc:
-            return cls._ZHIPU_ASR_ENDPOINT
-        path = (parsed.path or "").rstrip("/")
-        if not path:
-            path = "/api/paas/v4/audio/transcriptions"
-        elif not path.endswith("/audio/transcriptions"):
-            path = f"{path}/audio/transcriptions"
-        return urlunsplit((parsed.scheme, parsed.netloc, path, "", ""))
+        return _normalize_zhipu_base_url_cached(base_url or "", cls._ZHIPU_ASR_ENDPOINT)
 
     @staticmethod
     def _build_xai_realtime_endpoint(*, base_url: str, model: str) -> str:
-        normalized_base = VoiceWakeupListener._normalize_base_url(base_url)
-        parsed = urlsplit(normalized_base)
-        scheme = "wss" if parsed.scheme in {"https", "wss"} else "ws"
-        path = (parsed.path or "/v1").rstrip("/")
-        if not path:
-            path = "/v1"
-        if not path.endswith("/realtime"):
-            path = f"{path}/realtime"
-        model_name = (model or "").strip()
-        if not model_name or model_name == "whisper-1":
-            model_name = "grok-2-mini-transcribe"
-        query = urlencode({"model": model_name})
-        return urlunsplit((scheme, parsed.netloc, path, query, ""))
+        return _build_xai_realtime_endpoint_cached(base_url or "", model or "")
 
     @staticmethod
     def _normalize_whisper_language(language: str) -> str:
-        normalized = (language or "").strip().lower().replace("_", "-")
-        if len(normalized) == 2 and normalized.isalpha():
-            return normalized
-        if "-" in normalized:
-            head = normalized.split("-", maxsplit=1)[0]
-            if len(head) == 2 and head.isalpha():
-                return head
-        return ""
+        return _normalize_whisper_language_cached(language or "")
 
     @classmethod
     def transcribe_once(
@@ -833,13 +1618,20 @@ class VoiceWakeupListener(QThread):
         openai_temperature: float = 0.0,
         listen_timeout_seconds: float = 6.0,
         phrase_time_limit_seconds: float = 12.0,
+        skip_ambient_calibration: bool = False,
+        energy_threshold: float | None = None,
     ) -> str:
-        try:
-            import speech_recognition as sr  # type: ignore
-        except Exception as exc:
-            raise WakeupRecognitionError("缺少 SpeechRecognition/PyAudio，无法进行按键语音转写。") from exc
+        """
+        Record one utterance from the microphone and return its transcript.
+
+        With ``skip_ambient_calibration`` the 0.5 s noise calibration never
+        runs; ``energy_threshold`` (if given) seeds the recognizer instead and
+        the dynamic threshold adapts from there.
+        """
+        sr = _sr
+        if sr is None:
+            raise WakeupRecognitionError("缺少 SpeechRecognition/PyAudio，无法进行按键语音转写。")
 
-        recognizer = sr.Recognizer()
         try:
             microphone = sr.Microphone()
         except Exception as exc:
@@ -860,8 +1652,25 @@ class VoiceWakeupListener(QThread):
 
         timeout_s = max(1.0, float(listen_timeout_seconds))
         phrase_limit_s = max(1.0, float(phrase_time_limit_seconds))
+        # The lock only covers the shared recognizer lookup; microphone I/O runs
+        # outside it (main.py never overlaps two captures) so that
+        # invalidate_ambient_calibration() cannot stall behind a recording.
+        with cls._PTT_RECOGNIZER_LOCK:
+            recognizer = cls._PTT_RECOGNIZER
+            if recognizer is None:
+                recognizer = cls._PTT_RECOGNIZER = sr.Recognizer()
+            calibrated_at = cls._PTT_CALIBRATED_AT
         with microphone as source:
-            recognizer.adjust_for_ambient_noise(source, duration=0.5)
+            if skip_ambient_calibration:
+                if energy_threshold is not None:
+                    recognizer.energy_threshold = float(energy_threshold)
+                    # The fixed threshold replaces the calibrated one; recalibrate
+                    # if a later press asks for calibration again.
+                    cls._PTT_CALIBRATED_AT = 0.0
+                recognizer.dynamic_energy_threshold = True
+            elif calibrated_at <= 0.0 or time.monotonic() - calibrated_at > cls._PTT_CALIBRATION_TTL_SECONDS:
+                recognizer.adjust_for_ambient_noise(source, duration=0.5)
+                cls._PTT_CALIBRATED_AT = time.monotonic()
             try:
                 audio = recognizer.listen(source, timeout=timeout_s, phrase_time_limit=phrase_limit_s)
             except sr.WaitTimeoutError as exc:
@@ -873,22 +1682,31 @@ class VoiceWakeupListener(QThread):
             raise WakeupRecognitionError("没有识别出清晰语音，请再试一次。") from exc
         except sr.RequestError as exc:
             raise WakeupRecognitionError(f"语音识别网络不可用: {exc}") from exc
+        finally:
+            helper._close_http_client()
+            helper._close_xai_ws()
+
+    @classmethod
+    def invalidate_ambient_calibration(cls) -> None:
+        """Make the next push-to-talk capture recalibrate against ambient noise."""
+        # A single float store: safe to call from the GUI thread mid-capture.
+        cls._PTT_CALIBRATED_AT = 0.0
 
     @classmethod
     def mark_recent_wakeup(cls, phrase: str) -> None:
-        with cls._LAST_WAKEUP_LOCK:
-            cls._LAST_WAKEUP_MONOTONIC = time.monotonic()
-            cls._LAST_WAKEUP_PHRASE = (phrase or "").strip()
+        cls._LAST_WAKEUP = (time.monotonic(), (phrase or "").strip())
 
     @classmethod
     def consume_recent_wakeup(cls, *, window_seconds: float = 3.0) -> bool:
         now = time.monotonic()
+        ts, _phrase = cls._LAST_WAKEUP
+        if ts <= 0.0:
+            return False
+        if now - ts > max(0.1, float(window_seconds)):
+            return False
         with cls._LAST_WAKEUP_LOCK:
-            ts = float(cls._LAST_WAKEUP_MONOTONIC)
-            if ts <= 0.0:
-                return False
-            if now - ts > max(0.1, float(window_seconds)):
+            # Another caller may have consumed it since the snapshot.
+            if cls._LAST_WAKEUP[0] <= 0.0:
                 return False
-            cls._LAST_WAKEUP_MONOTONIC = 0.0
-            cls._LAST_WAKEUP_PHRASE = ""
+            cls._LAST_WAKEUP = (0.0, "")
             return True
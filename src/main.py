@@ -28,7 +28,7 @@ try:
     from core.idle_monitor import IdleMonitor
     from core.logger import setup_logger
     from core.mood_system import MoodSystem
-    from core.paths import get_base_dir, get_cache_dir, get_log_dir, get_log_file, resolve_config_path
+    from core.paths import ensure_app_dirs, get_base_dir, get_cache_dir, get_log_dir, get_log_file, resolve_config_path
     from core.presence_detector import PresenceDetector
     from core.resource_scheduler import ResourceScheduler
     from core.voice_wakeup import VoiceWakeupListener
@@ -53,7 +53,7 @@ except ModuleNotFoundError:
     from .core.idle_monitor import IdleMonitor
     from .core.logger import setup_logger
     from .core.mood_system import MoodSystem
-    from .core.paths import get_base_dir, get_cache_dir, get_log_dir, get_log_file, resolve_config_path
+    from .core.paths import ensure_app_dirs, get_base_dir, get_cache_dir, get_log_dir, get_log_file, resolve_config_path
     from .core.presence_detector import PresenceDetector
     from .core.resource_scheduler import ResourceScheduler
     from .core.voice_wakeup import VoiceWakeupListener
@@ -144,6 +144,7 @@ def main() -> int:
     except Exception:
         splash = None
 
+    ensure_app_dirs()
     base_dir = get_base_dir()
     characters_root = base_dir / "characters"
     config_path = resolve_config_path()
@@ -366,6 +367,8 @@ def main() -> int:
                     openai_temperature=config.audio.asr_temperature,
                     listen_timeout_seconds=6.0,
                     phrase_time_limit_seconds=12.0,
+                    skip_ambient_calibration=config.audio.ptt_skip_ambient_calibration,
+                    energy_threshold=config.audio.ptt_energy_threshold or None,
                 )
                 ptt_bridge.result.emit(text)
             except Exception as exc:
@@ -497,6 +500,7 @@ def main() -> int:
             preamble_text=config.screen_commentary.preamble_text,
         )
         director.apply_runtime_config(config)
+        VoiceWakeupListener.invalidate_ambient_calibration()
         _start_voice_listener()
         if notify:
             _notify("设置", "已保存并应用。", timeout_ms=2200)
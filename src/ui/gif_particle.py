@@ -34,7 +34,7 @@ except ModuleNotFoundError:
     from ._file_helpers import normalize_asset_path, path_exists
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ParticleConfig:
     """Configuration for a GIF particle."""
     gif_path: str
@@ -599,6 +599,12 @@ class GifParticleManager(QWidget):
         duration_ms: int = 5000,
         stagger_ms: int = 300,
         edges: str = "random",
+        target: str = "random_inner",
+        scale_range: tuple[float, float] | None = None,
+        duration_range: tuple[int, int] | None = None,
+        enter_range: tuple[int, int] = (800, 1500),
+        exit_range: tuple[int, int] = (600, 1000),
+        opacity_range: tuple[float, float] = (0.7, 1.0),
     ) -> list[int]:
         """
         Spawn a wave of multiple particles with staggered entry.
@@ -608,8 +614,14 @@ class GifParticleManager(QWidget):
             count: Number of particles in this wave
             scale: Size scaling factor
             duration_ms: How long each particle lingers
-            stagger_ms: Delay between each particle spawn
+            stagger_ms: Delay between each particle spawn (0 spawns all at once)
             edges: Edge to enter from ("random", "top", "bottom", "left", "right")
+            target: Target area ("center", "random_inner")
+            scale_range: Per-particle random scale bounds, overrides ``scale``
+            duration_range: Per-particle random linger bounds, overrides ``duration_ms``
+            enter_range: Per-particle random entry animation bounds
+            exit_range: Per-particle random exit animation bounds
+            opacity_range: Per-particle random opacity bounds
 
         Returns:
             List of spawned particle IDs
@@ -624,20 +636,22 @@ class GifParticleManager(QWidget):
             def _spawn_one(g=gif) -> None:
                 config = ParticleConfig(
                     gif_path=g,
-                    scale=scale,
-                    duration_ms=duration_ms,
-                    enter_duration_ms=random.randint(800, 1500),
-                    exit_duration_ms=random.randint(600, 1000),
+                    scale=random.uniform(*scale_range) if scale_range else scale,
+                    duration_ms=(
+                        random.randint(*duration_range) if duration_range else duration_ms
+                    ),
+                    enter_duration_ms=random.randint(*enter_range),
+                    exit_duration_ms=random.randint(*exit_range),
                     edge=edges,
-                    target="random_inner",
-                    opacity=random.uniform(0.7, 1.0),
+                    target=target,
+                    opacity=random.uniform(*opacity_range),
                 )
                 pid = self.spawn_particle(config)
                 if pid is not None:
                     spawned.append(pid)
 
             # Stagger the spawns
-            if i == 0:
+            if i == 0 or stagger_ms <= 0:
                 _spawn_one()
             else:
                 QTimer.singleShot(i * stagger_ms, _spawn_one)
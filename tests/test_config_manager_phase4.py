@@ -48,6 +48,8 @@ class ConfigManagerPhase4Test(unittest.TestCase):
             config.audio.asr_base_url = "https://open.bigmodel.cn/api/paas/v4/audio/transcriptions"
             config.audio.asr_temperature = 0.2
             config.audio.asr_prompt = "测试语音上下文"
+            config.audio.ptt_skip_ambient_calibration = True
+            config.audio.ptt_energy_threshold = 420.0
             config.screen_commentary.streaming_enabled = True
             config.screen_commentary.ocr_fallback_enabled = False
             config.screen_commentary.stream_chunk_chars = 18
@@ -82,6 +84,8 @@ class ConfigManagerPhase4Test(unittest.TestCase):
             self.assertEqual(loaded.audio.asr_base_url, "https://open.bigmodel.cn/api/paas/v4/audio/transcriptions")
             self.assertEqual(loaded.audio.asr_temperature, 0.2)
             self.assertEqual(loaded.audio.asr_prompt, "测试语音上下文")
+            self.assertTrue(loaded.audio.ptt_skip_ambient_calibration)
+            self.assertEqual(loaded.audio.ptt_energy_threshold, 420.0)
             self.assertTrue(loaded.screen_commentary.streaming_enabled)
             self.assertFalse(loaded.screen_commentary.ocr_fallback_enabled)
             self.assertEqual(loaded.screen_commentary.stream_chunk_chars, 18)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication, Qt, QTimer
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+import core.gif_state_mapper
+from core.gif_state_mapper import GifStateMapper
+
+
+class _ParticleManagerStub:
+    def __init__(self) -> None:
+        self.active_count = 0
+        self.spawned: list = []
+        self.waves: list = []
+        self.dismiss_calls = 0
+
+    def spawn_particle(self, config) -> int:
+        self.spawned.append(config)
+        return len(self.spawned)
+
+    def spawn_wave(self, gif_paths, **kwargs) -> list[int]:
+        self.waves.append((list(gif_paths), kwargs))
+        return []
+
+    def dismiss_all(self) -> None:
+        self.dismiss_calls += 1
+
+
+class GifStateMapperTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.characters_dir = Path(self._tmp.name)
+        for name in ("state1.gif", "state3.gif", "state5.gif", "state7.gif"):
+            (self.characters_dir / name).write_bytes(b"GIF89a")
+        self.manager = _ParticleManagerStub()
+        self.mapper = GifStateMapper(self.characters_dir, self.manager)
+        self.assertTrue(self.mapper._paths_ready.wait(timeout=2.0))
+
+    def tearDown(self) -> None:
+        self.mapper.shutdown()
+        self._tmp.cleanup()
+
+    def test_peeking_reuses_pooled_config(self) -> None:
+        self.mapper.on_peeking()
+        self.mapper.on_peeking()
+
+        self.assertEqual(len(self.manager.spawned), 2)
+        self.assertIs(self.manager.spawned[0], self.manager.spawned[1])
+        self.assertEqual(
+            self.manager.spawned[0].gif_path,
+            str(self.characters_dir / "state1.gif"),
+        )
+
+    def test_random_ambient_spawns_single_wave(self) -> None:
+        self.mapper.spawn_random_ambient(count=3)
+
+        self.assertEqual(self.manager.spawned, [])
+        self.assertEqual(len(self.manager.waves), 1)
+        paths, kwargs = self.manager.waves[0]
+        self.assertEqual(paths, [str(self.characters_dir / "state7.gif")])
+        self.assertEqual(kwargs["count"], 3)
+        self.assertEqual(kwargs["scale_range"], (0.3, 0.5))
+
+    def test_audio_pulse_subscribes_to_shared_ticker(self) -> None:
+        self.mapper.on_audio_started()
+        subscription = self.mapper._pulse_sub
+        self.assertIsNotNone(subscription)
+        self.assertTrue(subscription.active)
+
+        self.mapper.on_audio_stopped()
+        self.assertIsNone(self.mapper._pulse_sub)
+        self.assertFalse(subscription.active)
+
+    def test_ring_random_stays_in_bounds_across_refill(self) -> None:
+        for _ in range(3000):
+            value = self.mapper._ri(4000, 7000)
+            self.assertGreaterEqual(value, 4000)
+            self.assertLessEqual(value, 7000)
+            ratio = self.mapper._rf(0.4, 0.8)
+            self.assertGreaterEqual(ratio, 0.4)
+            self.assertLess(ratio, 0.8)
+
+    def test_events_before_path_resolution_are_replayed(self) -> None:
+        release = threading.Event()
+        resolve = core.gif_state_mapper._resolve_paths_for
+
+        def slow_resolve(characters_dir):
+            release.wait(2.0)
+            return resolve(characters_dir)
+
+        manager = _ParticleManagerStub()
+        with patch.object(core.gif_state_mapper, "_resolve_paths_for", slow_resolve):
+            mapper = GifStateMapper(self.characters_dir, manager)
+            started = time.monotonic()
+            mapper.on_peeking()
+            mapper.on_peeking()
+            self.assertLess(time.monotonic() - started, 0.04)
+            self.assertEqual(manager.spawned, [])
+            release.set()
+            self.assertTrue(mapper._paths_ready.wait(timeout=2.0))
+            mapper._resolve_thread.join(2.0)
+        QCoreApplication.processEvents()
+
+        # Duplicate early events collapse into one replay.
+        self.assertEqual(len(manager.spawned), 1)
+        mapper.shutdown()
+
+    def test_event_path_pools_are_precomputed(self) -> None:
+        thinking = str(self.characters_dir / "state5.gif")
+        ambient = str(self.characters_dir / "state7.gif")
+        music = str(self.characters_dir / "state3.gif")
+        self.assertEqual(self.mapper._idle_paths, (thinking, ambient))
+        self.assertEqual(self.mapper._music_paths, (music, ambient))
+
+        self.mapper.on_prolonged_idle()
+        self.assertEqual(self.manager.waves, [])
+        self.assertEqual(len(self.manager.spawned), 1)
+        self.assertEqual(self.manager.spawned[0].gif_path, thinking)
+
+    def test_audio_pulse_skips_when_crowded(self) -> None:
+        self.mapper.on_audio_started()
+        self.manager.spawned.clear()
+        self.manager.active_count = GifStateMapper.PULSE_MAX_ACTIVE
+        self.mapper._on_audio_pulse()
+        self.assertEqual(self.manager.spawned, [])
+
+        self.manager.active_count = 0
+        self.mapper._on_audio_pulse()
+        self.assertEqual(len(self.manager.spawned), 1)
+
+    def test_audio_pulse_alternates_music_paths(self) -> None:
+        self.mapper.on_audio_started()
+        self.manager.spawned.clear()
+        for _ in range(4):
+            self.mapper._on_audio_pulse()
+
+        music, ambient = self.mapper._music_paths
+        self.assertEqual(
+            [config.gif_path for config in self.manager.spawned],
+            [music, ambient, music, ambient],
+        )
+
+    def test_hidden_only_dismisses_when_particles_active(self) -> None:
+        self.mapper.on_hidden()
+        self.assertEqual(self.manager.dismiss_calls, 0)
+
+        self.manager.active_count = 2
+        self.mapper.on_hidden()
+        self.assertEqual(self.manager.dismiss_calls, 1)
+
+    def test_gif_roles_table_is_read_only(self) -> None:
+        self.assertEqual(GifStateMapper.GIF_ROLES["curious"], "state1.gif")
+        with self.assertRaises(TypeError):
+            GifStateMapper.GIF_ROLES["curious"] = "other.gif"  # type: ignore[index]
+
+    def test_mappers_share_resolved_paths_per_directory(self) -> None:
+        other = GifStateMapper(self.characters_dir, _ParticleManagerStub())
+        self.assertTrue(other._paths_ready.wait(timeout=2.0))
+        self.assertIs(other._gif_paths["ambient"], self.mapper._gif_paths["ambient"])
+        self.assertNotIn("excited", other._gif_paths)
+        other.shutdown()
+
+    def test_large_stagger_bursts_fall_back_to_wave(self) -> None:
+        paths = (str(self.characters_dir / "state7.gif"),)
+        self.mapper._stagger_spawn(
+            paths,
+            count=GifStateMapper.STAGGER_SPAWN_MAX + 1,
+            scale=0.5,
+            duration_ms=1000,
+            stagger_ms=100,
+        )
+
+        self.assertEqual(self.manager.spawned, [])
+        self.assertEqual(len(self.manager.waves), 1)
+        self.assertEqual(self.manager.waves[0][1]["count"], GifStateMapper.STAGGER_SPAWN_MAX + 1)
+
+    def test_small_bursts_use_coarse_single_shot_timers(self) -> None:
+        paths = (str(self.characters_dir / "state7.gif"),)
+        self.mapper._stagger_spawn(paths, count=3, scale=0.5, duration_ms=1000, stagger_ms=10)
+
+        timers = self.mapper.findChildren(QTimer)
+        self.assertEqual(len(timers), 2)
+        for timer in timers:
+            self.assertTrue(timer.isSingleShot())
+            self.assertEqual(timer.timerType(), Qt.TimerType.CoarseTimer)
+
+        deadline = time.monotonic() + 2.0
+        while len(self.manager.spawned) < 3 and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.005)
+        self.assertEqual(len(self.manager.spawned), 3)
+
+    def test_disabled_mapper_ignores_events(self) -> None:
+        self.mapper.set_enabled(False)
+        self.mapper.on_peeking()
+        self.mapper.on_prolonged_idle()
+
+        self.assertEqual(self.manager.spawned, [])
+        self.assertEqual(self.manager.waves, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
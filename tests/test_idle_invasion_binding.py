@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication, QObject, SIGNAL, Signal
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from core.idle_invasion import IdleInvasionController
+
+
+class _MonitorStub(QObject):
+    idle_time_updated = Signal(int)
+    user_active_detected = Signal()
+
+
+class IdleInvasionBindingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.controller = IdleInvasionController(Path(self._tmp.name))
+        self.monitor = _MonitorStub()
+
+    def tearDown(self) -> None:
+        self.controller.shutdown()
+        self._tmp.cleanup()
+
+    def _receivers(self) -> tuple[int, int]:
+        return (
+            self.monitor.receivers(SIGNAL("idle_time_updated(int)")),
+            self.monitor.receivers(SIGNAL("user_active_detected()")),
+        )
+
+    def test_rebinding_does_not_duplicate_connections(self) -> None:
+        self.controller.bind_idle_monitor(self.monitor)
+        self.controller.bind_idle_monitor(self.monitor)
+        self.assertEqual(self._receivers(), (1, 1))
+
+    def test_shutdown_disconnects_monitor(self) -> None:
+        self.controller.bind_idle_monitor(self.monitor)
+        self.controller.shutdown()
+        self.assertEqual(self._receivers(), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+from PySide6.QtGui import QImageReader
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from core.idle_invasion import _GIF_SIZE_CACHE, IdleInvasionController, _GifSizeProbe, _probe_gif_size
+
+
+def _grid_subject(cols: int, rows: int) -> SimpleNamespace:
+    subject = SimpleNamespace(
+        _grid_cols=cols,
+        _grid_rows=rows,
+        _free_cells=[(c, r) for c in range(cols) for r in range(rows)],
+        _occupied_bits=bytearray(cols * rows),
+        _occupied_count=0,
+    )
+    subject._release_cell = lambda cell: IdleInvasionController._release_cell(subject, cell)
+    return subject
+
+
+class IdleInvasionGridTest(unittest.TestCase):
+    def test_pick_free_cell_exhausts_grid_without_repeats(self) -> None:
+        subject = _grid_subject(4, 3)
+        picked = [IdleInvasionController._pick_free_cell(subject) for _ in range(12)]
+
+        self.assertEqual(len(set(picked)), 12)
+        self.assertIsNone(IdleInvasionController._pick_free_cell(subject))
+
+    def test_released_cell_can_be_picked_again(self) -> None:
+        subject = _grid_subject(2, 1)
+        first = IdleInvasionController._pick_free_cell(subject)
+        second = IdleInvasionController._pick_free_cell(subject)
+        self.assertIsNone(IdleInvasionController._pick_free_cell(subject))
+
+        subject._release_cell(first)
+        self.assertEqual(IdleInvasionController._pick_free_cell(subject), first)
+        self.assertNotEqual(first, second)
+
+    def test_occupancy_bits_track_picks_and_ignore_double_release(self) -> None:
+        subject = _grid_subject(3, 2)
+        cell = IdleInvasionController._pick_free_cell(subject)
+        self.assertEqual(subject._occupied_bits[cell[0] * 2 + cell[1]], 1)
+        self.assertEqual(subject._occupied_count, 1)
+
+        subject._release_cell(cell)
+        subject._release_cell(cell)
+        self.assertEqual(subject._occupied_count, 0)
+        self.assertEqual(len(subject._free_cells), 6)
+
+    def test_stale_cell_from_old_grid_is_ignored(self) -> None:
+        subject = _grid_subject(2, 2)
+        subject._release_cell((5, 0))
+        self.assertEqual(len(subject._free_cells), 4)
+
+    def test_init_grid_uses_cached_screen_geometry(self) -> None:
+        subject = SimpleNamespace(
+            _screen_geo=(100, 20, 1000, 500),
+            _refresh_screen_geometry=lambda: self.fail("geometry should come from the cache"),
+            _refresh_gif_sizes=lambda: None,
+            _max_gif_w=90,
+            _max_gif_h=90,
+            _config=SimpleNamespace(cell_padding=10),
+        )
+        IdleInvasionController._init_grid(subject)
+
+        self.assertEqual((subject._screen_x, subject._screen_y), (100, 20))
+        self.assertEqual((subject._grid_cols, subject._grid_rows), (10, 5))
+        self.assertEqual(len(subject._free_cells), 50)
+        self.assertEqual(len(subject._occupied_bits), 50)
+
+
+class IdleInvasionGifPathsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.characters_dir = Path(self._tmp.name)
+        (self.characters_dir / "state1.gif").write_bytes(b"GIF89a")
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def _subject(self, gifs: list[str]) -> SimpleNamespace:
+        return SimpleNamespace(
+            _characters_dir=self.characters_dir,
+            _config=SimpleNamespace(participating_gifs=gifs),
+            _gif_paths_key=None,
+            _gif_paths=[],
+        )
+
+    def test_missing_gifs_are_skipped(self) -> None:
+        subject = self._subject(["state1.gif", "missing.gif"])
+        paths = IdleInvasionController._resolve_gif_paths(subject)
+        self.assertEqual(paths, [str(self.characters_dir / "state1.gif")])
+
+    def test_unchanged_config_reuses_resolved_paths(self) -> None:
+        subject = self._subject(["state1.gif"])
+        subject._gif_paths = IdleInvasionController._resolve_gif_paths(subject)
+        (self.characters_dir / "state1.gif").unlink()
+
+        self.assertIs(IdleInvasionController._resolve_gif_paths(subject), subject._gif_paths)
+
+        subject._config.participating_gifs = ["state1.gif", "state2.gif"]
+        self.assertEqual(IdleInvasionController._resolve_gif_paths(subject), [])
+
+
+class IdleInvasionGifSizeCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.gif_path = str(Path(self._tmp.name) / "state1.gif")
+        Path(self.gif_path).write_bytes(b"GIF89a")
+        self.probe_calls: list[str] = []
+
+    def tearDown(self) -> None:
+        _GIF_SIZE_CACHE.clear()
+        self._tmp.cleanup()
+
+    def _subject(self, scale: float) -> SimpleNamespace:
+        def _probe(path: str) -> tuple[int, int]:
+            self.probe_calls.append(path)
+            return (int(100 * scale), int(80 * scale))
+
+        return SimpleNamespace(
+            _config=SimpleNamespace(scale=scale),
+            _probe_scaled_gif_size=_probe,
+        )
+
+    def test_repeated_reads_hit_cache(self) -> None:
+        subject = self._subject(0.5)
+        first = IdleInvasionController._read_scaled_gif_size(subject, self.gif_path)
+        second = IdleInvasionController._read_scaled_gif_size(subject, self.gif_path)
+
+        self.assertEqual(first, (50, 40))
+        self.assertEqual(second, first)
+        self.assertEqual(self.probe_calls, [self.gif_path])
+
+    def test_scale_change_misses_cache(self) -> None:
+        IdleInvasionController._read_scaled_gif_size(self._subject(0.5), self.gif_path)
+        size = IdleInvasionController._read_scaled_gif_size(self._subject(1.0), self.gif_path)
+
+        self.assertEqual(size, (100, 80))
+        self.assertEqual(len(self.probe_calls), 2)
+
+
+class IdleInvasionGifSizeProbeTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        _GIF_SIZE_CACHE.clear()
+
+    def test_probe_warms_cache_and_reports_sizes(self) -> None:
+        gif_path = str(ROOT / "characters" / "state1.gif")
+        probe = _GifSizeProbe([gif_path, str(ROOT / "characters" / "missing.gif")], 0.5)
+        results: list[tuple[float, dict]] = []
+        probe.signals.finished.connect(lambda scale, sizes: results.append((scale, sizes)))
+
+        probe.run()
+
+        self.assertEqual(len(results), 1)
+        scale, sizes = results[0]
+        self.assertEqual(scale, 0.5)
+        self.assertEqual(list(sizes), [gif_path])
+        self.assertIn(sizes[gif_path], _GIF_SIZE_CACHE.values())
+
+    def test_probe_scales_header_size_and_defaults_unreadable_files(self) -> None:
+        gif_path = str(ROOT / "characters" / "state1.gif")
+        native = QImageReader(gif_path).size()
+        self.assertEqual(
+            _probe_gif_size(gif_path, 0.5),
+            (max(1, int(native.width() * 0.5)), max(1, int(native.height() * 0.5))),
+        )
+        self.assertEqual(_probe_gif_size(str(ROOT / "characters" / "missing.gif"), 0.5), (60, 60))
+
+    def test_stale_probe_results_are_ignored(self) -> None:
+        subject = SimpleNamespace(
+            _config=SimpleNamespace(scale=1.0),
+            _gif_paths=["a.gif"],
+            _gif_size_probe=object(),
+            _gif_sizes={},
+        )
+        IdleInvasionController._install_gif_sizes(subject, 0.5, {"a.gif": (10, 10)})
+
+        self.assertIsNone(subject._gif_size_probe)
+        self.assertEqual(subject._gif_sizes, {})
+
+
+if __name__ == "__main__":
+    unittest.main()
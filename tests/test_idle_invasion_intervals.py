@@ -20,7 +20,7 @@ def _subject(
     initial_spawn_interval_ms: int = 10_000,
     min_spawn_interval_ms: int = 2_000,
 ):
-    return SimpleNamespace(
+    subject = SimpleNamespace(
         _idle_time_ms=idle_ms,
         _config=SimpleNamespace(
             start_delay_ms=start_delay_ms,
@@ -28,6 +28,8 @@ def _subject(
             min_spawn_interval_ms=min_spawn_interval_ms,
         ),
     )
+    IdleInvasionController._rebuild_spawn_schedule(subject)
+    return subject
 
 
 class IdleInvasionIntervalsTest(unittest.TestCase):
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from PySide6.QtCore import QCoreApplication, QPoint, QTimer
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from core.idle_invasion import IdleInvasionController
+
+
+class _ParticleStub:
+    def __init__(self, name: str, log: list[str]) -> None:
+        self.name = name
+        self._log = log
+
+    def start_retreat(self) -> None:
+        self._log.append(self.name)
+
+
+class _FakeClock:
+    def __init__(self) -> None:
+        self.now_ms = 0
+
+    def start(self) -> None:
+        self.now_ms = 0
+
+    def elapsed(self) -> int:
+        return self.now_ms
+
+
+class IdleInvasionRetreatScheduleTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    def setUp(self) -> None:
+        self.log: list[str] = []
+        self.clock = _FakeClock()
+        timer = QTimer()
+        timer.setSingleShot(True)
+        self.subject = SimpleNamespace(
+            _retreat_schedule=[],
+            _retreat_clock=self.clock,
+            _retreat_step_timer=timer,
+        )
+        self.subject._arm_retreat_step = lambda elapsed: IdleInvasionController._arm_retreat_step(
+            self.subject, elapsed
+        )
+
+    def tearDown(self) -> None:
+        self.subject._retreat_step_timer.stop()
+
+    def _particle(self, name: str) -> _ParticleStub:
+        return _ParticleStub(name, self.log)
+
+    def test_due_particles_fire_in_time_order(self) -> None:
+        entries = [(120, self._particle("c")), (0, self._particle("a")), (60, self._particle("b"))]
+        IdleInvasionController._start_retreat_schedule(self.subject, entries)
+
+        self.assertTrue(self.subject._retreat_step_timer.isActive())
+        self.assertEqual(self.subject._retreat_step_timer.interval(), 0)
+
+        IdleInvasionController._on_retreat_step(self.subject)
+        self.assertEqual(self.log, ["a"])
+        self.assertEqual(self.subject._retreat_step_timer.interval(), 60)
+
+        self.clock.now_ms = 130
+        IdleInvasionController._on_retreat_step(self.subject)
+        self.assertEqual(self.log, ["a", "b", "c"])
+        self.assertEqual(self.subject._retreat_schedule, [])
+
+    def test_clear_stops_pending_retreats(self) -> None:
+        IdleInvasionController._start_retreat_schedule(self.subject, [(50, self._particle("a"))])
+        IdleInvasionController._clear_retreat_schedule(self.subject)
+
+        self.assertFalse(self.subject._retreat_step_timer.isActive())
+        self.assertEqual(self.subject._retreat_schedule, [])
+
+
+class _PositionedStub:
+    def __init__(self, x: int, y: int) -> None:
+        self.target_pos = (x, y)
+
+
+class IdleInvasionRippleOrderTest(unittest.TestCase):
+    def test_particles_sorted_by_distance_to_cursor(self) -> None:
+        far = _PositionedStub(500, 500)
+        near = _PositionedStub(10, 0)
+        tied = _PositionedStub(0, 10)
+        with patch("core.idle_invasion.QCursor.pos", return_value=QPoint(0, 0)):
+            ordered = IdleInvasionController._sorted_particles_for_ripple(
+                SimpleNamespace(), [far, near, tied]
+            )
+        self.assertEqual(ordered, [near, tied, far])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from core.idle_monitor import IdleMonitor, IdleState
+
+
+class IdleMonitorPollingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.monitor = IdleMonitor(threshold_ms=10_000)
+
+    def test_standby_far_from_threshold_polls_slowly(self) -> None:
+        self.assertEqual(self.monitor._next_poll_ms(0), IdleMonitor.MAX_POLL_INTERVAL_MS)
+
+    def test_poll_tightens_near_threshold(self) -> None:
+        self.monitor._state = IdleState.PRE_IDLE
+        self.assertEqual(self.monitor._next_poll_ms(9_700), 300)
+        self.assertEqual(self.monitor._next_poll_ms(9_990), IdleMonitor.MIN_POLL_INTERVAL_MS)
+
+    def test_triggered_and_active_use_fixed_intervals(self) -> None:
+        self.monitor._state = IdleState.IDLE_TRIGGERED
+        self.assertEqual(self.monitor._next_poll_ms(20_000), IdleMonitor.TRIGGERED_POLL_INTERVAL_MS)
+        self.monitor._state = IdleState.ACTIVE
+        self.assertEqual(self.monitor._next_poll_ms(0), IdleMonitor.ACTIVE_POLL_INTERVAL_MS)
+
+
+class IdleMonitorStateTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.monitor = IdleMonitor(threshold_ms=10_000)
+        self.events: list[str] = []
+        self.monitor.user_idle_confirmed.connect(lambda: self.events.append("idle"))
+        self.monitor.user_active_detected.connect(lambda: self.events.append("active"))
+
+    def test_full_idle_cycle(self) -> None:
+        self.monitor._update_state(8_500)
+        self.assertEqual(self.monitor.state, IdleState.PRE_IDLE)
+        self.monitor._update_state(10_000)
+        self.assertEqual(self.monitor.state, IdleState.IDLE_TRIGGERED)
+        self.monitor._update_state(200)
+        self.assertEqual(self.monitor.state, IdleState.ACTIVE)
+        self.monitor._update_state(50_000)
+        self.assertEqual(self.monitor.state, IdleState.ACTIVE)
+        self.assertEqual(self.events, ["idle", "active"])
+
+    def test_idle_time_updates_are_coalesced(self) -> None:
+        emitted: list[int] = []
+        self.monitor.idle_time_updated.connect(emitted.append)
+        for idle_ms in (0, 100, 400, 600, 900, 1_200, 30):
+            self.monitor._maybe_emit_idle_time(idle_ms)
+        self.assertEqual(emitted, [0, 600, 1_200, 30])
+
+    def test_pre_idle_falls_back_to_standby_on_input(self) -> None:
+        self.monitor._update_state(9_000)
+        self.monitor._update_state(100)
+        self.assertEqual(self.monitor.state, IdleState.STANDBY)
+        self.assertEqual(self.events, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import logging
+import sys
+import time
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from PySide6.QtCore import QtMsgType
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+import core.logger
+from core.logger import _build_qt_dispatch, _install_qt_message_bridge, _qt_message_handler
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__(logging.DEBUG)
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+
+
+class QtMessageBridgeTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.logger = logging.getLogger("CyberCompanion.test_qt_bridge")
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.propagate = False
+        self.handler = _ListHandler()
+        self.logger.addHandler(self.handler)
+        self.addCleanup(self.logger.removeHandler, self.handler)
+        patcher = patch.multiple(
+            core.logger,
+            _QT_BRIDGE_LOGGER=self.logger,
+            _QT_DISPATCH=_build_qt_dispatch(self.logger),
+            _QT_PREV_HANDLER=None,
+            _QT_LAST_KEY=None,
+            _QT_LAST_REPEATS=0,
+            _QT_REPEAT_TIMER=None,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._cancel_repeat_timer)
+
+    @staticmethod
+    def _cancel_repeat_timer() -> None:
+        timer = core.logger._QT_REPEAT_TIMER
+        if timer is not None:
+            timer.cancel()
+
+    def test_levels_follow_message_type(self) -> None:
+        context = SimpleNamespace(category=None)
+        _qt_message_handler(QtMsgType.QtDebugMsg, context, "dbg")
+        _qt_message_handler(QtMsgType.QtWarningMsg, context, "warn")
+        _qt_message_handler(QtMsgType.QtCriticalMsg, context, "crit")
+
+        self.assertEqual(
+            [(r.levelno, r.getMessage()) for r in self.handler.records],
+            [
+                (logging.DEBUG, "[Qt] dbg"),
+                (logging.WARNING, "[Qt] warn"),
+                (logging.ERROR, "[Qt] crit"),
+            ],
+        )
+
+    def test_category_prefix(self) -> None:
+        _qt_message_handler(QtMsgType.QtInfoMsg, SimpleNamespace(category=" qt.qpa "), "hello")
+        _qt_message_handler(QtMsgType.QtInfoMsg, object(), "bare")
+
+        self.assertEqual(
+            [r.getMessage() for r in self.handler.records],
+            ["[Qt:qt.qpa] hello", "[Qt] bare"],
+        )
+
+    def test_category_prefix_is_cached(self) -> None:
+        with patch.dict(core.logger._QT_PREFIX_CACHE, clear=True):
+            context = SimpleNamespace(category="qt.qpa.window")
+            _qt_message_handler(QtMsgType.QtInfoMsg, context, "a")
+            _qt_message_handler(QtMsgType.QtInfoMsg, context, "b")
+            self.assertEqual(core.logger._QT_PREFIX_CACHE, {"qt.qpa.window": "[Qt:qt.qpa.window] "})
+
+        self.assertEqual(
+            [r.getMessage() for r in self.handler.records],
+            ["[Qt:qt.qpa.window] a", "[Qt:qt.qpa.window] b"],
+        )
+
+    def test_back_to_back_duplicates_are_coalesced(self) -> None:
+        context = SimpleNamespace(category="qt.qpa.window")
+        with patch("core.logger.time.monotonic", return_value=10.0):
+            for _ in range(4):
+                _qt_message_handler(QtMsgType.QtWarningMsg, context, "resize")
+            _qt_message_handler(QtMsgType.QtWarningMsg, context, "moved")
+
+        self.assertEqual(
+            [r.getMessage() for r in self.handler.records],
+            ["[Qt:qt.qpa.window] resize", "[Qt:qt.qpa.window] resize (x3)", "[Qt:qt.qpa.window] moved"],
+        )
+        self.assertEqual(self.handler.records[1].levelno, logging.WARNING)
+
+    def test_repeats_flush_after_interval_and_at_exit(self) -> None:
+        context = SimpleNamespace(category=None)
+        with patch("core.logger.time.monotonic", side_effect=[0.0, 0.2, 1.5, 1.6]):
+            for _ in range(4):
+                _qt_message_handler(QtMsgType.QtInfoMsg, context, "tick")
+        core.logger._flush_qt_repeats()
+
+        self.assertEqual(
+            [r.getMessage() for r in self.handler.records],
+            ["[Qt] tick", "[Qt] tick (x2)", "[Qt] tick (x1)"],
+        )
+
+
+    def test_quiet_burst_is_flushed_by_timer(self) -> None:
+        context = SimpleNamespace(category=None)
+        with patch.object(core.logger, "_QT_REPEAT_FLUSH_S", 0.05):
+            for _ in range(3):
+                _qt_message_handler(QtMsgType.QtWarningMsg, context, "burst")
+            deadline = time.monotonic() + 2.0
+            while len(self.handler.records) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+        self.assertEqual(
+            [r.getMessage() for r in self.handler.records],
+            ["[Qt] burst", "[Qt] burst (x2)"],
+        )
+        self.assertIsNone(core.logger._QT_REPEAT_TIMER)
+
+
+class QtMessageBridgeInstallTest(unittest.TestCase):
+    def test_reinstall_repoints_logger_without_lock(self) -> None:
+        other = logging.getLogger("CyberCompanion.test_qt_bridge_other")
+        lock = MagicMock()
+        with patch.multiple(
+            core.logger,
+            _QT_BRIDGE_INSTALLED=True,
+            _QT_BRIDGE_LOGGER=None,
+            _QT_DISPATCH={},
+            _QT_BRIDGE_LOCK=lock,
+        ):
+            _install_qt_message_bridge(other)
+            self.assertIs(core.logger._QT_BRIDGE_LOGGER, other)
+            self.assertEqual(core.logger._QT_DISPATCH[QtMsgType.QtWarningMsg], other.warning)
+        lock.__enter__.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -36,6 +36,18 @@ class MoodSystemTest(unittest.TestCase):
         mood = MoodSystem(initial_mood=0.85)
         self.assertEqual(mood.mood_label, "兴奋")
 
+    def test_mood_label_breakpoints(self) -> None:
+        expected = [(0.0, "愤怒"), (0.199, "愤怒"), (0.2, "不满"), (0.4, "平静"), (0.6, "开心"), (0.8, "兴奋")]
+        for value, label in expected:
+            self.assertEqual(MoodSystem(initial_mood=value).mood_label, label, value)
+
+    def test_decay_settles_exactly_at_neutral(self) -> None:
+        mood = MoodSystem(initial_mood=0.51)
+        mood.natural_decay()
+        self.assertEqual(mood.mood, 0.5)
+        mood.natural_decay()
+        self.assertEqual(mood.mood, 0.5)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+import logging
+import queue
 import sys
 import tempfile
+import time
 import unittest
+from logging.handlers import QueueHandler
 from pathlib import Path
 from unittest.mock import patch
 
@@ -10,8 +14,17 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT / "src") not in sys.path:
     sys.path.insert(0, str(ROOT / "src"))
 
-from core.logger import setup_logger
-from core.paths import get_base_dir, get_cache_dir, get_log_dir, get_user_data_dir
+import core.logger
+from core.logger import _BufferedFileHandler, _FlushingQueueListener, _rotate_log_file, setup_logger
+from core.paths import (
+    _reset_path_cache,
+    ensure_app_dirs,
+    get_base_dir,
+    get_cache_dir,
+    get_log_dir,
+    get_user_data_dir,
+    resolve_config_path,
+)
 
 
 class PathsLoggerTest(unittest.TestCase):
@@ -41,6 +54,119 @@ class PathsLoggerTest(unittest.TestCase):
                 handler.close()
                 logger.removeHandler(handler)
 
+    def test_logger_writes_through_background_listener(self) -> None:
+        # Detach handlers other tests (or pytest's capture) left on the logger,
+        # otherwise setup_logger treats it as already configured.
+        existing = logging.getLogger("CyberCompanion")
+        previous_handlers = list(existing.handlers)
+        existing.handlers.clear()
+        self.addCleanup(existing.handlers.extend, previous_handlers)
+        with tempfile.TemporaryDirectory() as tmp:
+            log_dir = Path(tmp)
+            logger = setup_logger(log_dir, debug=False)
+            try:
+                queue_handlers = [h for h in logger.handlers if isinstance(h, QueueHandler)]
+                self.assertEqual(len(queue_handlers), 1)
+                self.assertIs(core.logger._LOG_LISTENER, queue_handlers[0].listener)
+
+                logger.info("queued %s", "record")
+                queue_handlers[0].flush()
+                content = (log_dir / "app.log").read_text(encoding="utf-8")
+                self.assertIn("queued record", content)
+
+                queue_handlers[0].stop()
+                logger.info("after stop")
+                queue_handlers[0].flush()
+                content = (log_dir / "app.log").read_text(encoding="utf-8")
+                self.assertIn("after stop", content)
+            finally:
+                for handler in list(logger.handlers):
+                    handler.close()
+                    logger.removeHandler(handler)
+            self.assertIsNone(core.logger._LOG_LISTENER)
+
+    def test_rotate_log_file_shifts_backups(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "app.log"
+            for name, text in (("app.log", "current"), ("app.log.1", "one"), ("app.log.2", "two")):
+                (Path(tmp) / name).write_text(text, encoding="utf-8")
+
+            _rotate_log_file(log_file, 2)
+
+            self.assertFalse(log_file.exists())
+            self.assertEqual((Path(tmp) / "app.log.1").read_text(encoding="utf-8"), "current")
+            self.assertEqual((Path(tmp) / "app.log.2").read_text(encoding="utf-8"), "one")
+            self.assertFalse((Path(tmp) / "app.log.3").exists())
+
+    def test_setup_logger_rotates_oversized_log_at_startup(self) -> None:
+        existing = logging.getLogger("CyberCompanion")
+        previous_handlers = list(existing.handlers)
+        existing.handlers.clear()
+        self.addCleanup(existing.handlers.extend, previous_handlers)
+        with tempfile.TemporaryDirectory() as tmp, patch.object(core.logger, "_LOG_MAX_BYTES", 10):
+            log_dir = Path(tmp)
+            (log_dir / "app.log").write_text("x" * 20, encoding="utf-8")
+            logger = setup_logger(log_dir, debug=False)
+            try:
+                logger.info("fresh")
+                for handler in logger.handlers:
+                    handler.flush()
+                self.assertEqual((log_dir / "app.log.1").read_text(encoding="utf-8"), "x" * 20)
+                self.assertIn("fresh", (log_dir / "app.log").read_text(encoding="utf-8"))
+            finally:
+                for handler in list(logger.handlers):
+                    handler.close()
+                    logger.removeHandler(handler)
+
+    def test_buffered_handler_batches_until_warning(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "app.log"
+            handler = _BufferedFileHandler(logging.FileHandler(log_file, encoding="utf-8"))
+            try:
+                handler.handle(logging.LogRecord("t", logging.INFO, __file__, 1, "quiet", None, None))
+                self.assertEqual(log_file.read_text(encoding="utf-8"), "")
+
+                handler.handle(logging.LogRecord("t", logging.WARNING, __file__, 1, "loud", None, None))
+                self.assertEqual(log_file.read_text(encoding="utf-8"), "quiet\nloud\n")
+            finally:
+                handler.close()
+            self.assertTrue(handler.target is None)
+
+    def test_idle_listener_flushes_buffered_records(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "app.log"
+            handler = _BufferedFileHandler(logging.FileHandler(log_file, encoding="utf-8"))
+            listener = _FlushingQueueListener(queue.Queue(-1), handler)
+            with patch.object(_FlushingQueueListener, "FLUSH_INTERVAL_S", 0.01):
+                listener.start()
+                try:
+                    listener.queue.put(logging.LogRecord("t", logging.INFO, __file__, 1, "idle", None, None))
+                    deadline = time.monotonic() + 2.0
+                    while "idle" not in log_file.read_text(encoding="utf-8") and time.monotonic() < deadline:
+                        time.sleep(0.01)
+                    self.assertIn("idle", log_file.read_text(encoding="utf-8"))
+                finally:
+                    listener.stop()
+                    handler.close()
+
+    def test_busy_listener_still_flushes_on_interval(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_file = Path(tmp) / "app.log"
+            handler = _BufferedFileHandler(logging.FileHandler(log_file, encoding="utf-8"))
+            listener = _FlushingQueueListener(queue.Queue(-1), handler)
+            with patch.object(_FlushingQueueListener, "FLUSH_INTERVAL_S", 0.1):
+                listener.start()
+                try:
+                    # Records arrive faster than the interval, so the queue never goes idle.
+                    deadline = time.monotonic() + 2.0
+                    while "busy" not in log_file.read_text(encoding="utf-8") and time.monotonic() < deadline:
+                        listener.queue.put(logging.LogRecord("t", logging.INFO, __file__, 1, "busy", None, None))
+                        time.sleep(0.02)
+                    self.assertIn("busy", log_file.read_text(encoding="utf-8"))
+                finally:
+                    listener.stop()
+                    handler.close()
+
     def test_windows_user_data_dir_is_stable(self) -> None:
         with tempfile.TemporaryDirectory() as tmp:
             local_appdata = Path(tmp)
@@ -55,6 +181,41 @@ class PathsLoggerTest(unittest.TestCase):
             self.assertEqual(user_dir, local_appdata / "CyberCompanion")
             self.assertTrue(user_dir.exists())
 
+    def test_resolved_paths_are_cached(self) -> None:
+        _reset_path_cache()
+        self.addCleanup(_reset_path_cache)
+        first = get_log_dir()
+        cache_dir = get_cache_dir()
+        with patch("pathlib.Path.mkdir") as mkdir, patch(
+            "core.paths.QStandardPaths.writableLocation"
+        ) as location:
+            self.assertEqual(get_log_dir(), first)
+            get_user_data_dir()
+            self.assertEqual(get_cache_dir(), cache_dir)
+        mkdir.assert_not_called()
+        location.assert_not_called()
+
+    def test_ensure_app_dirs_creates_everything_once(self) -> None:
+        _reset_path_cache()
+        self.addCleanup(_reset_path_cache)
+        ensure_app_dirs()
+        for directory in (get_user_data_dir(), get_cache_dir(), get_log_dir()):
+            self.assertTrue(directory.is_dir())
+        with patch("pathlib.Path.mkdir") as mkdir:
+            ensure_app_dirs()
+        mkdir.assert_not_called()
+
+    def test_config_bootstrap_runs_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            _reset_path_cache()
+            self.addCleanup(_reset_path_cache)
+            with patch("core.paths.get_user_data_dir", return_value=Path(tmp)):
+                first = resolve_config_path()
+                with patch("core.paths.Path.exists") as exists:
+                    self.assertEqual(resolve_config_path(), first)
+                exists.assert_not_called()
+            self.assertEqual(first, Path(tmp) / "config.json")
+
 
 if __name__ == "__main__":
     unittest.main()
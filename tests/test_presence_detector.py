@@ -34,6 +34,20 @@ class PresenceDetectorTest(unittest.TestCase):
         state = detector.determine_presence(100_000, None)
         self.assertEqual(state, PresenceState.UNKNOWN)
 
+    def test_face_return_resets_absent_count(self) -> None:
+        detector = PresenceDetector()
+        for _ in range(detector.FACE_ABSENT_FRAMES):
+            detector.determine_presence(360_000, GazeData(face_detected=False))
+        state = detector.determine_presence(360_000, GazeData(face_detected=True))
+        self.assertEqual(state, PresenceState.PRESENT_PASSIVE)
+
+    def test_short_idle_does_not_count_absent_frames(self) -> None:
+        detector = PresenceDetector()
+        for _ in range(detector.FACE_ABSENT_FRAMES):
+            detector.determine_presence(30_000, GazeData(face_detected=False))
+        state = detector.determine_presence(360_000, GazeData(face_detected=False))
+        self.assertEqual(state, PresenceState.UNKNOWN)
+
 
 if __name__ == "__main__":
     unittest.main()
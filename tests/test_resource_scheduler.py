@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import sys
+from dataclasses import FrozenInstanceError
 import unittest
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -43,6 +44,36 @@ class ResourceSchedulerTest(unittest.TestCase):
         )
         self.assertFalse(plan_sleep.llm_running)
 
+    def test_monotonic_seconds_drive_idle_window(self) -> None:
+        scheduler = ResourceScheduler()
+        scheduler.mark_dialog_activity(1000.0)
+        self.assertTrue(
+            scheduler.resolve_plan(is_fullscreen=False, user_dialog_active=False, now=1000.0 + 299.0).llm_running
+        )
+        self.assertFalse(
+            scheduler.resolve_plan(is_fullscreen=False, user_dialog_active=False, now=1000.0 + 301.0).llm_running
+        )
+
+    def test_default_clock_keeps_llm_after_recent_dialog(self) -> None:
+        scheduler = ResourceScheduler()
+        scheduler.mark_dialog_activity()
+        plan = scheduler.resolve_plan(is_fullscreen=False, user_dialog_active=False)
+        self.assertTrue(plan.llm_running)
+
+    def test_datetime_and_default_clock_share_a_time_base(self) -> None:
+        scheduler = ResourceScheduler()
+        scheduler.mark_dialog_activity(datetime.now() - timedelta(hours=1))
+        plan = scheduler.resolve_plan(is_fullscreen=False, user_dialog_active=False)
+        self.assertFalse(plan.llm_running)
+
+    def test_plans_are_shared_and_immutable(self) -> None:
+        scheduler = ResourceScheduler()
+        first = scheduler.resolve_plan(is_fullscreen=True, user_dialog_active=False)
+        second = scheduler.resolve_plan(is_fullscreen=True, user_dialog_active=False)
+        self.assertIs(first, second)
+        with self.assertRaises(FrozenInstanceError):
+            first.cv_running = True  # type: ignore[misc]
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -4,6 +4,7 @@ import sys
 import unittest
 from datetime import datetime, timedelta
 from pathlib import Path
+from unittest.mock import patch
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT / "src") not in sys.path:
@@ -52,6 +53,36 @@ class ScriptEngineTest(unittest.TestCase):
         self.assertIsNotNone(at_end)
         self.assertEqual(at_end.id, "default")
 
+    def test_pools_partitioned_on_refresh(self) -> None:
+        self.assertEqual([s.id for s in self.engine._idle_timed], ["night", "lunch"])
+        self.assertEqual([s.id for s in self.engine._idle_default], ["default"])
+        self.assertEqual([s.id for s in self.engine._panic_default], ["panic"])
+
+        self.engine.refresh(self.idle_scripts[:1], None)
+        self.assertEqual([s.id for s in self.engine._idle_timed], ["night"])
+        self.assertEqual(self.engine._idle_default, [])
+        self.assertEqual(self.engine._panic_timed, [])
+
+    def test_weighted_random_follows_probability_and_caches_pool(self) -> None:
+        pool = [
+            Script(id="a", text="a", probability=1.0),
+            Script(id="b", text="b", probability=3.0),
+        ]
+        with patch("core.script_engine.random.random", side_effect=[0.2, 0.3, 0.99]):
+            picks = [self.engine._weighted_random(pool).id for _ in range(3)]
+        self.assertEqual(picks, ["a", "b", "b"])
+        self.assertEqual(list(self.engine._weights_cache), [("a", "b")])
+
+        self.engine.refresh(self.idle_scripts, self.panic_scripts)
+        self.assertEqual(self.engine._weights_cache, {})
+
+    def test_weighted_random_large_pool_uses_cached_prefix_sums(self) -> None:
+        pool = [Script(id=f"s{i}", text="x", probability=1.0) for i in range(200)]
+        with patch("core.script_engine.random.random", side_effect=[0.0, 0.5, 0.999]):
+            picks = [self.engine._weighted_random(pool).id for _ in range(3)]
+        self.assertEqual(picks, ["s0", "s100", "s199"])
+        self.assertEqual(len(self.engine._weights_cache), 1)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -23,8 +23,10 @@ class StateMachineTest(unittest.TestCase):
 
     def test_illegal_transition_rejected(self) -> None:
         fsm = StateMachine()
-        self.assertFalse(fsm.transition_to(EntityState.FLEEING))
+        with self.assertLogs("CyberCompanion", level="WARNING") as logs:
+            self.assertFalse(fsm.transition_to(EntityState.FLEEING))
         self.assertEqual(fsm.current_state, EntityState.HIDDEN)
+        self.assertIn("HIDDEN -> FLEEING", logs.output[0])
 
     def test_callbacks_execute(self) -> None:
         fsm = StateMachine()
@@ -44,6 +46,20 @@ class StateMachineTest(unittest.TestCase):
         self.assertTrue(fsm.transition_to(EntityState.ENGAGED))
         self.assertEqual(calls, ["enter_peeking", "exit_peeking", "enter_engaged"])
 
+    def test_reregistering_replaces_both_callbacks(self) -> None:
+        fsm = StateMachine()
+        calls: list[str] = []
+        fsm.register_state_handler(
+            EntityState.PEEKING,
+            on_enter=lambda: calls.append("old_enter"),
+            on_exit=lambda: calls.append("old_exit"),
+        )
+        fsm.register_state_handler(EntityState.PEEKING, on_enter=lambda: calls.append("new_enter"))
+
+        self.assertTrue(fsm.transition_to(EntityState.PEEKING))
+        self.assertTrue(fsm.transition_to(EntityState.HIDDEN))
+        self.assertEqual(calls, ["new_enter"])
+
 
 if __name__ == "__main__":
     unittest.main()
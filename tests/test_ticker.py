@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from pathlib import Path
+
+from PySide6.QtCore import QCoreApplication
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from core.ticker import Ticker
+
+
+class TickerTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls._app = QCoreApplication.instance() or QCoreApplication(sys.argv)
+
+    def test_interval_is_gcd_of_periods(self) -> None:
+        ticker = Ticker()
+        first = ticker.subscribe(4000, lambda: None)
+        self.assertEqual(ticker.interval_ms, 4000)
+
+        second = ticker.subscribe(1000, lambda: None)
+        self.assertEqual(ticker.interval_ms, 1000)
+
+        second.unsubscribe()
+        self.assertEqual(ticker.interval_ms, 4000)
+        first.unsubscribe()
+        self.assertEqual(ticker.subscriber_count, 0)
+
+    def test_subscribers_fire_when_due(self) -> None:
+        ticker = Ticker()
+        fast_calls: list[int] = []
+        slow_calls: list[int] = []
+        fast = ticker.subscribe(1000, lambda: fast_calls.append(1))
+        slow = ticker.subscribe(3000, lambda: slow_calls.append(1))
+
+        for _ in range(6):
+            ticker._on_tick()
+
+        self.assertEqual(len(fast_calls), 6)
+        self.assertEqual(len(slow_calls), 2)
+        fast.unsubscribe()
+        slow.unsubscribe()
+
+    def test_unsubscribe_inside_callback(self) -> None:
+        ticker = Ticker()
+        calls: list[int] = []
+
+        def _once() -> None:
+            calls.append(1)
+            sub.unsubscribe()
+
+        sub = ticker.subscribe(500, _once)
+        ticker._on_tick()
+        ticker._on_tick()
+
+        self.assertEqual(calls, [1])
+        self.assertFalse(sub.active)
+        self.assertEqual(ticker.subscriber_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import sys
+import unittest
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.insert(0, str(ROOT / "src"))
+
+from core.time_range import _parse_range, _to_minutes, is_default_time_range, matches_time_range
+
+
+class TimeRangeTest(unittest.TestCase):
+    def test_end_exclusive_and_midnight_wrap(self) -> None:
+        self.assertTrue(matches_time_range("12:00-13:00", datetime(2024, 1, 1, 12, 0)))
+        self.assertFalse(matches_time_range("12:00-13:00", datetime(2024, 1, 1, 13, 0)))
+        self.assertTrue(matches_time_range("22:00-06:00", datetime(2024, 1, 1, 23, 30)))
+        self.assertTrue(matches_time_range("22:00-06:00", datetime(2024, 1, 1, 5, 59)))
+        self.assertFalse(matches_time_range("22:00-06:00", datetime(2024, 1, 1, 12, 0)))
+
+    def test_default_and_invalid_ranges(self) -> None:
+        now = datetime(2024, 1, 1, 9, 0)
+        self.assertTrue(matches_time_range("", now))
+        self.assertTrue(matches_time_range(" Default ", now))
+        self.assertTrue(is_default_time_range(""))
+        self.assertFalse(matches_time_range("25:00-26:00", now))
+        self.assertFalse(matches_time_range("noon", now))
+
+    def test_parsed_ranges_are_cached(self) -> None:
+        _parse_range.cache_clear()
+        now = datetime(2024, 1, 1, 9, 0)
+        for _ in range(3):
+            matches_time_range("08:00-10:00", now)
+        info = _parse_range.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+
+    def test_interned_default_skips_parsing(self) -> None:
+        _parse_range.cache_clear()
+        value = sys.intern("".join(["def", "ault"]))
+        self.assertTrue(matches_time_range(value, datetime(2024, 1, 1, 9, 0)))
+        self.assertTrue(is_default_time_range(value))
+        self.assertEqual(_parse_range.cache_info().currsize, 0)
+
+    def test_to_minutes_table_and_fallback(self) -> None:
+        self.assertEqual(_to_minutes("00:00"), 0)
+        self.assertEqual(_to_minutes(" 23:59 "), 23 * 60 + 59)
+        self.assertEqual(_to_minutes("9:05"), 9 * 60 + 5)
+        with self.assertRaises(ValueError):
+            _to_minutes("24:00")
+        with self.assertRaises(ValueError):
+            _to_minutes("noon")
+
+
+if __name__ == "__main__":
+    unittest.main()
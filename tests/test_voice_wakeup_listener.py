@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import base64
+import json
 import sys
+import time
 import types
 import unittest
 from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT / "src") not in sys.path:
@@ -30,7 +36,641 @@ except ModuleNotFoundError:
     sys.modules["PySide6"] = pyside_module
     sys.modules["PySide6.QtCore"] = qtcore_module
 
-from core.voice_wakeup import VoiceWakeupListener
+from core.voice_wakeup import (
+    VoiceWakeupListener,
+    WakeupRecognitionError,
+    _DEFAULT_OPENAI_V1,
+    _XaiAudioStream,
+    _audio_append_event,
+    _normalize_base_url_cached,
+    _split_url,
+    _dumps_event,
+    _loads_event,
+)
+
+
+class _FakeWebSocketException(Exception):
+    pass
+
+
+class _FakeWebSocket:
+    def __init__(self, events: list[str]) -> None:
+        self.events = list(events)
+        self.sent: list[str] = []
+        self.closed = False
+        self.fail_send = False
+
+    def send(self, payload: str) -> None:
+        if self.fail_send:
+            raise _FakeWebSocketException("connection to remote host was lost")
+        self.sent.append(payload)
+
+    def settimeout(self, _timeout: float) -> None:
+        pass
+
+    def recv(self) -> str:
+        return self.events.pop(0)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _fake_websocket_module(scripts: list[list[str]]) -> tuple[types.SimpleNamespace, list[_FakeWebSocket]]:
+    sockets: list[_FakeWebSocket] = []
+
+    def _create_connection(_endpoint, **_kwargs):
+        ws = _FakeWebSocket(scripts[len(sockets)])
+        sockets.append(ws)
+        return ws
+
+    module = types.SimpleNamespace(
+        create_connection=_create_connection,
+        WebSocketException=_FakeWebSocketException,
+        WebSocketBadStatusException=type("_BadStatus", (_FakeWebSocketException,), {}),
+        WebSocketTimeoutException=type("_Timeout", (_FakeWebSocketException,), {}),
+    )
+    return module, sockets
+
+
+_RESPONSE_DONE = '{"type":"response.done","response":{"output":[{"content":[{"text":"%s"}]}]}}'
+
+
+class VoiceWakeupXaiSessionTest(unittest.TestCase):
+    def _run(self, listener: VoiceWakeupListener, module) -> str:
+        return listener._run_xai_realtime_session(
+            websocket_module=module,
+            endpoint="wss://api.x.ai/v1/realtime?model=m",
+            audio_payload="AAAA",
+            session_payload='{"type":"session.update"}',
+            commit_event_type="input_audio_buffer.commit",
+            send_response_create=True,
+        )
+
+    def test_socket_is_reused_after_response_done(self) -> None:
+        module, sockets = _fake_websocket_module([[_RESPONSE_DONE % "one", _RESPONSE_DONE % "two"]])
+        listener = VoiceWakeupListener(phrases=["hi"])
+
+        self.assertEqual(self._run(listener, module), "one")
+        self.assertEqual(self._run(listener, module), "two")
+
+        self.assertEqual(len(sockets), 1)
+        self.assertEqual(sum('"session.update"' in sent for sent in sockets[0].sent), 1)
+        self.assertFalse(sockets[0].closed)
+        listener._close_xai_ws()
+        self.assertTrue(sockets[0].closed)
+
+    def test_reused_session_deletes_previous_items(self) -> None:
+        committed = '{"type":"input_audio_buffer.committed","item_id":"item_in"}'
+        done = (
+            '{"type":"response.done","response":{"output":'
+            '[{"id":"item_out","content":[{"text":"%s"}]}]}}'
+        )
+        rejected = '{"type":"error","error":{"message":"no such item","event_id":"wakeup_cleanup_0"}}'
+        module, sockets = _fake_websocket_module([[committed, done % "one", rejected, _RESPONSE_DONE % "two"]])
+        listener = VoiceWakeupListener(phrases=["hi"])
+
+        self.assertEqual(self._run(listener, module), "one")
+        deletes = [json.loads(sent) for sent in sockets[0].sent if "conversation.item.delete" in sent]
+        self.assertEqual([event["item_id"] for event in deletes], ["item_in", "item_out"])
+        # A rejected cleanup does not fail the next segment.
+        self.assertEqual(self._run(listener, module), "two")
+        self.assertEqual(len(sockets), 1)
+
+    def test_session_payloads_are_prebuilt(self) -> None:
+        modern = json.loads(VoiceWakeupListener._XAI_MODERN_SESSION_JSON)
+        self.assertEqual(modern["session"]["audio"]["input"]["format"]["rate"], 16000)
+        self.assertIsNone(modern["session"]["turn_detection"]["type"])
+        legacy = json.loads(VoiceWakeupListener._XAI_LEGACY_SESSION_JSON)
+        self.assertEqual(legacy, {"type": "session.update", "session": {"input_audio_format": "pcm16"}})
+
+    def test_audio_append_event_is_valid_json(self) -> None:
+        payload = base64.b64encode(bytes(range(256))).decode("ascii")
+        self.assertEqual(
+            json.loads(_audio_append_event(payload)),
+            {"type": "input_audio_buffer.append", "audio": payload},
+        )
+
+    def test_early_transcript_closes_socket(self) -> None:
+        completed = '{"type":"conversation.item.input_audio_transcription.completed","transcript":"hey"}'
+        module, sockets = _fake_websocket_module([[completed], [_RESPONSE_DONE % "again"]])
+        listener = VoiceWakeupListener(phrases=["hi"])
+
+        self.assertEqual(self._run(listener, module), "hey")
+        self.assertTrue(sockets[0].closed)
+        self.assertEqual(self._run(listener, module), "again")
+        self.assertEqual(len(sockets), 2)
+
+    def test_stop_cancels_pending_receive(self) -> None:
+        module, sockets = _fake_websocket_module([[_RESPONSE_DONE % "late"]])
+        listener = VoiceWakeupListener(phrases=["hi"])
+        listener._stop_event.set()
+
+        with self.assertRaises(WakeupRecognitionError):
+            self._run(listener, module)
+        self.assertTrue(sockets[0].closed)
+        self.assertIsNone(listener._xai_ws)
+
+    def test_dropped_idle_socket_reconnects(self) -> None:
+        module, sockets = _fake_websocket_module([[_RESPONSE_DONE % "one"], [_RESPONSE_DONE % "two"]])
+        listener = VoiceWakeupListener(phrases=["hi"])
+        self._run(listener, module)
+        sockets[0].fail_send = True
+
+        self.assertEqual(self._run(listener, module), "two")
+        self.assertTrue(sockets[0].closed)
+        self.assertEqual(len(sockets), 2)
+
+
+class _FakeMicStream:
+    def __init__(self, chunks: list[bytes]) -> None:
+        self.chunks = list(chunks)
+
+    def read(self, _size: int) -> bytes:
+        return self.chunks.pop(0) if self.chunks else b""
+
+
+class _FakeAudioData:
+    def __init__(self, frame_data: bytes, sample_rate: int, sample_width: int) -> None:
+        self.frame_data = frame_data
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+
+
+class _FakeWaitTimeoutError(Exception):
+    pass
+
+
+_FAKE_SR = types.SimpleNamespace(
+    AudioData=_FakeAudioData,
+    WaitTimeoutError=_FakeWaitTimeoutError,
+    UnknownValueError=type("_UnknownValueError", (Exception,), {}),
+    RequestError=type("_RequestError", (Exception,), {}),
+)
+
+
+def _chunk(level: int, frames: int = 800) -> bytes:
+    return np.full(frames, level, dtype="<i2").tobytes()
+
+
+class VoiceWakeupStreamingTest(unittest.TestCase):
+    def _source(self, chunks: list[bytes]) -> types.SimpleNamespace:
+        return types.SimpleNamespace(CHUNK=800, SAMPLE_RATE=16000, SAMPLE_WIDTH=2, stream=_FakeMicStream(chunks))
+
+    def _recognizer(self, **overrides) -> types.SimpleNamespace:
+        settings = {
+            "energy_threshold": 300,
+            "pause_threshold": 0.08,
+            "phrase_threshold": 0.1,
+            "non_speaking_duration": 0.05,
+            "dynamic_energy_threshold": False,
+            "dynamic_energy_adjustment_damping": 0.15,
+            "dynamic_energy_ratio": 1.5,
+        }
+        settings.update(overrides)
+        return types.SimpleNamespace(**settings)
+
+    def test_listen_streaming_hands_out_chunks_while_recording(self) -> None:
+        chunks = [_chunk(0), _chunk(0)] + [_chunk(1000)] * 3 + [_chunk(0)] * 3 + [_chunk(1000)]
+        seen: list[bytes] = []
+        audio = VoiceWakeupListener._listen_streaming(
+            source=self._source(chunks),
+            recognizer=self._recognizer(),
+            sr_module=_FAKE_SR,
+            timeout=2,
+            phrase_time_limit=4,
+            on_chunk=lambda data, rate, width: seen.append(data),
+        )
+        # One chunk of pre-roll, the speech, then a pause longer than pause_threshold.
+        self.assertEqual(seen, chunks[1:8])
+        # Trailing quiet is trimmed down to non_speaking_duration.
+        self.assertEqual(audio.frame_data, b"".join(chunks[1:6]))
+
+    def test_listen_streaming_drops_sounds_shorter_than_phrase_threshold(self) -> None:
+        click = [_chunk(0), _chunk(1000), _chunk(0), _chunk(0), _chunk(0)]
+        speech = [_chunk(0), _chunk(2000), _chunk(2000), _chunk(2000), _chunk(0), _chunk(0), _chunk(0)]
+        seen: list[bytes] = []
+        audio = VoiceWakeupListener._listen_streaming(
+            source=self._source(click + speech),
+            recognizer=self._recognizer(),
+            sr_module=_FAKE_SR,
+            timeout=2,
+            phrase_time_limit=4,
+            on_chunk=lambda data, rate, width: seen.append(data),
+        )
+        # The click never reaches on_chunk or the returned audio.
+        self.assertNotIn(_chunk(1000), seen)
+        self.assertEqual(audio.frame_data, b"".join(speech[:5]))
+
+    def test_listen_streaming_trims_trailing_silence(self) -> None:
+        chunks = [_chunk(1000)] * 4 + [_chunk(0)] * 10
+        audio = VoiceWakeupListener._listen_streaming(
+            source=self._source(chunks),
+            recognizer=self._recognizer(pause_threshold=0.4),
+            sr_module=_FAKE_SR,
+            timeout=2,
+            phrase_time_limit=4,
+        )
+        # 9 quiet chunks end the phrase; only non_speaking_duration (1 chunk) of them is kept.
+        self.assertEqual(audio.frame_data, b"".join(chunks[:5]))
+
+    def test_listen_streaming_times_out_without_speech(self) -> None:
+        with self.assertRaises(_FakeWaitTimeoutError):
+            VoiceWakeupListener._listen_streaming(
+                source=self._source([_chunk(0)] * 10),
+                recognizer=self._recognizer(),
+                sr_module=_FAKE_SR,
+                timeout=0.1,
+                phrase_time_limit=4,
+                on_chunk=lambda *_args: None,
+            )
+
+    def test_dynamic_threshold_tracks_ambient_level_while_waiting(self) -> None:
+        recognizer = self._recognizer(energy_threshold=1000, dynamic_energy_threshold=True)
+        with self.assertRaises(_FakeWaitTimeoutError):
+            VoiceWakeupListener._listen_streaming(
+                source=self._source([_chunk(100)] * 20),
+                recognizer=recognizer,
+                sr_module=_FAKE_SR,
+                timeout=0.5,
+                phrase_time_limit=4,
+            )
+        self.assertLess(recognizer.energy_threshold, 1000)
+        self.assertGreater(recognizer.energy_threshold, 150)
+
+    def _warm_listener(self, module) -> VoiceWakeupListener:
+        listener = VoiceWakeupListener(phrases=["hi"], openai_api_key="key", openai_model="grok-2-mini-transcribe")
+        listener._xai_ws = module.create_connection("wss://warm")
+        listener._xai_ws_key = (
+            listener._xai_endpoint,
+            "input_audio_buffer.commit",
+        )
+        return listener
+
+    def test_streamed_segment_is_committed_without_reupload(self) -> None:
+        module, sockets = _fake_websocket_module([[_RESPONSE_DONE % "hello"]])
+        listener = self._warm_listener(module)
+        with patch.dict(sys.modules, {"websocket": module}):
+            for _ in range(3):
+                listener._feed_xai_stream(_chunk(1000, 1600), 16000, 2)
+            text = listener._recognize_xai_realtime(
+                audio=_FakeAudioData(b"", 16000, 2), stream=listener._detach_xai_stream()
+            )
+
+        self.assertEqual(text, "hello")
+        self.assertEqual(len(sockets), 1)
+        types_sent = [json.loads(sent)["type"] for sent in sockets[0].sent]
+        self.assertEqual(
+            types_sent,
+            ["input_audio_buffer.append"] * 3 + ["input_audio_buffer.commit", "response.create"],
+        )
+        self.assertIs(listener._xai_ws, sockets[0])
+
+    def test_discarded_stream_keeps_session_for_reuse(self) -> None:
+        module, sockets = _fake_websocket_module([[]])
+        listener = self._warm_listener(module)
+        with patch.dict(sys.modules, {"websocket": module}):
+            listener._feed_xai_stream(_chunk(10, 1600), 16000, 2)
+            listener._discard_xai_stream()
+
+        self.assertIsNone(listener._xai_stream)
+        self.assertIs(listener._xai_ws, sockets[0])
+        self.assertEqual(json.loads(sockets[0].sent[-1])["type"], "input_audio_buffer.clear")
+
+    def test_cold_start_falls_back_to_one_shot_upload(self) -> None:
+        module, sockets = _fake_websocket_module([[_RESPONSE_DONE % "cold"]])
+        listener = VoiceWakeupListener(phrases=["hi"], openai_api_key="key", openai_model="grok-2-mini-transcribe")
+        frame = _chunk(1000, 1600)
+        with patch.dict(sys.modules, {"websocket": module}):
+            listener._feed_xai_stream(frame, 16000, 2)
+            self.assertEqual(sockets, [])
+            text = listener._recognize_xai_realtime(
+                audio=_FakeAudioData(frame, 16000, 2), stream=listener._detach_xai_stream()
+            )
+
+        self.assertEqual(text, "cold")
+        types_sent = [json.loads(sent)["type"] for sent in sockets[0].sent]
+        self.assertEqual(types_sent[:2], ["session.update", "input_audio_buffer.append"])
+
+
+class VoiceWakeupAsrCacheTest(unittest.TestCase):
+    def test_identical_clip_skips_second_request(self) -> None:
+        listener = VoiceWakeupListener(phrases=["hi"], recognition_provider="zhipu")
+        calls: list[bytes] = []
+
+        def _fake_zhipu(*, audio) -> str:
+            calls.append(audio.frame_data)
+            return "你好" if audio.frame_data == b"\x01\x00" else ""
+
+        listener._recognize_zhipu_asr = _fake_zhipu
+        clip = _FakeAudioData(b"\x01\x00", 16000, 2)
+        self.assertEqual(listener._recognize(audio=clip, recognizer=None), "你好")
+        self.assertEqual(listener._recognize(audio=_FakeAudioData(b"\x01\x00", 16000, 2), recognizer=None), "你好")
+        self.assertEqual(len(calls), 1)
+
+        # Same bytes at another sample rate, or empty results, are not served from the cache.
+        listener._recognize(audio=_FakeAudioData(b"\x01\x00", 44100, 2), recognizer=None)
+        listener._recognize(audio=_FakeAudioData(b"\x02\x00", 16000, 2), recognizer=None)
+        listener._recognize(audio=_FakeAudioData(b"\x02\x00", 16000, 2), recognizer=None)
+        self.assertEqual(len(calls), 4)
+
+
+class VoiceWakeupSegmentWorkerTest(unittest.TestCase):
+    def _listener(self, recognize) -> tuple[VoiceWakeupListener, list[str], list[str]]:
+        listener = VoiceWakeupListener(phrases=["hi"], recognition_provider="zhipu")
+        listener._recognize = recognize
+        woken: list[str] = []
+        errors: list[str] = []
+        listener.wake_phrase_detected.connect(woken.append)
+        listener.listener_error.connect(errors.append)
+        return listener, woken, errors
+
+    def _process(self, listener: VoiceWakeupListener) -> None:
+        listener._process_segment(
+            segment=1,
+            audio=_FakeAudioData(b"", 16000, 2),
+            recognizer=None,
+            stream=None,
+            sr_module=_FAKE_SR,
+        )
+
+    def test_match_is_emitted_from_worker(self) -> None:
+        listener, woken, errors = self._listener(lambda **_kwargs: " oh hi ")
+        self._process(listener)
+        self.assertEqual(woken, ["oh hi"])
+        self.assertEqual(errors, [])
+        self.assertFalse(listener._stop_event.is_set())
+
+    def test_fatal_error_stops_capture_loop(self) -> None:
+        def _fail(**_kwargs) -> str:
+            raise WakeupRecognitionError("bad key")
+
+        listener, woken, errors = self._listener(_fail)
+        self._process(listener)
+        self.assertEqual(errors, ["bad key"])
+        self.assertTrue(listener._stop_event.is_set())
+        self.assertEqual(woken, [])
+
+    def test_stop_interrupts_transient_retry_wait(self) -> None:
+        def _transient(**_kwargs) -> str:
+            raise WakeupRecognitionError("xAI Realtime 网络异常: timed out")
+
+        listener, _woken, errors = self._listener(_transient)
+        listener._recognition_provider = "xai_realtime"
+        listener._consecutive_xai_failures = 2
+        with patch.object(listener._stop_event, "wait", return_value=True) as wait:
+            self._process(listener)
+        wait.assert_called_once_with(3.2)
+        self.assertEqual(errors, [])
+
+    def test_error_after_stop_is_not_reported(self) -> None:
+        listener, _woken, errors = self._listener(None)
+
+        def _cancelled(**_kwargs) -> str:
+            listener._stop_event.set()
+            raise WakeupRecognitionError("cancelled")
+
+        listener._recognize = _cancelled
+        self._process(listener)
+        self.assertEqual(errors, [])
+
+    def test_segments_after_stop_are_skipped(self) -> None:
+        listener, woken, _errors = self._listener(lambda **_kwargs: self.fail("stopped listener recognized audio"))
+        listener._stop_event.set()
+        self._process(listener)
+        self.assertEqual(woken, [])
+
+    def test_segment_queued_at_stop_closes_its_stream_socket(self) -> None:
+        listener, _woken, _errors = self._listener(lambda **_kwargs: self.fail("stopped listener recognized audio"))
+        ws = _FakeWebSocket([])
+        stream = _XaiAudioStream(ws=ws, websocket_module=None, endpoint="wss://x", commit_event_type="c")
+        listener._stop_event.set()
+        listener._process_segment(
+            segment=1, audio=_FakeAudioData(b"", 16000, 2), recognizer=None, stream=stream, sr_module=_FAKE_SR
+        )
+        self.assertTrue(ws.closed)
+
+
+class _FakeUploadAudio:
+    def __init__(self, flac_error: Exception | None = None) -> None:
+        self.flac_error = flac_error
+
+    def get_flac_data(self, **_kwargs) -> bytes:
+        if self.flac_error is not None:
+            raise self.flac_error
+        return b"fLaC"
+
+    def get_wav_data(self, **_kwargs) -> bytes:
+        return b"RIFF"
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, text: str = "") -> None:
+        self.status_code = status_code
+        self.text = text
+        self.headers = {"content-type": "text/plain"}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class VoiceWakeupWhisperUploadTest(unittest.TestCase):
+    def _recognize(self, listener: VoiceWakeupListener, audio, statuses: list[int]) -> tuple[str, list[str]]:
+        uploads: list[str] = []
+
+        def _post(_endpoint, *, files, **_kwargs):
+            uploads.append(files["file"][0])
+            status = statuses.pop(0)
+            return _FakeResponse(status, "hi" if status < 400 else "")
+
+        listener._get_http_client = lambda: types.SimpleNamespace(post=_post)
+        fake_httpx = types.SimpleNamespace(
+            HTTPStatusError=type("_HTTPStatusError", (Exception,), {}),
+            HTTPError=type("_HTTPError", (Exception,), {}),
+        )
+        with patch.dict(sys.modules, {"httpx": fake_httpx}):
+            text = listener._recognize_openai_whisper(audio=audio)
+        return text, uploads
+
+    def test_uploads_flac(self) -> None:
+        listener = VoiceWakeupListener(phrases=["hi"], recognition_provider="openai_whisper")
+        self.assertEqual(self._recognize(listener, _FakeUploadAudio(), [200]), ("hi", ["wakeup.flac"]))
+        self.assertTrue(listener._whisper_upload_flac)
+
+    def test_missing_encoder_falls_back_to_wav(self) -> None:
+        listener = VoiceWakeupListener(phrases=["hi"], recognition_provider="openai_whisper")
+        audio = _FakeUploadAudio(OSError("FLAC conversion utility not available"))
+        self.assertEqual(self._recognize(listener, audio, [200]), ("hi", ["wakeup.wav"]))
+        self.assertFalse(listener._whisper_upload_flac)
+
+    def test_rejected_flac_is_resent_as_wav_once(self) -> None:
+        listener = VoiceWakeupListener(phrases=["hi"], recognition_provider="openai_whisper")
+        self.assertEqual(
+            self._recognize(listener, _FakeUploadAudio(), [415, 200]),
+            ("hi", ["wakeup.flac", "wakeup.wav"]),
+        )
+        self.assertEqual(self._recognize(listener, _FakeUploadAudio(), [200])[1], ["wakeup.wav"])
+
+
+class VoiceWakeupTransientErrorTest(unittest.TestCase):
+    def test_transient_keywords_match_case_insensitively(self) -> None:
+        self.assertTrue(VoiceWakeupListener._is_transient_xai_error("Connection Reset by peer"))
+        self.assertTrue(VoiceWakeupListener._is_transient_xai_error("xAI Realtime 超时 (HTTP 504)"))
+        self.assertFalse(VoiceWakeupListener._is_transient_xai_error("HTTP 401 unauthorized"))
+        self.assertFalse(VoiceWakeupListener._is_transient_xai_error(""))
+
+
+class VoiceWakeupEventExtractionTest(unittest.TestCase):
+    def test_delta_events_skip_full_parse(self) -> None:
+        raw = json.dumps(
+            {"type": "response.output_text.delta", "item_id": "i1", "delta": '你 "好"\\n'},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        with patch("core.voice_wakeup._loads_event", side_effect=AssertionError("full parse")):
+            event = VoiceWakeupListener._parse_realtime_event(raw.encode("utf-8"))
+        self.assertEqual(event, {"type": "response.output_text.delta", "delta": '你 "好"\\n'})
+
+    def test_other_events_use_full_parse(self) -> None:
+        spaced = '{"type": "response.text.delta", "delta": "x"}'
+        self.assertEqual(VoiceWakeupListener._parse_realtime_event(spaced), json.loads(spaced))
+        done = '{"type":"response.output_text.done","text":"hi"}'
+        self.assertEqual(VoiceWakeupListener._parse_realtime_event(done), json.loads(done))
+
+    def test_transcription_text_lookup_order(self) -> None:
+        extract = VoiceWakeupListener._extract_xai_transcription_text
+        self.assertEqual(extract({"transcript": "  ", "text": " top "}), "top")
+        self.assertEqual(extract({"item": {"transcript": 3, "text": "item"}}), "item")
+        self.assertEqual(extract({"item": {"content": ["x", {"text": ""}, {"transcript": " deep "}]}}), "deep")
+        self.assertEqual(extract({"item": {"content": "nope"}}), "")
+
+    def test_response_text_joins_content_entries(self) -> None:
+        event = {
+            "response": {
+                "output": [
+                    {"content": [{"text": " he", "transcript": "ignored"}, {"transcript": "llo "}]},
+                    {"content": None},
+                ]
+            }
+        }
+        self.assertEqual(VoiceWakeupListener._extract_realtime_response_text(event), "hello")
+        self.assertEqual(VoiceWakeupListener._extract_realtime_response_delta({"delta": " ", "text": "t"}), "t")
+
+
+class VoiceWakeupPhraseMatchTest(unittest.TestCase):
+    def test_phrases_are_lowered_once_and_matched_case_insensitively(self) -> None:
+        listener = VoiceWakeupListener(phrases=["Hey Aemeath", " 你好 ", "hey aemeath", ""])
+        self.assertEqual(listener._phrases_lower, ("hey aemeath", "你好"))
+        self.assertTrue(listener._matches_wake_phrase("oh HEY AEMEATH there"))
+        self.assertTrue(listener._matches_wake_phrase("你好呀"))
+        self.assertFalse(listener._matches_wake_phrase("hello"))
+
+    def test_automaton_only_for_long_phrase_lists(self) -> None:
+        short = VoiceWakeupListener(phrases=["a", "b"])
+        self.assertIsNone(short._phrase_automaton)
+
+        built: list[tuple[str, ...]] = []
+        with patch.object(VoiceWakeupListener, "_build_phrase_automaton", side_effect=lambda p: built.append(p)):
+            VoiceWakeupListener(phrases=[f"p{i}" for i in range(8)])
+        self.assertEqual(len(built[0]), 8)
+
+
+class _FakePttRecognizer:
+    instances = 0
+
+    def __init__(self) -> None:
+        type(self).instances += 1
+        self.calibrations = 0
+
+    def adjust_for_ambient_noise(self, _source, duration: float) -> None:
+        self.calibrations += 1
+
+    def listen(self, _source, **_kwargs) -> _FakeAudioData:
+        return _FakeAudioData(b"\x01\x00", 16000, 2)
+
+    def recognize_google(self, _audio, language: str) -> str:
+        return f"ptt-{language}"
+
+
+class _FakeMicrophone:
+    def __enter__(self) -> "_FakeMicrophone":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        return None
+
+
+class VoiceWakeupPushToTalkTest(unittest.TestCase):
+    def setUp(self) -> None:
+        _FakePttRecognizer.instances = 0
+        patcher = patch.object(VoiceWakeupListener, "_PTT_RECOGNIZER", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        VoiceWakeupListener.invalidate_ambient_calibration()
+        self.addCleanup(VoiceWakeupListener.invalidate_ambient_calibration)
+        self.fake_sr = types.SimpleNamespace(
+            Recognizer=_FakePttRecognizer,
+            Microphone=_FakeMicrophone,
+            WaitTimeoutError=_FakeWaitTimeoutError,
+            UnknownValueError=_FAKE_SR.UnknownValueError,
+            RequestError=_FAKE_SR.RequestError,
+        )
+
+    def _transcribe(self) -> str:
+        with patch("core.voice_wakeup._sr", self.fake_sr):
+            return VoiceWakeupListener.transcribe_once(recognition_provider="google", language="en-US")
+
+    def test_recognizer_and_calibration_are_reused(self) -> None:
+        self.assertEqual(self._transcribe(), "ptt-en-US")
+        self.assertEqual(self._transcribe(), "ptt-en-US")
+        self.assertEqual(_FakePttRecognizer.instances, 1)
+        self.assertEqual(VoiceWakeupListener._PTT_RECOGNIZER.calibrations, 1)
+
+    def test_skip_calibration_uses_configured_threshold(self) -> None:
+        with patch("core.voice_wakeup._sr", self.fake_sr):
+            VoiceWakeupListener.transcribe_once(
+                recognition_provider="google",
+                skip_ambient_calibration=True,
+                energy_threshold=450,
+            )
+        recognizer = VoiceWakeupListener._PTT_RECOGNIZER
+        self.assertEqual(recognizer.calibrations, 0)
+        self.assertEqual(recognizer.energy_threshold, 450.0)
+        self.assertTrue(recognizer.dynamic_energy_threshold)
+
+    def test_fixed_threshold_invalidates_previous_calibration(self) -> None:
+        self._transcribe()
+        with patch("core.voice_wakeup._sr", self.fake_sr):
+            VoiceWakeupListener.transcribe_once(
+                recognition_provider="google",
+                skip_ambient_calibration=True,
+                energy_threshold=450,
+            )
+        self._transcribe()
+        self.assertEqual(VoiceWakeupListener._PTT_RECOGNIZER.calibrations, 2)
+
+    def test_missing_speech_recognition_is_reported(self) -> None:
+        with patch("core.voice_wakeup._sr", None):
+            with self.assertRaises(WakeupRecognitionError):
+                VoiceWakeupListener.transcribe_once(recognition_provider="google")
+
+    def test_invalidate_forces_recalibration(self) -> None:
+        self._transcribe()
+        VoiceWakeupListener.invalidate_ambient_calibration()
+        self._transcribe()
+        self.assertEqual(VoiceWakeupListener._PTT_RECOGNIZER.calibrations, 2)
+
+
+    def test_recognizer_lock_is_released_while_recording(self) -> None:
+        held: list[bool] = []
+
+        def listen(_recognizer, _source, **_kwargs):
+            held.append(VoiceWakeupListener._PTT_RECOGNIZER_LOCK.locked())
+            return _FakeAudioData(b"\x01\x00", 16000, 2)
+
+        with patch.object(_FakePttRecognizer, "listen", listen):
+            self._transcribe()
+        self.assertEqual(held, [False])
 
 
 class VoiceWakeupListenerTest(unittest.TestCase):
@@ -54,11 +694,51 @@ class VoiceWakeupListenerTest(unittest.TestCase):
             "https://api.openai.com/v1",
         )
 
+    def test_split_url_matches_urlsplit_parts(self) -> None:
+        self.assertEqual(_split_url("HTTPS://h:8080/v1/x?q=1#f"), ("https", "h:8080", "/v1/x"))
+        self.assertEqual(_split_url("https://h?q=/v1"), ("https", "h", ""))
+        self.assertEqual(_split_url("localhost:8080/v1"), ("", "", ""))
+        self.assertEqual(
+            VoiceWakeupListener._normalize_zhipu_base_url("https://open.bigmodel.cn/api/paas/v4?x=1"),
+            "https://open.bigmodel.cn/api/paas/v4/audio/transcriptions",
+        )
+
+    def test_host_checks_ignore_credentials_and_port(self) -> None:
+        self.assertTrue(VoiceWakeupListener._is_xai_base_url(" HTTPS://API.X.AI:443/v1 "))
+        self.assertTrue(VoiceWakeupListener._is_zhipu_base_url("https://key@open.bigmodel.cn/api"))
+        self.assertFalse(VoiceWakeupListener._is_xai_base_url("https://proxy.example/x.ai"))
+        self.assertFalse(VoiceWakeupListener._is_zhipu_base_url("bigmodel.cn"))
+
+    def test_pasted_whitespace_and_slashes_are_stripped(self) -> None:
+        self.assertEqual(
+            VoiceWakeupListener._normalize_base_url("\u3000https://api.x.ai/v1/ \xa0"),
+            "https://api.x.ai/v1",
+        )
+        self.assertEqual(
+            VoiceWakeupListener._normalize_zhipu_base_url(" https://open.bigmodel.cn/api/paas/v4//\n"),
+            "https://open.bigmodel.cn/api/paas/v4/audio/transcriptions",
+        )
+
+    def test_fallback_base_url_is_shared_constant(self) -> None:
+        self.assertIs(VoiceWakeupListener._normalize_base_url(""), _DEFAULT_OPENAI_V1)
+        self.assertIs(VoiceWakeupListener._normalize_base_url("not-a-url"), _DEFAULT_OPENAI_V1)
+        self.assertIs(VoiceWakeupListener._normalize_base_url("https://"), _DEFAULT_OPENAI_V1)
+
+    def test_url_helpers_are_memoized(self) -> None:
+        _normalize_base_url_cached.cache_clear()
+        for _ in range(3):
+            VoiceWakeupListener._normalize_base_url("https://memo.example/v1/chat/completions")
+        info = _normalize_base_url_cached.cache_info()
+        self.assertEqual((info.misses, info.hits), (1, 2))
+        self.assertEqual(VoiceWakeupListener._normalize_base_url(None), "https://api.openai.com/v1")  # type: ignore[arg-type]
+
     def test_normalize_whisper_language(self) -> None:
         self.assertEqual(VoiceWakeupListener._normalize_whisper_language("zh-CN"), "zh")
         self.assertEqual(VoiceWakeupListener._normalize_whisper_language("en"), "en")
         self.assertEqual(VoiceWakeupListener._normalize_whisper_language(""), "")
         self.assertEqual(VoiceWakeupListener._normalize_whisper_language("invalid-language"), "")
+        self.assertEqual(VoiceWakeupListener._normalize_whisper_language(None), "")  # type: ignore[arg-type]
+        self.assertEqual(VoiceWakeupListener._normalize_whisper_language(" EN_us "), "en")
 
     def test_extract_transcription_text(self) -> None:
         self.assertEqual(VoiceWakeupListener._extract_transcription_text({"text": "hello"}), "hello")
@@ -77,6 +757,29 @@ class VoiceWakeupListenerTest(unittest.TestCase):
         self.assertEqual(VoiceWakeupListener._normalize_recognition_provider("xai"), "xai_realtime")
         self.assertEqual(VoiceWakeupListener._normalize_recognition_provider("unknown"), "xai_realtime")
 
+    def test_recent_wakeup_is_consumed_once(self) -> None:
+        patcher = patch.object(VoiceWakeupListener, "_LAST_WAKEUP", (0.0, ""))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.assertFalse(VoiceWakeupListener.consume_recent_wakeup())
+
+        VoiceWakeupListener.mark_recent_wakeup(" hi ")
+        self.assertEqual(VoiceWakeupListener._LAST_WAKEUP[1], "hi")
+        self.assertTrue(VoiceWakeupListener.consume_recent_wakeup())
+        self.assertFalse(VoiceWakeupListener.consume_recent_wakeup())
+
+        VoiceWakeupListener._LAST_WAKEUP = (time.monotonic() - 10.0, "old")
+        self.assertFalse(VoiceWakeupListener.consume_recent_wakeup(window_seconds=3.0))
+
+    def test_xai_endpoint_is_built_once(self) -> None:
+        with patch.object(
+            VoiceWakeupListener, "_build_xai_realtime_endpoint", return_value="wss://cached"
+        ) as build:
+            listener = VoiceWakeupListener(phrases=["hi"])
+        self.assertEqual(listener._xai_endpoint, "wss://cached")
+        build.assert_called_once()
+        self.assertEqual(VoiceWakeupListener(phrases=["hi"], recognition_provider="zhipu")._xai_endpoint, "")
+
     def test_build_xai_realtime_endpoint(self) -> None:
         self.assertEqual(
             VoiceWakeupListener._build_xai_realtime_endpoint(
@@ -101,6 +804,15 @@ class VoiceWakeupListenerTest(unittest.TestCase):
         self.assertEqual(event["type"], "conversation.item.input_audio_transcription.completed")
         self.assertIsNone(VoiceWakeupListener._parse_realtime_event("not-json"))
 
+    def test_event_json_round_trip(self) -> None:
+        event = {"type": "session.update", "session": {"prompt": "你好"}}
+        encoded = _dumps_event(event)
+        self.assertIn("你好", encoded)
+        self.assertEqual(_loads_event(encoded), event)
+        self.assertEqual(_loads_event(encoded.encode("utf-8")), event)
+        with self.assertRaises(ValueError):
+            _loads_event("{not json")
+
     def test_extract_xai_transcription_text(self) -> None:
         self.assertEqual(
             VoiceWakeupListener._extract_xai_transcription_text({"transcript": "hello"}),
@@ -174,6 +886,72 @@ class VoiceWakeupListenerTest(unittest.TestCase):
             "nested",
         )
 
+    def test_voiced_seconds_gate(self) -> None:
+        rate = 16000
+        t = np.arange(rate // 2) / rate
+        tone = (np.sin(2 * np.pi * 440 * t) * 8000).astype("<i2")
+        silence = np.zeros(rate // 2, dtype="<i2")
+        frame_data = np.concatenate([silence, tone]).tobytes()
+
+        voiced = VoiceWakeupListener._voiced_seconds(
+            frame_data, sample_rate=rate, sample_width=2, energy_threshold=300
+        )
+        self.assertAlmostEqual(voiced, 0.5, delta=0.05)
+        self.assertEqual(
+            VoiceWakeupListener._voiced_seconds(
+                silence.tobytes(), sample_rate=rate, sample_width=2, energy_threshold=300
+            ),
+            0.0,
+        )
+        self.assertEqual(
+            VoiceWakeupListener._voiced_seconds(b"\x00" * 30, sample_rate=rate, sample_width=3, energy_threshold=300),
+            float("inf"),
+        )
+
+    def test_mic_retry_delay_backs_off_to_two_seconds(self) -> None:
+        delays = [VoiceWakeupListener._mic_retry_delay(n) for n in range(1, 7)]
+        self.assertEqual(delays, [0.04, 0.08, 0.16, 0.32, 0.64, 1.28])
+        self.assertEqual(VoiceWakeupListener._mic_retry_delay(7), 2.0)
+
+    def test_pcm16_data_skips_conversion_when_capture_matches(self) -> None:
+        calls: list[tuple[int, int]] = []
+
+        class _Audio:
+            frame_data = b"\x01\x00\x02\x00"
+            sample_rate = 16000
+            sample_width = 2
+
+            def get_raw_data(self, *, convert_rate: int, convert_width: int) -> bytes:
+                calls.append((convert_rate, convert_width))
+                return b"converted"
+
+        audio = _Audio()
+        self.assertIs(VoiceWakeupListener._pcm16_data(audio, sample_rate=16000), audio.frame_data)
+        self.assertEqual(calls, [])
+
+        audio.sample_rate = 44100
+        self.assertEqual(VoiceWakeupListener._pcm16_data(audio, sample_rate=16000), b"converted")
+        self.assertEqual(calls, [(16000, 2)])
+
+    def test_http_client_is_reused_until_closed(self) -> None:
+        created: list[types.SimpleNamespace] = []
+
+        def _client(**kwargs):
+            client = types.SimpleNamespace(is_closed=False, kwargs=kwargs)
+            client.close = lambda: setattr(client, "is_closed", True)
+            created.append(client)
+            return client
+
+        fake_httpx = types.SimpleNamespace(Client=_client, Limits=lambda **kwargs: kwargs)
+        listener = VoiceWakeupListener(phrases=["hi"])
+        with patch.dict(sys.modules, {"httpx": fake_httpx}):
+            first = listener._get_http_client()
+            self.assertIs(listener._get_http_client(), first)
+            listener._close_http_client()
+            self.assertTrue(first.is_closed)
+            self.assertIsNot(listener._get_http_client(), first)
+        self.assertEqual(len(created), 2)
+
 
 if __name__ == "__main__":
     unittest.main()